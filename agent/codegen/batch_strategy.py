@@ -0,0 +1,199 @@
+import os
+import re
+from agent.config import get_config
+from agent.context.knowledge_index import normalize_path
+from agent.context.builder import build_hybrid_context
+from agent.prompt.builder import build_prompt, log_prompt_to_file
+from agent.validation.static import analyze_sources
+from agent.codegen.strategy import (
+    get_llm,
+    strip_code_fences,
+    ensure_trailing_newline,
+    validate_and_recreate,
+    SUPPORTED_LINT_EXTENSIONS,
+)
+
+FILE_BLOCK_PATTERN = re.compile(
+    r"^=== FILE: (?P<path>.+?) ===[ \t]*\n(?P<body>.*?)^=== END FILE ===[ \t]*$",
+    re.MULTILINE | re.DOTALL
+)
+
+def is_batchable(step: dict) -> bool:
+    """
+    Krok nadaje się do batcha jeśli to generate_code nowego pliku (nie folderu).
+    Modyfikacje istniejących plików idą pojedynczo - potrzebują pełnego kodu w kontekście.
+    """
+    if (step.get("type") or step.get("command") or "generate_code") != "generate_code":
+        return False
+
+    artifact = step.get("params", {}).get("artifact", {})
+    filepath = artifact.get("path")
+    if not filepath:
+        return False
+
+    extension = artifact.get("extension") or os.path.splitext(filepath)[1]
+    if not extension:
+        return False
+
+    return not os.path.exists(filepath)
+
+def group_batchable_steps(steps: list[dict], start: int) -> list[dict]:
+    """
+    Zwraca kolejne kroki od `start`, które można wygenerować jednym wywołaniem LLM:
+    nowe pliki z tym samym rozszerzeniem, maksymalnie `batch_max_artifacts`.
+    """
+    max_artifacts = get_config().get("batch_max_artifacts", 8)
+    group = []
+    extension = None
+    seen_paths = set()
+
+    for step in steps[start:]:
+        if len(group) >= max_artifacts or not is_batchable(step):
+            break
+
+        artifact = step["params"]["artifact"]
+        step_extension = (artifact.get("extension") or os.path.splitext(artifact["path"])[1]).lower()
+        if extension is None:
+            extension = step_extension
+        if step_extension != extension or artifact["path"] in seen_paths:
+            break
+
+        seen_paths.add(artifact["path"])
+        group.append(step)
+
+    return group
+
+def build_batch_prompt(steps: list[dict]) -> str:
+    """Jeden prompt dla wielu artefaktów - wspólny kontekst projektu tylko raz."""
+    context = build_hybrid_context(prompt_text="\n".join(s["params"]["prompt"] for s in steps), model=get_llm().model)
+
+    tasks = []
+    for i, step in enumerate(steps, 1):
+        artifact = step["params"]["artifact"]
+        tasks.append(f"### PLIK {i}: {artifact['path']} (artefakt `{artifact['name']}`)\n{step['params']['prompt']}")
+    tasks_txt = "\n\n".join(tasks)
+
+    return f"""
+Wygeneruj {len(steps)} kompletnych plików opisanych poniżej.
+
+Poniżej znajduje się kontekst projektu:
+{context or "Brak wcześniejszych komponentów."}
+
+ZADANIA:
+{tasks_txt}
+
+FORMAT ODPOWIEDZI (dokładnie tak, dla każdego pliku):
+=== FILE: <pełna ścieżka pliku> ===
+<kompletny kod pliku>
+=== END FILE ===
+
+Nie dodawaj żadnych komentarzy ani wyjaśnień poza blokami plików.
+""".strip()
+
+def parse_multi_file_response(text: str) -> dict[str, str]:
+    """Dzieli odpowiedź LLM na pliki: {ścieżka: kod}."""
+    files = {}
+    for match in FILE_BLOCK_PATTERN.finditer(text.replace("\r\n", "\n")):
+        path = match.group("path").strip().strip("`")
+        files[path] = strip_code_fences(match.group("body"))
+    return files
+
+def match_batch_files(files: dict[str, str], paths: list[str]) -> dict[str, str]:
+    """
+    Przypisuje pliki z odpowiedzi do ścieżek artefaktów. Model nie zawsze powtarza ścieżkę
+    dosłownie ("./src/X.tsx", "src\\X.tsx", "src/X.tsx" zamiast "output/app/src/X.tsx") -
+    porównujemy ścieżki znormalizowane, a potem jednoznaczny sufiks (całe segmenty).
+    Zwraca: {ścieżka artefaktu: kod}
+    """
+    def suffix_match(a: str, b: str) -> bool:
+        return a.endswith("/" + b) or b.endswith("/" + a)
+
+    returned = {normalize_path(path): code for path, code in files.items()}
+    targets = {path: normalize_path(path) for path in paths}
+    matched = {}
+    for path, target in targets.items():
+        if target in returned:
+            matched[path] = returned[target]
+            continue
+        candidates = [name for name in returned if suffix_match(target, name)]
+        # Jednoznacznie w obie strony: jeden plik z odpowiedzi i jeden artefakt
+        if len(candidates) == 1 and sum(suffix_match(other, candidates[0]) for other in targets.values()) == 1:
+            matched[path] = returned[candidates[0]]
+    return matched
+
+def generate_batch(steps: list[dict]) -> dict[str, tuple[str, dict]]:
+    """
+    Generuje wiele artefaktów jednym wywołaniem LLM.
+    Każdy plik jest walidowany osobno, a tylko nieudane (lub brakujące w odpowiedzi)
+    są generowane ponownie pojedynczo przez validate_and_recreate.
+    Zwraca: {ścieżka: (kod, raport_walidacji)}
+    """
+    prompt = build_batch_prompt(steps)
+    log_prompt_to_file(f"batch_{len(steps)}", prompt)
+
+    print(f"🧠 Generuję batch {len(steps)} plików jednym wywołaniem...")
+    try:
+        files = match_batch_files(
+            parse_multi_file_response(get_llm().chat(prompt)),
+            [s["params"]["artifact"]["path"] for s in steps]
+        )
+    except Exception as e:
+        print(f"❌ Błąd LLM przy generowaniu batcha: {e}")
+        files = {}
+
+    results = {}
+    failed = []
+
+    # 📦 Wszystkie pliki batcha walidujemy jednym wywołaniem lintera zamiast po kolei
+    lintable = {
+        s["params"]["artifact"]["path"]: ensure_trailing_newline(files[s["params"]["artifact"]["path"]])
+        for s in steps
+        if files.get(s["params"]["artifact"]["path"])
+        and s["params"]["artifact"].get("extension", "").lower() in SUPPORTED_LINT_EXTENSIONS
+    }
+    validated = analyze_sources(lintable) if lintable else {}
+
+    for step in steps:
+        artifact = step["params"]["artifact"]
+        filepath = artifact["path"]
+        extension = artifact.get("extension", "")
+        code = files.get(filepath)
+
+        if not code:
+            print(f"⚠️ Brak pliku w odpowiedzi batcha: {filepath}")
+            failed.append(step)
+            continue
+
+        if extension.lower() not in SUPPORTED_LINT_EXTENSIONS:
+            results[filepath] = (code, {
+                "ok": True,
+                "details": f"Brak analizy statycznej dla rozszerzenia '{extension}'.",
+                "batched": True
+            })
+            continue
+
+        ok, report = validated[filepath]
+        if ok:
+            results[filepath] = (code, {"ok": True, "details": report, "batched": True})
+        else:
+            print(f"⚠️ Walidacja nieudana w batchu dla {filepath}:\n{report.strip()}")
+            failed.append(step)
+
+    # Ponowienie tylko nieudanych artefaktów - pojedynczo, z pełnym kontekstem
+    for step in failed:
+        artifact = step["params"]["artifact"]
+        prompt = build_prompt(
+            prompt_text=step["params"]["prompt"],
+            artifact_name=artifact["name"],
+            artifact_path=artifact["path"],
+        )
+        code, report = validate_and_recreate(
+            prompt=prompt,
+            filepath=artifact["path"],
+            extension=artifact.get("extension", ""),
+            max_attempts=5
+        )
+        results[artifact["path"]] = (code, {**report, "batched": False})
+
+    print(f"📦 Batch: {len(steps) - len(failed)}/{len(steps)} plików przeszło za pierwszym razem")
+    return results
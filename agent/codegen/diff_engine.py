@@ -0,0 +1,213 @@
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(Exception):
+    """Diff nie daje się sparsować albo hunk nie pasuje do pliku."""
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_length: int
+    new_start: int
+    new_length: int
+    lines: list[tuple[str, str]] = field(default_factory=list)  # (" " | "-" | "+", treść bez \n)
+
+    @property
+    def old_lines(self) -> list[str]:
+        return [text for tag, text in self.lines if tag in (" ", "-")]
+
+    @property
+    def new_lines(self) -> list[str]:
+        return [text for tag, text in self.lines if tag in (" ", "+")]
+
+
+@dataclass
+class FilePatch:
+    old_path: Optional[str]
+    new_path: Optional[str]
+    hunks: list[Hunk] = field(default_factory=list)
+
+
+def parse_unified_diff(text: str) -> list[FilePatch]:
+    """
+    Parsuje unified diff (format git/diff -u). Liczniki linii z nagłówków hunków
+    są tylko podpowiedzią - modele często podają je błędnie, więc hunk kończy się
+    na następnym nagłówku, a nie po `old_length` liniach.
+    """
+    patches: list[FilePatch] = []
+    current: Optional[FilePatch] = None
+    hunk: Optional[Hunk] = None
+
+    raw_lines = text.replace("\r\n", "\n").split("\n")
+    for index, raw_line in enumerate(raw_lines):
+        next_line = raw_lines[index + 1] if index + 1 < len(raw_lines) else ""
+        # "--- " to nagłówek pliku tylko gdy zaraz po nim jest "+++ " (inaczej: usunięta linia "-- ...")
+        if raw_line.startswith("--- ") and next_line.startswith("+++ "):
+            current = FilePatch(old_path=_strip_prefix(raw_line[4:]), new_path=None)
+            patches.append(current)
+            hunk = None
+            continue
+        if raw_line.startswith("+++ ") and current is not None and current.new_path is None and hunk is None:
+            current.new_path = _strip_prefix(raw_line[4:])
+            continue
+
+        header = HUNK_HEADER_PATTERN.match(raw_line)
+        if header:
+            if current is None:
+                current = FilePatch(old_path=None, new_path=None)
+                patches.append(current)
+            hunk = Hunk(
+                old_start=int(header.group(1)),
+                old_length=int(header.group(2) or 1),
+                new_start=int(header.group(3)),
+                new_length=int(header.group(4) or 1),
+            )
+            current.hunks.append(hunk)
+            continue
+
+        if hunk is None:
+            continue  # nagłówki git (diff --git, index ...) i tekst poza hunkami
+        if raw_line.startswith("\\"):
+            continue  # "\ No newline at end of file"
+        if raw_line[:1] in (" ", "-", "+"):
+            hunk.lines.append((raw_line[0], raw_line[1:]))
+        elif raw_line == "":
+            hunk.lines.append((" ", ""))  # pusta linia kontekstu bez spacji (częste u modeli)
+
+    # Końcowe puste "linie kontekstu" to zwykle artefakt końca tekstu
+    for patch in patches:
+        for h in patch.hunks:
+            while h.lines and h.lines[-1] == (" ", ""):
+                h.lines.pop()
+
+    patches = [p for p in patches if p.hunks]
+    if not patches:
+        raise PatchError("Brak hunków w diffie")
+    return patches
+
+
+def apply_patch(original: str, hunks: list[Hunk], max_offset: int = 200, fuzz: int = 2) -> str:
+    """
+    Nakłada hunki na tekst w pamięci. Dopasowanie:
+    1. dokładnie w miejscu z nagłówka (z uwzględnieniem przesunięcia po poprzednich hunkach)
+    2. najbliższe dopasowanie w promieniu `max_offset` linii
+    3. to samo z ignorowaniem białych znaków
+    4. fuzz - obcięcie do `fuzz` linii kontekstu z brzegów hunka
+    Rzuca PatchError, jeśli hunk nie pasuje nigdzie.
+    """
+    trailing_newline = original.endswith("\n")
+    lines = original.split("\n")
+    if trailing_newline:
+        lines.pop()
+
+    offset = 0
+    search_from = 0
+    for number, hunk in enumerate(hunks, 1):
+        old_lines = hunk.old_lines
+        anchor = _anchor(hunk)
+        expected = max(anchor + offset, search_from)
+
+        position, trim_head, trim_tail = _locate(lines, hunk, expected, search_from, max_offset, fuzz)
+        if position is None:
+            raise PatchError(f"Hunk {number} (@@ -{hunk.old_start}) nie pasuje do pliku")
+
+        old_block = old_lines[trim_head:len(old_lines) - trim_tail]
+        new_block = _replacement(hunk.lines[trim_head:len(hunk.lines) - trim_tail], lines[position:position + len(old_block)])
+        lines[position:position + len(old_block)] = new_block
+
+        offset = position - (anchor + trim_head) + len(new_block) - len(old_block)
+        search_from = position + len(new_block)
+
+    return "\n".join(lines) + ("\n" if trailing_newline else "")
+
+
+def _locate(lines: list[str], hunk: Hunk, expected: int, search_from: int, max_offset: int, fuzz: int):
+    old_lines = hunk.old_lines
+    leading = _count_context(hunk.lines)
+    trailing = _count_context(list(reversed(hunk.lines)))
+
+    if not old_lines:
+        # Hunk bez kontekstu, tylko dodający linie - wstawienie w miejscu z nagłówka (_anchor)
+        return min(expected, len(lines)), 0, 0
+
+    for trim in range(0, fuzz + 1):
+        trim_head = min(trim, leading)
+        trim_tail = min(trim, trailing)
+        if trim and trim_head == 0 and trim_tail == 0:
+            break
+        block = old_lines[trim_head:len(old_lines) - trim_tail]
+        if not block:
+            # Fuzz obciął cały kontekst - wstawienie w ciemno pod numer z nagłówka to zgadywanie
+            break
+
+        for normalize in (False, True):
+            position = _find_block(lines, block, expected + trim_head, search_from, max_offset, normalize)
+            if position is not None:
+                return position, trim_head, trim_tail
+
+    return None, 0, 0
+
+
+def _anchor(hunk: Hunk) -> int:
+    """
+    Indeks linii, od której hunk zaczyna się w oryginale. "@@ -5,0" (samo wstawienie)
+    oznacza wstawienie PO linii 5, czyli na indeksie 5; "@@ -0,0" - na początku pliku.
+    """
+    if not hunk.old_lines and hunk.old_length == 0:
+        return hunk.old_start
+    return max(hunk.old_start - 1, 0)
+
+
+def _find_block(lines: list[str], block: list[str], expected: int, search_from: int,
+                max_offset: int, normalize: bool) -> Optional[int]:
+    """Szuka bloku zaczynając od `expected`, naprzemiennie w przód i w tył."""
+    def matches(start: int) -> bool:
+        if start < search_from or start + len(block) > len(lines):
+            return False
+        if normalize:
+            return all(a.strip() == b.strip() for a, b in zip(lines[start:start + len(block)], block))
+        return lines[start:start + len(block)] == block
+
+    for delta in range(0, max_offset + 1):
+        for start in (expected + delta, expected - delta) if delta else (expected,):
+            if matches(start):
+                return start
+    return None
+
+
+def _replacement(hunk_lines: list[tuple[str, str]], matched: list[str]) -> list[str]:
+    """Nowa treść bloku; linie kontekstu bierzemy z pliku (dopasowanie mogło ignorować wcięcia)."""
+    result = []
+    cursor = 0
+    for tag, text in hunk_lines:
+        if tag == " ":
+            result.append(matched[cursor])
+            cursor += 1
+        elif tag == "-":
+            cursor += 1
+        else:
+            result.append(text)
+    return result
+
+
+def _count_context(hunk_lines: list[tuple[str, str]]) -> int:
+    count = 0
+    for tag, _ in hunk_lines:
+        if tag != " ":
+            break
+        count += 1
+    return count
+
+
+def _strip_prefix(path: str) -> Optional[str]:
+    path = path.split("\t")[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        return path[2:]
+    return path
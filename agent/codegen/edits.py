@@ -0,0 +1,138 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+SEARCH_REPLACE_PATTERN = re.compile(
+    r"^<{5,9} SEARCH[ \t]*\n(?P<search>.*?)^={5,9}[ \t]*\n(?P<replace>.*?)^>{5,9} REPLACE[ \t]*$",
+    re.MULTILINE | re.DOTALL
+)
+
+EDIT_FORMAT_INSTRUCTIONS = """Odpowiedz WYŁĄCZNIE blokami edycji w formacie:
+<<<<<<< SEARCH
+<dokładny fragment obecnego kodu - kilka całych linii>
+=======
+<nowa wersja tego fragmentu>
+>>>>>>> REPLACE
+
+- fragment SEARCH musi występować w kodzie dokładnie raz (dodaj linie kontekstu, jeśli trzeba)
+- można podać kilka bloków, będą zastosowane po kolei
+- nie przepisuj całego pliku, nie dodawaj komentarzy poza blokami"""
+
+
+class EditError(Exception):
+    """Blok edycji nie pasuje do kodu (brak dopasowania lub dopasowanie niejednoznaczne)."""
+
+
+@dataclass
+class Edit:
+    search: str
+    replace: str
+
+
+def parse_edits(text: str) -> list[Edit]:
+    """Wyciąga bloki SEARCH/REPLACE z odpowiedzi modelu."""
+    text = text.replace("\r\n", "\n")
+    return [Edit(m.group("search"), m.group("replace")) for m in SEARCH_REPLACE_PATTERN.finditer(text)]
+
+
+def apply_edits(code: str, edits: list[Edit], resolve_ambiguous: bool = False) -> str:
+    """
+    Stosuje edycje po kolei. Rzuca EditError, jeśli któraś nie pasuje.
+    resolve_ambiguous=True: fragment występujący wiele razy trafia w pierwsze wystąpienie
+    za poprzednią edycją (modele podają bloki w kolejności pliku).
+    """
+    cursor = 0
+    for number, edit in enumerate(edits, 1):
+        code, cursor = apply_edit(code, edit, number, cursor if resolve_ambiguous else None)
+    return code
+
+
+def apply_edit(code: str, edit: Edit, number: int = 1, cursor: Optional[int] = None) -> tuple[str, int]:
+    """Zwraca (nowy kod, pozycję końca wstawionego fragmentu)."""
+    if not edit.search.strip():
+        raise EditError(f"Blok {number}: pusty fragment SEARCH")
+
+    # Dokładne dopasowanie tylko na granicach linii - fragment ze środka linii (np. bez wcięcia)
+    # podmieniłby część linii i zostawił jej początek; takie bloki idą ścieżką liniową
+    starts = [start for start in _find_all(code, edit.search) if _covers_whole_lines(code, start, edit.search)]
+    if len(starts) > 1:
+        after_cursor = [start for start in starts if cursor is not None and start >= cursor]
+        if not after_cursor:
+            raise EditError(f"Blok {number}: fragment SEARCH występuje {len(starts)} razy")
+        starts = after_cursor
+    if starts:
+        return _splice(code, starts[0], starts[0] + len(edit.search), edit.replace)
+
+    # Fallback: dopasowanie całych linii z pominięciem różnic w wcięciach/spacjach na końcach
+    return _apply_whitespace_tolerant(code, edit, number, cursor)
+
+
+def _find_all(code: str, search: str) -> list[int]:
+    starts = []
+    start = code.find(search)
+    while start != -1:
+        starts.append(start)
+        start = code.find(search, start + 1)
+    return starts
+
+
+def _covers_whole_lines(code: str, start: int, search: str) -> bool:
+    end = start + len(search)
+    starts_line = start == 0 or code[start - 1] == "\n"
+    ends_line = search.endswith("\n") or end == len(code) or code[end] == "\n"
+    return starts_line and ends_line
+
+
+def _splice(code: str, start: int, end: int, replacement: str) -> tuple[str, int]:
+    return code[:start] + replacement + code[end:], start + len(replacement)
+
+
+def _apply_whitespace_tolerant(code: str, edit: Edit, number: int, cursor: Optional[int]) -> tuple[str, int]:
+    lines = code.splitlines(keepends=True)
+    search_lines = [line.strip() for line in edit.search.strip("\n").splitlines()]
+    window = len(search_lines)
+
+    matches = [
+        start for start in range(len(lines) - window + 1)
+        if [line.strip() for line in lines[start:start + window]] == search_lines
+    ]
+    if not matches:
+        raise EditError(f"Blok {number}: nie znaleziono fragmentu SEARCH w kodzie")
+    if len(matches) > 1:
+        after_cursor = [m for m in matches if cursor is not None and len("".join(lines[:m])) >= cursor]
+        if not after_cursor:
+            raise EditError(f"Blok {number}: fragment SEARCH pasuje w {len(matches)} miejscach")
+        matches = after_cursor
+
+    start = matches[0]
+    replacement = _reindent(edit.replace, _indent_of(edit.search), _indent_of("".join(lines[start:start + window])))
+    if replacement and not replacement.endswith("\n") and start + window < len(lines):
+        replacement += "\n"
+    prefix = "".join(lines[:start])
+    return prefix + replacement + "".join(lines[start + window:]), len(prefix) + len(replacement)
+
+
+def _indent_of(text: str) -> str:
+    """Wcięcie pierwszej niepustej linii."""
+    for line in text.splitlines():
+        if line.strip():
+            return line[:len(line) - len(line.lstrip())]
+    return ""
+
+
+def _reindent(text: str, search_indent: str, file_indent: str) -> str:
+    """
+    Przesuwa REPLACE o różnicę wcięć między SEARCH a kodem - model, który zgubił
+    (albo dodał) poziom wcięcia w SEARCH, zrobił to samo w REPLACE.
+    """
+    if search_indent == file_indent:
+        return text
+
+    lines = text.splitlines(keepends=True)
+    if file_indent.startswith(search_indent):
+        extra = file_indent[len(search_indent):]
+        return "".join(extra + line if line.strip() else line for line in lines)
+    if search_indent.startswith(file_indent):
+        surplus = search_indent[len(file_indent):]
+        return "".join(line[len(surplus):] if line.startswith(surplus) else line for line in lines)
+    return text
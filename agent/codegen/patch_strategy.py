@@ -1,43 +1,130 @@
 import os
-import subprocess
-import tempfile
+import time
 from datetime import datetime
-from agent.validation.static import analyze_file
-from llm import LLMClient, Models
+from agent.config import get_config
+from agent.codegen.edits import EditError, EDIT_FORMAT_INSTRUCTIONS, parse_edits, apply_edits
+from agent.codegen.telemetry import estimate_tokens, record_generation
+from agent.codegen.diff_engine import FilePatch, PatchError, parse_unified_diff, apply_patch
+from agent.codegen.strategy import SUPPORTED_LINT_EXTENSIONS, get_llm, strip_code_fences, validate_code
+from agent.storage.snapshots import write_text
 
-llm = LLMClient(Models.QWEN_CODER_32B)
+def validate_and_patch(prompt: str, filepath: str, extension: str, max_attempts: int = 3) -> tuple[str, dict]:
+    """
+    Patch istniejącego pliku. Format zmian z konfiguracji `patch_format`:
+    - "search_replace" (domyślnie) - bloki SEARCH/REPLACE, odporne na złe numery linii
+    - "diff" - unified diff nakładany przez diff_engine
+    Zwraca: (kod, raport_walidacji)
+    """
+    if get_config().get("patch_format", "search_replace") == "diff":
+        return validate_and_patch_diff(prompt, filepath, extension, max_attempts)
+    return validate_and_edit(prompt, filepath, extension, max_attempts)
 
-SUPPORTED_LINT_EXTENSIONS = [".tsx", ".ts", ".js", ".jsx", ".py", ".html"]
+def validate_and_edit(prompt: str, filepath: str, extension: str, max_attempts: int = 3) -> tuple[str, dict]:
+    """
+    Patch przez bloki SEARCH/REPLACE. Model zwraca tylko zmieniane fragmenty
+    (kotwice dokładnego dopasowania), więc tokeny odpowiedzi nie rosną z rozmiarem pliku.
+    Kilka bloków = kilka edycji; fragment niejednoznaczny trafia w pierwsze wystąpienie
+    za poprzednią edycją.
+    Zwraca: (kod, raport_walidacji)
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Cannot patch non-existent file: {filepath}")
 
-def strip_code_fences(text: str) -> str:
-    lines = text.strip().splitlines()
-    if lines and lines[0].strip().startswith("```"):
-        lines = lines[1:]
-    if lines and lines[-1].strip() == "```":
-        lines = lines[:-1]
-    return "\n".join(lines).strip()
+    original_code = read_file_content(filepath)
+    report = "Unknown error"
+    start = time.perf_counter()
+    output_tokens = 0
+    responses = 0
+    apply_failures = 0
+    attempt = 0
 
-def validate_and_patch(prompt: str, filepath: str, extension: str, max_attempts: int = 3) -> tuple[str, dict]:
+    for attempt in range(1, max_attempts + 1):
+        print(f"🔧 Edytuję plik blokami SEARCH/REPLACE (podejście {attempt})...")
+
+        edit_prompt = f"""
+Plik: {filepath}
+
+Aktualny kod:
+```
+{original_code}
+```
+
+Zadanie: {prompt}
+
+{EDIT_FORMAT_INSTRUCTIONS}
+""".strip()
+
+        try:
+            response = get_llm().chat(edit_prompt)
+        except Exception as e:
+            print(f"❌ Błąd LLM przy generowaniu edycji: {e}")
+            continue
+        output_tokens += estimate_tokens(response)
+        responses += 1
+
+        edits = parse_edits(response)
+        try:
+            if not edits:
+                raise EditError("Brak bloków SEARCH/REPLACE w odpowiedzi")
+            patched_code = apply_edits(original_code, edits, resolve_ambiguous=True)
+        except EditError as e:
+            print(f"❌ Edycje nie pasują: {e}")
+            report = str(e)
+            apply_failures += 1
+            continue
+
+        print(f"✅ Zastosowano {len(edits)} edycji (w pamięci)")
+
+        if extension.lower() in SUPPORTED_LINT_EXTENSIONS:
+            ok, report = validate_code(patched_code, filepath)
+        else:
+            ok, report = True, f"no static analysis for '{extension}'"
+
+        if ok:
+            print("✅ Patch validation passed")
+            write_text(filepath, patched_code)
+            record_generation("patch:search_replace", filepath, attempt, True, time.perf_counter() - start,
+                              output_tokens=output_tokens, responses=responses, apply_failures=apply_failures)
+            return patched_code, {
+                "ok": True,
+                "details": f"Patch validation passed: {report}",
+                "edits": len(edits)
+            }
+
+        print(f"⚠️ Patch validation failed:\n{report.strip()}")
+
+    record_generation("patch:search_replace", filepath, attempt, False, time.perf_counter() - start,
+                      output_tokens=output_tokens, responses=responses, apply_failures=apply_failures)
+    return original_code, {
+        "ok": False,
+        "details": f"Patch failed after {max_attempts} attempts: {report}"
+    }
+
+def validate_and_patch_diff(prompt: str, filepath: str, extension: str, max_attempts: int = 3) -> tuple[str, dict]:
     """
-    Próbuje patch'ować istniejący plik na podstawie prompta używając git apply.
+    Próbuje patch'ować istniejący plik na podstawie prompta - w całości w pamięci.
     Zwraca: (kod, raport_walidacji)
     
     Flow:
-    1. Generuje git patch przez LLM
-    2. Zapisuje patch do output/logs/
-    3. Aplikuje przez git apply
-    4. Waliduje przez static analysis
-    5. Jeśli OK - zostawia zmiany w working dir
-    6. Jeśli błąd - cofa przez git apply -R
+    1. Generuje unified diff przez LLM
+    2. Zapisuje patch do output/logs/ (tylko do wglądu)
+    3. Nakłada hunki na bufor w pamięci (diff_engine: offset + fuzz)
+    4. Waliduje załatany bufor, zanim cokolwiek trafi na dysk
+    5. Jeśli OK - zapis atomowy pliku
+    6. Jeśli błąd - plik na dysku pozostaje nietknięty, nie ma czego cofać
     """
-    cwd = "output/app"
-    
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Cannot patch non-existent file: {filepath}")
     
     # Wczytaj oryginalny kod
-    with open(filepath, "r", encoding="utf-8") as f:
-        original_code = f.read()
+    original_code = read_file_content(filepath)
+    report = "Unknown error"
+    patch_file = None
+    start = time.perf_counter()
+    output_tokens = 0
+    responses = 0
+    apply_failures = 0
+    attempt = 0
     
     for attempt in range(1, max_attempts + 1):
         print(f"🔧 Patch'uję plik (podejście {attempt})...")
@@ -78,81 +165,86 @@ Git patch:
 """
 
         try:
-            raw_patch = llm.chat(patch_prompt)
+            raw_patch = get_llm().chat(patch_prompt)
             git_patch = strip_code_fences(raw_patch)
         except Exception as e:
             print(f"❌ Błąd LLM przy generowaniu patch'a: {e}")
             continue
+        output_tokens += estimate_tokens(raw_patch)
+        responses += 1
         
         # Zapisz patch do logów
-        patch_filename = f"patch_{os.path.basename(filepath)}_{timestamp}.patch"
-        patch_file = f"output/logs/{patch_filename}"
-        relative_patch_file = f"../logs/{patch_filename}"
-        
+        patch_file = f"output/logs/patch_{os.path.basename(filepath)}_{timestamp}.patch"
         os.makedirs("output/logs", exist_ok=True)
         with open(patch_file, "w", encoding="utf-8") as f:
             f.write(git_patch)
         
         print(f"📝 Patch zapisany: {patch_file}")
         
-        # Apply patch
-        apply_result = subprocess.run(
-            ["git", "apply", relative_patch_file], 
-            cwd=cwd, 
-            capture_output=True, 
-            text=True
-        )
-        
-        if apply_result.returncode != 0:
-            print(f"❌ Git apply failed: {apply_result.stderr}")
+        # Apply patch - w pamięci
+        try:
+            file_patch = select_file_patch(parse_unified_diff(git_patch), filepath)
+            patched_code = apply_patch(original_code, file_patch.hunks)
+        except PatchError as e:
+            print(f"❌ Patch nie pasuje: {e}")
+            report = str(e)
+            apply_failures += 1
             continue
         
-        print(f"✅ Patch applied successfully")
+        print("✅ Patch applied successfully (w pamięci)")
         
         # Pominięcie walidacji dla niewspieranych rozszerzeń
         if extension.lower() not in SUPPORTED_LINT_EXTENSIONS:
-            return read_file_content(filepath), {
+            write_text(filepath, patched_code)
+            record_generation("patch:diff", filepath, attempt, True, time.perf_counter() - start,
+                              output_tokens=output_tokens, responses=responses, apply_failures=apply_failures)
+            return patched_code, {
                 "ok": True,
                 "details": f"Patch applied successfully - no static analysis for '{extension}'",
                 "patch_file": patch_file
             }
         
-        # Walidacja statyczna
-        ok, report = analyze_file(filepath)
+        # Walidacja statyczna bufora, zanim dotkniemy pliku
+        ok, report = validate_code(patched_code, filepath)
         
         if ok:
             print(f"✅ Patch validation passed")
-            return read_file_content(filepath), {
+            write_text(filepath, patched_code)
+            record_generation("patch:diff", filepath, attempt, True, time.perf_counter() - start,
+                              output_tokens=output_tokens, responses=responses, apply_failures=apply_failures)
+            return patched_code, {
                 "ok": True, 
                 "details": f"Patch validation passed: {report}",
                 "patch_file": patch_file
             }
-        else:
-            print(f"⚠️ Patch validation failed:\n{report.strip()}")
-            
-            # Unapply patch (reverse)
-            unapply_result = subprocess.run(
-                ["git", "apply", "-R", relative_patch_file], 
-                cwd=cwd, 
-                capture_output=True, 
-                text=True
-            )
-            
-            if unapply_result.returncode != 0:
-                print(f"❌ Failed to unapply patch: {unapply_result.stderr}")
-                # Fallback - restore from original content
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(original_code)
-            else:
-                print(f"🔄 Patch unapplied successfully")
+
+        print(f"⚠️ Patch validation failed:\n{report.strip()}")
     
-    # Jeśli wszystkie próby patch'a się nie udały
+    # Jeśli wszystkie próby patch'a się nie udały - plik na dysku jest nietknięty
+    record_generation("patch:diff", filepath, attempt, False, time.perf_counter() - start,
+                      output_tokens=output_tokens, responses=responses, apply_failures=apply_failures)
     return original_code, {
         "ok": False, 
-        "details": f"Patch failed after {max_attempts} attempts: {report if 'report' in locals() else 'Unknown error'}",
-        "patch_file": patch_file if 'patch_file' in locals() else None
+        "details": f"Patch failed after {max_attempts} attempts: {report}",
+        "patch_file": patch_file
     }
 
+def select_file_patch(patches: list[FilePatch], filepath: str) -> FilePatch:
+    """Wybiera sekcję diffa dla patch'owanego pliku (po ścieżce lub nazwie pliku)."""
+    if len(patches) == 1:
+        return patches[0]
+
+    target = filepath.replace("\\", "/")
+    for patch in patches:
+        path = (patch.new_path or patch.old_path or "").replace("\\", "/")
+        if path and (target.endswith(path) or path.endswith(target)):
+            return patch
+    for patch in patches:
+        path = patch.new_path or patch.old_path or ""
+        if os.path.basename(path) == os.path.basename(filepath):
+            return patch
+    raise PatchError(f"Diff nie zawiera zmian dla {filepath}")
+
 def read_file_content(filepath: str) -> str:
     """Helper function to read file content."""
     with open(filepath, "r", encoding="utf-8") as f:
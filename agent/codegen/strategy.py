@@ -1,8 +1,22 @@
-import os
-from agent.validation.static import analyze_file
-from llm import LLMClient, Models
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from agent.config import get_config
+from agent.codegen.edits import EditError, EDIT_FORMAT_INSTRUCTIONS, parse_edits, apply_edits
+from agent.codegen.telemetry import record_generation
+from agent.validation.static import analyze_source
+from llm import LLMClient, LLMConfig, Models
 
-llm = LLMClient(Models.QWEN_CODER_32B)
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm() -> LLMClient:
+    """Klient LLM do generowania kodu - tworzony przy pierwszym użyciu, nie przy imporcie modułu"""
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = LLMClient(Models.QWEN_CODER_32B)
+    return _llm
 
 SUPPORTED_LINT_EXTENSIONS = [".tsx", ".ts", ".js", ".jsx", ".py", ".html"]
 
@@ -17,43 +31,169 @@ def strip_code_fences(text: str) -> str:
 
     return "\n".join(lines).strip()
 
+def ensure_trailing_newline(code: str) -> str:
+    """strip_code_fences obcina końcowy znak nowej linii - pliki zapisujemy z nim."""
+    return code if not code or code.endswith("\n") else code + "\n"
+
+def validate_code(code: str, filepath: str) -> tuple[bool, str]:
+    """
+    Waliduje kod kandydata w pamięci (stdin / parser w procesie).
+    Nic nie trafia do output/app przed akceptacją - watcher i GUI nie widzą kandydatów.
+    """
+    return analyze_source(ensure_trailing_newline(code), filepath)
+
 def validate_and_recreate(prompt: str, filepath: str, extension: str, max_attempts: int = 5) -> tuple[str, dict]:
     """
     Próbuje wygenerować kod i poddaje go analizie statycznej, jeśli typ pliku to kod.
+    Kolejne podejścia (repair_strategy = "repair") nie powtarzają tego samego prompta,
+    tylko wysyłają modelowi nieudany kod z raportem lintera i proszą o edycje SEARCH/REPLACE.
     Zwraca: (kod, raport_walidacji)
     """
-    for attempt in range(1, max_attempts + 1):
-        print(f"🧠 Generuję kod (podejście {attempt})...")
+    config = get_config()
+    if config.get("speculative_generation", False) and extension.lower() in SUPPORTED_LINT_EXTENSIONS:
+        return speculative_recreate(
+            prompt, filepath,
+            candidates=config.get("speculative_candidates", 3),
+            max_calls=config.get("speculative_max_calls", max_attempts)
+        )
+
+    strategy = config.get("repair_strategy", "repair")
+    start = time.perf_counter()
+    code, report = "", "Brak odpowiedzi LLM"
+    failed_code = None
 
+    for attempt in range(1, max_attempts + 1):
         try:
-            raw_code = llm.chat(prompt)
-            code = strip_code_fences(raw_code)
+            if failed_code is not None and strategy == "repair":
+                print(f"🩹 Naprawiam kod na podstawie raportu lintera (podejście {attempt})...")
+                code = repair_code(failed_code, report, filepath)
+            else:
+                print(f"🧠 Generuję kod (podejście {attempt})...")
+                raw_code = get_llm().chat(prompt)
+                code = strip_code_fences(raw_code)
+        except EditError as e:
+            # Edycje nie pasują do kodu - następne podejście generuje plik od nowa
+            print(f"⚠️  Nie udało się zastosować poprawek: {e}")
+            failed_code = None
+            continue
         except Exception as e:
             print(f"❌ Błąd LLM przy generowaniu kodu: {e}")
             continue
 
-        # Zapis do tymczasowego pliku
-        temp_path = filepath + ".tmp"
-        os.makedirs(os.path.dirname(temp_path), exist_ok=True)
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(code)
-
         # Pominięcie walidacji, jeśli rozszerzenie nie jest wspierane
         if extension.lower() not in SUPPORTED_LINT_EXTENSIONS:
-            os.remove(temp_path)
             return code, {
                 "ok": True,
                 "details": f"Brak analizy statycznej dla rozszerzenia '{extension}'."
             }
 
         # Walidacja statyczna
-        ok, report = analyze_file(temp_path)
-        os.remove(temp_path)
+        ok, report = validate_code(code, filepath)
 
         if ok:
-            return code, {"ok": True, "details": report}
+            record_generation(strategy, filepath, attempt, True, time.perf_counter() - start)
+            return code, {"ok": True, "details": report, "attempts": attempt}
 
         print(f"⚠️  Walidacja nieudana:\n{report.strip()}")
+        failed_code = code
 
     # Jeśli wszystkie próby zawiodły
-    return code, {"ok": False, "details": report}
+    record_generation(strategy, filepath, max_attempts, False, time.perf_counter() - start)
+    return code, {"ok": False, "details": report, "attempts": max_attempts}
+
+def build_repair_prompt(code: str, report: str, filepath: str) -> str:
+    return f"""
+Plik {filepath} nie przeszedł analizy statycznej.
+
+AKTUALNY KOD:
+```
+{code}
+```
+
+RAPORT LINTERA:
+{report.strip()}
+
+Popraw WYŁĄCZNIE błędy wskazane w raporcie, nie zmieniaj reszty kodu.
+
+{EDIT_FORMAT_INSTRUCTIONS}
+""".strip()
+
+def repair_code(code: str, report: str, filepath: str) -> str:
+    """
+    Prosi model o poprawki nieudanego kodu. Odpowiedź w blokach SEARCH/REPLACE
+    jest nakładana na kod; jeśli model mimo to zwrócił cały plik - bierzemy go w całości.
+    """
+    response = get_llm().chat(build_repair_prompt(code, report, filepath))
+    edits = parse_edits(response)
+    if not edits:
+        return strip_code_fences(response)
+    return apply_edits(code, edits)
+
+def speculative_recreate(prompt: str, filepath: str, candidates: int = 3, max_calls: int = 5) -> tuple[str, dict]:
+    """
+    Tryb spekulatywny: `candidates` generacji naraz (różne temperatury/seedy),
+    każdy kandydat walidowany od razu po nadejściu. Pierwszy poprawny wygrywa,
+    reszta jest anulowana. `max_calls` to łączny limit wywołań LLM (sufit kosztu).
+    Zwraca: (kod, raport_walidacji)
+    """
+    temperatures = get_config().get("speculative_temperatures", [0.0, 0.3, 0.6])
+    found = threading.Event()
+    start = time.perf_counter()
+
+    llm = get_llm()
+
+    def attempt(index: int):
+        if found.is_set():
+            return None
+        temperature = temperatures[index % len(temperatures)]
+        candidate_config = LLMConfig(
+            max_tokens=llm.config.max_tokens,
+            temperature=temperature,
+            system_message=llm.config.system_message,
+            extra_params={"seed": index}
+        )
+        code = strip_code_fences(llm.chat(prompt, candidate_config))
+        if found.is_set():
+            return None
+        ok, report = validate_code(code, filepath)
+        return index, temperature, code, ok, report
+
+    print(f"🧠 Generuję kod spekulatywnie ({candidates} kandydatów naraz, limit {max_calls} wywołań)...")
+    executor = ThreadPoolExecutor(max_workers=candidates, thread_name_prefix="candidate")
+    futures = [executor.submit(attempt, i) for i in range(max_calls)]
+    code, report = None, "Brak poprawnego kandydata"
+
+    try:
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ Błąd LLM przy generowaniu kandydata: {e}")
+                continue
+            if result is None:
+                continue
+
+            index, temperature, code, ok, report = result
+            if ok:
+                found.set()
+                elapsed = time.perf_counter() - start
+                record_generation("speculative", filepath, index + 1, True, elapsed, temperature=temperature)
+                print(f"✅ Kandydat {index + 1} (temperatura {temperature}) przeszedł walidację po {elapsed:.1f}s")
+                return code, {
+                    "ok": True,
+                    "details": report,
+                    "speculative": {
+                        "candidate": index,
+                        "temperature": temperature,
+                        "calls": sum(1 for f in futures if f.running() or f.done()),
+                        "elapsed": round(elapsed, 3)
+                    }
+                }
+            print(f"⚠️  Kandydat {index + 1} (temperatura {temperature}) nie przeszedł walidacji:\n{report.strip()}")
+    finally:
+        # Niezaczęte wywołania anulujemy; trwające kończą się w tle i są ignorowane
+        found.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    record_generation("speculative", filepath, max_calls, False, time.perf_counter() - start)
+    return code or "", {"ok": False, "details": report, "speculative": {"calls": max_calls}}
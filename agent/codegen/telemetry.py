@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+
+TELEMETRY_FILE = "output/logs/codegen_telemetry.jsonl"
+
+# Raport ostatnio zbudowanego kontekstu (per wątek) - dołączany do najbliższej generacji
+_context = threading.local()
+
+
+def estimate_tokens(text: str) -> int:
+    """Przybliżona liczba tokenów (~4 znaki na token) - bez zależności od tokenizera modelu."""
+    return (len(text) + 3) // 4
+
+
+def set_context_report(report: dict) -> None:
+    """Zapamiętuje raport kontekstu (packer) dla generacji, która użyje tego prompta."""
+    _context.report = report
+
+
+def _take_context_fields() -> dict:
+    report = getattr(_context, "report", None)
+    _context.report = None
+    if not report:
+        return {}
+    return {
+        "context_mode": report.get("neighbour_mode"),
+        "context_tokens": report.get("used", 0),
+        "context_saved_tokens": report.get("saved_tokens", 0)
+    }
+
+
+def record_generation(strategy: str, filepath: str, attempts: int, ok: bool, duration: float,
+                      path: str = TELEMETRY_FILE, **extra) -> None:
+    """Dopisuje jedną generację (strategia, liczba podejść do sukcesu, czas) do pliku JSONL."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "timestamp": time.time(),
+        "strategy": strategy,
+        "path": filepath,
+        "attempts": attempts,
+        "ok": ok,
+        "duration": round(duration, 3),
+        **_take_context_fields(),
+        **extra
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def summarize(path: str = TELEMETRY_FILE) -> dict:
+    """
+    Podsumowanie per strategia: liczba generacji, skuteczność,
+    średnia liczba podejść do sukcesu i średni czas.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    groups = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                groups[entry["strategy"]].append(entry)
+
+    summary = {}
+    for strategy, entries in groups.items():
+        successes = [e for e in entries if e["ok"]]
+        summary[strategy] = {
+            "generations": len(entries),
+            "success_rate": round(len(successes) / len(entries), 3),
+            "avg_attempts_to_success": round(sum(e["attempts"] for e in successes) / len(successes), 2) if successes else None,
+            "avg_duration": round(sum(e["duration"] for e in entries) / len(entries), 3)
+        }
+
+        # Strategie patch'owania: tokeny odpowiedzi i skuteczność nakładania zmian - liczone
+        # tylko na podejściach, w których LLM zwrócił odpowiedź (błąd wywołania to nie patch)
+        patch_entries = [e for e in entries if "output_tokens" in e]
+        responses = sum(e.get("responses", e["attempts"]) for e in patch_entries)
+        if responses:
+            apply_failures = sum(e.get("apply_failures", 0) for e in patch_entries)
+            summary[strategy]["avg_output_tokens"] = round(sum(e["output_tokens"] for e in patch_entries) / responses, 1)
+            summary[strategy]["apply_success_rate"] = round(1 - apply_failures / responses, 3)
+    return summary
+
+
+def summarize_context(path: str = TELEMETRY_FILE) -> dict:
+    """
+    Wpływ trybu kontekstu sąsiadów (sygnatury vs analizy) per tryb:
+    skuteczność walidacji, średni rozmiar kontekstu i redukcja względem pełnych analiz.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    groups = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("context_mode"):
+                    groups[entry["context_mode"]].append(entry)
+
+    summary = {}
+    for mode, entries in groups.items():
+        used = sum(e["context_tokens"] for e in entries)
+        saved = sum(e.get("context_saved_tokens", 0) for e in entries)
+        summary[mode] = {
+            "generations": len(entries),
+            "success_rate": round(sum(1 for e in entries if e["ok"]) / len(entries), 3),
+            "avg_context_tokens": round(used / len(entries), 1),
+            "avg_saved_tokens": round(saved / len(entries), 1),
+            "size_reduction": round(saved / (used + saved), 3) if used + saved else 0.0
+        }
+    return summary
@@ -3,7 +3,8 @@ import json
 from agent.commands.base import Command
 from agent.state import AgentState, StepResult
 from agent.prompt.builder import build_prompt
-from agent.codegen.strategy import validate_and_recreate
+from agent.codegen.strategy import validate_and_recreate, ensure_trailing_newline
+from agent.storage.snapshots import write_text
 
 class GenerateCodeCommand(Command):
     def run(self, state: AgentState) -> AgentState:
@@ -41,32 +42,41 @@ class GenerateCodeCommand(Command):
             max_attempts=5
         )
 
-        # 💾 Zapis kodu
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(code)
+        return save_generated_artifact(state, self.params, code, validation_report)
 
-        # 💾 Zapis metadanych
-        meta = {
-            "name": artifact_name,
-            "path": filepath,
-            "extension": extension,
-            "prompt": prompt_text
-        }
-        context_path = os.path.join("output", "context", f"{artifact_name}.meta.json")
-        os.makedirs(os.path.dirname(context_path), exist_ok=True)
-        with open(context_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
 
-        # 📜 Zapis do historii agenta
-        state.history.append(StepResult(
-            step_name="generate_code",
-            input=self.params,
-            output={
-                "code_path": filepath,
-                "meta_path": context_path,
-                "validation_report": validation_report
-            }
-        ))
+def save_generated_artifact(state: AgentState, step: dict, code: str, validation_report: dict) -> AgentState:
+    """Zapisuje wygenerowany kod, metadane i wpis w historii dla kroku generate_code."""
+    prompt_text = step["params"]["prompt"]
+    artifact = step["params"]["artifact"]
+    artifact_name = artifact["name"]
+    filepath = artifact["path"]
+    extension = artifact.get("extension", "")
+
+    # 💾 Zapis kodu
+    write_text(filepath, ensure_trailing_newline(code))
+
+    # 💾 Zapis metadanych
+    meta = {
+        "name": artifact_name,
+        "path": filepath,
+        "extension": extension,
+        "prompt": prompt_text
+    }
+    context_path = os.path.join("output", "context", f"{artifact_name}.meta.json")
+    os.makedirs(os.path.dirname(context_path), exist_ok=True)
+    with open(context_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    # 📜 Zapis do historii agenta
+    state.history.append(StepResult(
+        step_name="generate_code",
+        input=step,
+        output={
+            "code_path": filepath,
+            "meta_path": context_path,
+            "validation_report": validation_report
+        }
+    ))
 
-        return state
\ No newline at end of file
+    return state
@@ -0,0 +1,24 @@
+from agent.commands.base import Command
+from agent.state import AgentState
+from agent.codegen.batch_strategy import generate_batch
+from agent.commands.generate_code import save_generated_artifact
+
+class GenerateCodeBatchCommand(Command):
+    """
+    Wykonuje grupę kompatybilnych kroków generate_code jednym wywołaniem LLM.
+    Każdy krok dostaje własny wpis w historii - jak przy GenerateCodeCommand.
+    """
+
+    def __init__(self, steps: list[dict]):
+        super().__init__({"steps": steps})
+        self.steps = steps
+
+    def run(self, state: AgentState) -> AgentState:
+        print(f"📦 Batch generate_code: {len(self.steps)} artefaktów")
+        results = generate_batch(self.steps)
+
+        for step in self.steps:
+            code, validation_report = results[step["params"]["artifact"]["path"]]
+            state = save_generated_artifact(state, step, code, validation_report)
+
+        return state
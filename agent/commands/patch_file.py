@@ -55,9 +55,7 @@ class PatchFileCommand(Command):
             max_attempts=3  # Mniej prób niż przy generowaniu
         )
 
-        # 💾 Zapis kodu (patch'owanego)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(code)
+        # 💾 Kod zapisuje validate_and_patch (atomowo, tylko po udanej walidacji)
 
         # 💾 Aktualizacja metadanych
         meta = {
@@ -7,6 +7,9 @@ from pathlib import Path
 from agent.commands.base import Command
 from agent.state import AgentState, StepResult
 from agent.runner import ScriptRunner
+from agent.readiness import wait_for_dev_server
+from agent.config import get_config
+from agent.storage.script_cache import ScriptCache
 from registry.process_manager import ProcessManager
 from logger import get_log_hub
 
@@ -25,19 +28,19 @@ class RunScriptCommand(Command):
             return self._run_normal_command(state, command, cwd, log)
 
     def _run_dev_server(self, state: AgentState, command: str, cwd: str, process_manager: ProcessManager, log) -> AgentState:
-        """Uruchamia dev server w tle bez zaśmiecania konsoli"""
+        """Uruchamia dev server w tle i czeka aż faktycznie zacznie odpowiadać"""
         log.info("RUNSCRIPT", f"🚀 Dev-server: `{command}` (cwd={cwd})")
         
-        # Wykryj port z komendy
+        # Port z komendy to tylko podpowiedź - faktyczny port wykrywa wait_for_dev_server
         port_match = re.search(r"--port[ =](\d+)", command)
-        port = port_match.group(1) if port_match else "3000"
-        process_name = f"dev_server_{port}"
+        port_hint = int(port_match.group(1)) if port_match else None
+        log_name = f"dev_server_{port_hint or 'auto'}"
         
         # Przygotuj ścieżki dla logów dev servera
         log_dir = Path("output/logs")
         log_dir.mkdir(parents=True, exist_ok=True)
-        stdout_log = log_dir / f"dev_server_{port}_stdout.log"
-        stderr_log = log_dir / f"dev_server_{port}_stderr.log"
+        stdout_log = log_dir / f"{log_name}_stdout.log"
+        stderr_log = log_dir / f"{log_name}_stderr.log"
         
         try:
             # Uruchom process w tle z przekierowaniem outputu do plików
@@ -50,30 +53,51 @@ class RunScriptCommand(Command):
                     stderr=stderr_file,
                     # Proces nie będzie detached, ale w tle
                 )
-            
-            # Zarejestruj w ProcessManager
-            process_manager.processes[process_name] = process
-            log.info("RUNSCRIPT", f"✅ Dev server started (PID: {process.pid})")
+            log.info("RUNSCRIPT", f"⏳ Dev server uruchomiony (PID: {process.pid}), czekam na gotowość...")
             log.info("RUNSCRIPT", f"📝 Logs: {stdout_log}, {stderr_log}")
             
-            # Otwórz przeglądarkę
-            url = f"http://localhost:{port}"
-            log.info("RUNSCRIPT", f"🌐 Opening browser: {url}")
-            webbrowser.open(url)
+            timeout = self.params["params"].get("ready_timeout") or get_config().get("dev_server_ready_timeout", 30)
+            readiness = wait_for_dev_server(process, str(stdout_log), str(stderr_log), port_hint=port_hint, timeout=timeout)
+            
+            output = {
+                "ok": readiness.ready,
+                "stdout": "",
+                "stderr": "",
+                "pid": process.pid,
+                "port": readiness.port,
+                "url": readiness.url,
+                "time_to_ready": readiness.time_to_ready,
+                "readiness_signals": readiness.signals,
+                "logs": {
+                    "stdout": str(stdout_log),
+                    "stderr": str(stderr_log)
+                }
+            }
+            
+            if readiness.ready:
+                process_manager.processes[f"dev_server_{readiness.port}"] = process
+                log.info("RUNSCRIPT", f"✅ Dev server gotowy na porcie {readiness.port} po {readiness.time_to_ready}s ({', '.join(readiness.signals)})")
+                if port_hint and readiness.port != port_hint:
+                    log.warn("RUNSCRIPT", f"⚠️ Dev server użył portu {readiness.port} zamiast {port_hint}")
+                
+                log.info("RUNSCRIPT", f"🌐 Opening browser: {readiness.url}")
+                webbrowser.open(readiness.url)
+                output["stdout"] = f"Dev server ready on {readiness.url}"
+            elif readiness.exit_code is not None:
+                # Proces padł przed gotowością - nie ma czego rejestrować
+                log.error("RUNSCRIPT", f"❌ {readiness.error}")
+                output["stderr"] = readiness.error
+                output["exit_code"] = readiness.exit_code
+            else:
+                # Proces żyje, ale nie odpowiada - zostaje pod kontrolą ProcessManager (sprzątanie przy wyjściu)
+                process_manager.processes[log_name] = process
+                log.error("RUNSCRIPT", f"❌ {readiness.error}")
+                output["stderr"] = readiness.error
             
             state.history.append(StepResult(
                 step_name="run_script",
                 input=self.params,
-                output={
-                    "ok": True,
-                    "stdout": f"Dev server started on port {port}",
-                    "stderr": "",
-                    "pid": process.pid,
-                    "logs": {
-                        "stdout": str(stdout_log),
-                        "stderr": str(stderr_log)
-                    }
-                }
+                output=output
             ))
             
         except Exception as e:
@@ -95,14 +119,33 @@ class RunScriptCommand(Command):
     def _run_normal_command(self, state: AgentState, command: str, cwd: str, log) -> AgentState:
         """Uruchamia normalną komendę z pełnym outputem"""
         log.info("RUNSCRIPT", f"💻 Running: `{command}` (cwd={cwd})")
-        
-        result = ScriptRunner().run(command, cwd=cwd)
-        
-        # Pokaż output w konsoli dla normalnych komend
-        if result["stdout"]:
-            log.info("RUNSCRIPT", f"STDOUT:\n{result['stdout']}")
-        if result["stderr"]:
-            log.warn("RUNSCRIPT", f"STDERR:\n{result['stderr']}")
+
+        # ♻️ Cache: te same wejścia (np. package.json + lockfile) = ten sam wynik
+        cache = ScriptCache()
+        rule = None
+        if get_config().get("run_script_cache", True):
+            rule = cache.resolve_rule(command, self.params["params"].get("cache"))
+
+        if rule:
+            cached = cache.lookup(command, cwd, rule)
+            if cached:
+                log.info("RUNSCRIPT", f"♻️ Cache hit: `{command}` - wejścia bez zmian ({', '.join(rule['inputs'])}), pomijam uruchomienie")
+                state.history.append(StepResult(
+                    step_name="run_script",
+                    input=self.params,
+                    output={**cached, "cache": "hit"}
+                ))
+                return state
+
+        # Output jest strumieniowany do log hub'a na bieżąco przez ScriptRunner
+        result = ScriptRunner().run(command, cwd=cwd, timeout=self.params["params"].get("timeout"))
+        if result.get("logs"):
+            log.info("RUNSCRIPT", f"📝 Pełny output: {result['logs']['stdout']}, {result['logs']['stderr']}")
+
+        if rule:
+            if result["ok"]:
+                cache.save(command, cwd, rule, result)
+            result = {**result, "cache": "miss"}
             
         state.history.append(StepResult(
             step_name="run_script",
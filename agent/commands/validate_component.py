@@ -1,6 +1,6 @@
 from agent.commands.base import Command
 from agent.state import AgentState, StepResult
-from agent.validation.static import analyze_tsx_file
+from agent.validation.static import analyze_file
 import os
 import shutil
 
@@ -10,7 +10,7 @@ class ValidateComponentCommand(Command):
         src = os.path.join("output", "components", f"{name}.tsx")
         dst = os.path.join("output", "validated", f"{name}.tsx")
 
-        passed, report = analyze_tsx_file(src)
+        passed, report = analyze_file(src)
 
         if passed:
             os.makedirs(os.path.dirname(dst), exist_ok=True)
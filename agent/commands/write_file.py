@@ -1,7 +1,7 @@
 from agent.commands.base import Command
 from agent.state import AgentState, StepResult
 import os
-import shutil
+from agent.storage.snapshots import copy_file
 
 class WriteFileCommand(Command):
     def run(self, state: AgentState) -> AgentState:
@@ -21,12 +21,11 @@ class WriteFileCommand(Command):
             with open(path, encoding="utf-8") as f1, open(src_path, encoding="utf-8") as f2:
                 if f1.read() != f2.read():
                     alt_path = os.path.splitext(path)[0] + ".generated.tsx"
-                    shutil.copyfile(src_path, alt_path)
+                    copy_file(src_path, alt_path)
                     final_path = alt_path
                     conflict = True
         else:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            shutil.copyfile(src_path, path)
+            copy_file(src_path, path)
 
         component_name = name
         state.artifacts[component_name] = final_path
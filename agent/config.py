@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any
+
+class AgentConfig:
+    """Konfiguracja agenta (limity stanu, cache, strategie generowania)"""
+
+    def __init__(self, config_path: Path = None):
+        self.config_file = config_path or (Path(__file__).parent / "agent_config.json")
+
+        # Domyślne wartości
+        self.defaults = {
+            "history_in_memory": 50,
+            "history_page_size": 25,
+            "spill_threshold_bytes": 4096,
+            "blob_preview_chars": 200,
+            "batch_generation": False,
+            "batch_max_artifacts": 8,
+            "run_script_cache": True,
+            "script_timeout": 600,
+            "script_buffer_lines": 200,
+            "dev_server_ready_timeout": 30,
+            "snapshots": True,
+            "snapshot_retention": 5,
+            "snapshot_rollback_on_failure": True,
+            "eslint_daemon": True,
+            "python_pool_min_files": 4,
+            "python_pool_workers": None,
+            "validation_cache": True,
+            "validation_cache_size": 1000,
+            "speculative_generation": False,
+            "speculative_candidates": 3,
+            "speculative_max_calls": 5,
+            "speculative_temperatures": [0.0, 0.3, 0.6],
+            "repair_strategy": "repair",
+            "patch_format": "search_replace",
+            "typecheck": True,
+            "typecheck_max_repairs": 1,
+            "typecheck_timeout": 300,
+            "context_token_budget": None,
+            "fragment_cache_bytes": 8388608,
+            "context_depth": 2,
+            "context_hop_decay": 0.5,
+            "retrieval_top_k": 8,
+            "retrieval_refresh_interval": 2.0,
+            "retrieval_related_k": 3,
+            "vector_retrieval": False,
+            "embedding_provider": "ollama",
+            "embedding_model": "nomic-embed-text",
+            "embedding_probe_timeout": 2.0,
+            "project_tree_max_files_per_dir": 40,
+            "neighbour_context": "signatures"
+        }
+
+        # Wczytaj konfigurację
+        self.config = self._load_config()
+
+    def _load_config(self) -> Dict[str, Any]:
+        """Wczytuje konfigurację z pliku JSON"""
+        config = self.defaults.copy()
+
+        if self.config_file.exists():
+            try:
+                with self.config_file.open(encoding="utf-8") as f:
+                    config.update(json.load(f))
+            except Exception as e:
+                print(f"⚠️ Błąd wczytywania konfiguracji {self.config_file}: {e}", file=sys.stderr)
+                print("📝 Używam domyślnych wartości", file=sys.stderr)
+
+        return config
+
+    def get(self, key: str, default=None):
+        """Pobiera wartość z konfiguracji"""
+        return self.config.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Ustawia wartość w konfiguracji (tylko w pamięci)"""
+        self.config[key] = value
+
+    def __str__(self):
+        return f"AgentConfig(config_file={self.config_file})"
+
+
+# Singleton instance
+_config_instance = None
+
+def get_config() -> AgentConfig:
+    """Zwraca singleton instancję konfiguracji agenta"""
+    global _config_instance
+    if _config_instance is None:
+        _config_instance = AgentConfig()
+    return _config_instance
+
+def reload_config():
+    """Przeładowuje konfigurację (dla hot reload)"""
+    global _config_instance
+    _config_instance = None
+    return get_config()
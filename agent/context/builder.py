@@ -1,148 +1,154 @@
 import os
-import json
-from datetime import datetime
+import re
+from collections import Counter
+from agent.codegen.telemetry import estimate_tokens, set_context_report
+from agent.config import get_config
+from agent.context.knowledge_index import get_knowledge_index
+from agent.context.fragment_cache import get_fragment_cache
+from agent.context.retrieval import get_lexical_index, fuse_rankings
+from agent.context.vector_index import get_vector_index
+from agent.context.project_tree import get_project_tree_model
+from agent.context.packer import Fragment, context_budget, extract_signatures, pack_fragments, log_pack_report
 
-def build_hybrid_context(current_path: str = None, prompt_text: str = "") -> str:
+def build_hybrid_context(current_path: str = None, prompt_text: str = "", model: str = None) -> str:
     """
     Buduje kontekst do prompta na podstawie:
     - current_path: dokładna ścieżka do aktualnego pliku (opcjonalne)
-    - prompt_text: zadanie do wykonania
-    
-    Głębokość powiązań: 1 (tylko bezpośrednie dependencies)
+    - prompt_text: zadanie do wykonania (także zapytanie do indeksów BM25 i wektorowego analiz)
+    - model: model docelowy - wyznacza budżet tokenów kontekstu
+    
+    Głębokość powiązań: `context_depth` z configu (BFS po grafie importów w obie strony),
+    istotność maleje o `context_hop_decay` na każdy krok.
+    Fragmenty są oceniane i pakowane w budżet (packer.py) - te, które się nie mieszczą,
+    trafiają do prompta jako sygnatury/podsumowanie albo wcale.
+    Sąsiedzi w grafie: `neighbour_context` = "signatures" (blok sygnatur API z analysera,
+    jeśli jest) albo "analysis" (pełna analiza .md).
     """
     fragments = []
+    neighbour_mode = get_config().get("neighbour_context", "signatures")
+    signature_blocks = 0
+    saved_tokens = 0
     
     # 1. STRUKTURA PROJEKTU (zawsze przydatna)
     project_tree = get_project_tree("output/app")
     if project_tree:
-        fragments.append(f"### STRUKTURA PROJEKTU:\n{project_tree}")
+        fragments.append(Fragment("STRUKTURA PROJEKTU:", project_tree, variants=[summarize_tree(project_tree)]))
     
     # 2. AKTUALNY PLIK (pełny kod z dokładnej ścieżki) - OPCJONALNIE
     if current_path and os.path.exists(current_path):
         current_code = load_file_content(current_path)
         if current_code:
-            fragments.append(f"### AKTUALNY PLIK: {current_path}\n{current_code}")
+            fragments.append(Fragment(
+                f"AKTUALNY PLIK: {current_path}", current_code, path=current_path, distance=0,
+                variants=[extract_signatures(current_code), f"({len(current_code.splitlines())} linii - pełny kod pominięty, limit kontekstu)"]
+            ))
     
-    # 3. POWIĄZANIA z knowledge.json (głębokość 1) - tylko jeśli mamy current_path
+    # 3. POWIĄZANIA z knowledge.json (głębokość N) - tylko jeśli mamy current_path
     if current_path:
-        knowledge = load_knowledge_graph("output/.synth/knowledge.json")
-        if knowledge:
-            # Parents - kto importuje current_file
-            parents = find_parents(current_path, knowledge)
-            for parent_file in parents:
-                analysis = load_full_analysis(parent_file)
-                if analysis:
-                    fragments.append(f"### UŻYWA TEGO PLIKU: {parent_file}\n{analysis}")
-            
-            # Children - co current_file importuje  
-            children = find_children(current_path, knowledge)
-            for child_file in children:
-                analysis = load_full_analysis(child_file)
-                if analysis:
-                    fragments.append(f"### IMPORTOWANY PRZEZ TEN PLIK: {child_file}\n{analysis}")
-
-    return "\n\n".join(fragments) if fragments else ""
+        index = get_knowledge_index()
+        depth = get_config().get("context_depth", 2)
+        related = []
+        for direction, label, indirect_label in (
+            ("importers", "UŻYWA TEGO PLIKU", "UŻYWA POŚREDNIO"),  # parents
+            ("imports", "IMPORTOWANY PRZEZ TEN PLIK", "IMPORTOWANY POŚREDNIO"),  # children
+        ):
+            reachable = index.reachable(current_path, depth, direction)
+            for related_file, hops in sorted(reachable.items(), key=lambda item: (item[1], item[0])):
+                related.append((label if hops == 1 else f"{indirect_label} ({hops}. poziom)", related_file, hops))
 
+        for label, related_file, hops in related:
+            analysis = load_full_analysis(related_file)
+            node = index.node(related_file)
 
-def get_project_tree(root_path: str) -> str:
-    """Generuje drzewo plików projektu (tylko istotne pliki)"""
-    if not os.path.exists(root_path):
+            # Sąsiadom zwykle wystarcza eksportowane API - blok sygnatur zamiast opisu prozą
+            if neighbour_mode == "signatures" and node and node.signatures:
+                block = "\n".join(node.signatures)
+                fragments.append(Fragment(
+                    f"{label} (API): {related_file}", block, path=related_file, distance=hops,
+                    weight=node.weight,
+                    variants=[f"Eksporty: {', '.join(node.exports)}"] if node.exports else []
+                ))
+                signature_blocks += 1
+                saved_tokens += max(0, estimate_tokens(analysis) - estimate_tokens(block))
+            elif analysis:
+                fragments.append(Fragment(
+                    f"{label}: {related_file}", analysis, path=related_file, distance=hops,
+                    weight=node.weight if node else 1.0,
+                    variants=degrade_analysis(analysis, node.exports if node else [])
+                ))
+
+    # 4. PLIKI PASUJĄCE DO ZADANIA (BM25 + wyszukiwanie semantyczne)
+    # Bez current_path (planowanie scenariusza) to jedyne źródło wiedzy o istniejących plikach,
+    # z current_path - uzupełnienie grafu o kilka podobnych plików spoza sąsiedztwa
+    config = get_config()
+    top_k = config.get("retrieval_top_k", 8) if not current_path else config.get("retrieval_related_k", 3)
+    if prompt_text and top_k:
+        index = get_knowledge_index()
+        included = {fragment.path for fragment in fragments if fragment.path}
+        for matching_file in find_matching_files(prompt_text, top_k, exclude=included):
+            analysis = load_full_analysis(matching_file)
+            if analysis:
+                node = index.node(matching_file)
+                fragments.append(Fragment(
+                    f"PASUJĄCY DO ZADANIA: {matching_file}", analysis, path=matching_file,
+                    distance=1 if not current_path else 2,
+                    weight=node.weight if node else 1.0,
+                    variants=degrade_analysis(analysis, node.exports if node else [])
+                ))
+
+    if not fragments:
         return ""
-    
-    tree_lines = []
-    
-    # Lista rozszerzeń które nas interesują
-    relevant_extensions = {'.tsx', '.ts', '.jsx', '.js', '.json', '.html', '.css', '.md'}
-    # Katalogi do pominięcia
-    skip_dirs = {'.git', 'node_modules', '.meta', '.synth', 'dist', 'build', '.vscode'}
-    
-    for root, dirs, files in os.walk(root_path):
-        # Filtruj katalogi
-        dirs[:] = [d for d in dirs if d not in skip_dirs and not d.startswith('.')]
-        
-        # Filtruj i sortuj pliki
-        relevant_files = []
-        for file in files:
-            if (not file.startswith('.') and 
-                any(file.endswith(ext) for ext in relevant_extensions)):
-                relevant_files.append(file)
-        
-        # Dodaj pliki do drzewa
-        for file in sorted(relevant_files):
-            full_path = os.path.join(root, file)
-            # Konwertuj na relative path od output/
-            rel_path = os.path.relpath(full_path, "output").replace("\\", "/")
-            tree_lines.append(f"output/{rel_path}")
-    
-    return "\n".join(tree_lines)
 
+    packed, report = pack_fragments(fragments, context_budget(model), task_text=prompt_text)
+    report.update(neighbour_mode=neighbour_mode, signature_blocks=signature_blocks, saved_tokens=saved_tokens)
+    log_pack_report(report)
+    set_context_report(report)
+    return "\n\n".join(packed)
 
-def load_knowledge_graph(knowledge_path: str) -> dict:
-    """Wczytuje knowledge.json z obsługą błędów."""
-    if not os.path.exists(knowledge_path):
-        return {}
-    
-    try:
-        with open(knowledge_path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, PermissionError):
-        return {}
 
+def warm_context_indexes() -> None:
+    """
+    Odświeża współdzielone indeksy (drzewo projektu, graf wiedzy, BM25, wektorowy) zanim znane
+    jest zapytanie - build_hybrid_context wykonany później korzysta już z gotowych struktur.
+    """
+    get_project_tree("output/app")
+    get_knowledge_index().refresh()
+    get_lexical_index().refresh()
+    if get_config().get("vector_retrieval", False):
+        get_vector_index().refresh()
 
-def find_parents(current_path: str, knowledge: dict) -> list[str]:
-    """Znajduje pliki które importują current_path (głębokość 1)."""
-    parents = []
-    
-    # Normalizuj separatory  
-    normalized_current = current_path.replace("/", "\\")
-    
-    # Znajdź klucz dla current_path
-    current_key = None
-    for file_key, file_info in knowledge.get("files", {}).items():
-        if file_info.get("meta", {}).get("path") == normalized_current:
-            current_key = file_key
-            break
-    
-    if not current_key:
-        return []
-    
-    # Znajdź dependency_string który mapuje na current_key
-    current_filename = os.path.basename(normalized_current)  # App.tsx
-    possible_deps = [f"./{current_filename}", f"../{current_filename}"]  # ./App.tsx, ../App.tsx
-    
-    # Szukaj kto ma dependency na current_file
-    for file_key, deps in knowledge.get("dependencies", {}).items():
-        for dep in deps:
-            if dep in possible_deps:  # ./App.tsx
-                file_path = knowledge.get("files", {}).get(file_key, {}).get("meta", {}).get("path")
-                if file_path and file_path != normalized_current:
-                    parents.append(file_path)
-    
-    return parents
 
+def find_matching_files(query: str, k: int, exclude: set = frozenset()) -> list[str]:
+    """Pliki najlepiej pasujące do zapytania: ranking BM25 i wektorowy połączone przez RRF."""
+    rankings = [[path for path, _ in get_lexical_index().search(query, k=k + len(exclude)) if path not in exclude]]
+    if get_config().get("vector_retrieval", False):
+        rankings.append([path for path, _ in get_vector_index().search(query, k=k, exclude=tuple(exclude))])
+    return fuse_rankings(rankings, k)
 
-def find_children(current_path: str, knowledge: dict) -> list[str]:
-    """Znajduje pliki które current_path importuje (głębokość 1)."""
-    children = []
-    
-    # Znajdź klucz dla current_path w knowledge
-    current_key = None
-    for file_key, file_info in knowledge.get("files", {}).items():
-        if file_info.get("meta", {}).get("path") == current_path:
-            current_key = file_key
-            break
-    
-    if not current_key:
-        return []
-    
-    # Znajdź co current_key importuje
-    deps = knowledge.get("dependencies", {}).get(current_key, [])
-    for dep_key in deps:
-        file_path = knowledge.get("files", {}).get(dep_key, {}).get("meta", {}).get("path")
-        if file_path and file_path != current_path:  # nie siebie samego
-            children.append(file_path)
-    
-    return children
+
+def summarize_tree(project_tree: str) -> str:
+    """Tańsza wersja drzewa: katalogi z liczbą plików."""
+    counts = Counter(path.rsplit("/", 1)[0] for path in project_tree.splitlines())
+    return "\n".join(f"{directory}/ ({count} plików)" for directory, count in sorted(counts.items()))
+
+
+def degrade_analysis(analysis: str, exports: list[str]) -> list[str]:
+    """Tańsze wersje analizy .md: podsumowanie + eksporty, a potem samo pierwsze zdanie."""
+    match = re.search(r"## Podsumowanie\n(.*?)(?:\n## |\Z)", analysis, re.DOTALL)
+    summary = match.group(1).strip() if match else ""
+    exports_txt = f"Eksporty: {', '.join(exports)}" if exports else ""
+    first_sentence = re.split(r"(?<=[.!?])\s", summary, maxsplit=1)[0] if summary else ""
+
+    variants = ["\n".join(part for part in (summary, exports_txt) if part)]
+    variants.append(" ".join(part for part in (first_sentence, exports_txt) if part))
+    return [variant for variant in variants if variant]
+
+
+def get_project_tree(root_path: str) -> str:
+    """Drzewo plików projektu (tylko istotne pliki) - ze wspólnego, aktualizowanego przyrostowo modelu."""
+    if not os.path.exists(root_path):
+        return ""
+    return get_project_tree_model(root_path).listing(relevant_only=True)
 
 
 def load_full_analysis(file_path: str) -> str:
@@ -159,22 +165,9 @@ def load_full_analysis(file_path: str) -> str:
     # Konwertuj z powrotem na separatory systemu
     meta_path = meta_path.replace("/", os.sep)
     
-    if os.path.exists(meta_path):
-        try:
-            with open(meta_path, encoding="utf-8") as f:
-                return f.read()
-        except Exception:
-            return ""
-    return ""
+    return get_fragment_cache().read(meta_path) or ""
 
 
 def load_file_content(file_path: str) -> str:
-    """Wczytuje zawartość dowolnego pliku."""
-    if not os.path.exists(file_path):
-        return ""
-    
-    try:
-        with open(file_path, encoding="utf-8") as f:
-            return f.read()
-    except Exception:
-        return ""
\ No newline at end of file
+    """Wczytuje zawartość dowolnego pliku (przez cache fragmentów - walidacja po mtime/rozmiarze)."""
+    return get_fragment_cache().read(file_path) or ""
\ No newline at end of file
@@ -0,0 +1,104 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from agent.config import get_config
+
+
+class FragmentCache:
+    """
+    Cache treści plików czytanych do kontekstu (.analysis.md, kod źródłowy).
+    Wpis jest ważny dopóki (mtime_ns, rozmiar) pliku się nie zmieni - stat zamiast odczytu.
+    Ograniczenie: łączny rozmiar treści w bajtach, wypierane najdawniej używane (LRU).
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, tuple[tuple[int, int], str, int]] = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, path: str) -> Optional[str]:
+        """Treść pliku (z cache albo z dysku). None, jeśli pliku nie ma lub nie da się go odczytać."""
+        key = os.path.normcase(os.path.abspath(path))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._discard(key)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            self._discard(key)
+            return None
+
+        self._store(key, signature, content)
+        return content
+
+    def _store(self, key: str, signature: tuple[int, int], content: str) -> None:
+        size = len(content.encode("utf-8"))
+        with self.lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (signature, content, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        with self.lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions
+        }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# Singleton instance
+_cache_instance = None
+
+def get_fragment_cache() -> FragmentCache:
+    """Zwraca singleton cache fragmentów kontekstu"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = FragmentCache(max_bytes=get_config().get("fragment_cache_bytes", 8 * 1024 * 1024))
+    return _cache_instance
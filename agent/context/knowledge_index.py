@@ -0,0 +1,224 @@
+import os
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from logger import get_log_hub
+
+KNOWLEDGE_FILE = "output/.synth/knowledge.json"
+META_SUFFIX = ".analysis.json"
+# Kolejność prób przy rozwiązywaniu importów bez rozszerzenia (jak bundler)
+RESOLVE_EXTENSIONS = [".tsx", ".ts", ".jsx", ".js", ".mjs", ".cjs", ".json", ".css", ".scss", ".py"]
+
+
+@dataclass
+class KnowledgeNode:
+    path: str  # ścieżka pliku źródłowego, np. output/app/src/App.tsx (separator "/")
+    key: str  # klucz w knowledge.json, np. app\src\App.tsx.analysis.json
+    type: Optional[str] = None
+    weight: float = 1.0
+    exports: list[str] = field(default_factory=list)
+    signatures: list[str] = field(default_factory=list)  # sygnatury eksportowanego API (analyser)
+    imports: list[str] = field(default_factory=list)  # rozwiązane ścieżki lokalnych plików
+    external_imports: list[str] = field(default_factory=list)  # pakiety (react, lodash...)
+
+
+def normalize_path(path: str) -> str:
+    """Wspólny format ścieżek w indeksie: względna do cwd, separator "/"."""
+    if os.path.isabs(path):
+        path = os.path.relpath(path)
+    return os.path.normpath(path).replace("\\", "/")
+
+
+class KnowledgeIndex:
+    """
+    Indeks knowledge.json w pamięci: ścieżka -> węzeł, węzeł -> importy, węzeł -> importujący.
+    Wszystkie zapytania O(1). Plik jest wczytywany ponownie tylko gdy zmieni się jego
+    mtime/rozmiar, a mapy przebudowywane tylko gdy zmieni się wersja z metadata.
+    Zasięg w grafie (BFS do głębokości N) jest liczony raz per węzeł i unieważniany tylko
+    dla wpisów, przez które przechodzi zmieniona krawędź.
+    """
+
+    def __init__(self, knowledge_path: str = KNOWLEDGE_FILE, output_dir: str = "output"):
+        self.knowledge_path = knowledge_path
+        self.output_dir = output_dir
+        self.nodes: dict[str, KnowledgeNode] = {}
+        self.importers: dict[str, list[str]] = {}
+        self.reach_cache: dict[tuple[str, str, int], dict[str, int]] = {}
+        self.file_signature: Optional[tuple] = None
+        self.version: Optional[tuple] = None
+        self.lock = threading.Lock()
+        self.stats = {"loads": 0, "rebuilds": 0, "reach_hits": 0, "reach_misses": 0, "reach_invalidated": 0}
+        self.log_hub = get_log_hub()
+
+    def refresh(self) -> bool:
+        """Przeładowuje indeks, jeśli knowledge.json się zmienił. Zwraca True po przebudowie."""
+        try:
+            stat = os.stat(self.knowledge_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+
+        with self.lock:
+            if signature == self.file_signature:
+                return False
+            self.file_signature = signature
+
+            knowledge = self._load() if signature else {}
+            self.stats["loads"] += 1
+            metadata = knowledge.get("metadata", {})
+            version = (metadata.get("version"), metadata.get("built_at"), metadata.get("last_updated"))
+            if knowledge and version == self.version:
+                return False
+
+            self.version = version if knowledge else None
+            self._build(knowledge)
+            self.stats["rebuilds"] += 1
+            self.log_hub.debug("AGENT", f"🧠 KnowledgeIndex: {len(self.nodes)} plików, przebudowa #{self.stats['rebuilds']}")
+            return True
+
+    def node(self, path: str) -> Optional[KnowledgeNode]:
+        self.refresh()
+        return self.nodes.get(normalize_path(path))
+
+    def imports_of(self, path: str) -> list[str]:
+        """Pliki importowane przez `path` (głębokość 1)."""
+        node = self.node(path)
+        return list(node.imports) if node else []
+
+    def importers_of(self, path: str) -> list[str]:
+        """Pliki, które importują `path` (głębokość 1)."""
+        self.refresh()
+        return list(self.importers.get(normalize_path(path), []))
+
+    def reachable(self, path: str, depth: int, direction: str = "imports") -> dict[str, int]:
+        """
+        Pliki osiągalne z `path` w co najwyżej `depth` krokach: {ścieżka: liczba kroków}.
+        direction: "imports" (co plik importuje, przechodnio) albo "importers" (kto go używa).
+        """
+        self.refresh()
+        start = normalize_path(path)
+        key = (start, direction, depth)
+        with self.lock:
+            cached = self.reach_cache.get(key)
+            if cached is not None:
+                self.stats["reach_hits"] += 1
+                return dict(cached)
+            self.stats["reach_misses"] += 1
+
+            if direction == "imports":
+                edges = lambda node_path: self.nodes[node_path].imports if node_path in self.nodes else []
+            else:
+                edges = lambda node_path: self.importers.get(node_path, [])
+
+            distances = {start: 0}
+            queue = deque([start])
+            while queue:
+                current = queue.popleft()
+                if distances[current] >= depth:
+                    continue
+                for neighbour in edges(current):
+                    if neighbour not in distances:
+                        distances[neighbour] = distances[current] + 1
+                        queue.append(neighbour)
+
+            del distances[start]
+            self.reach_cache[key] = distances
+            return dict(distances)
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.nodes)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.knowledge_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.log_hub.warn("AGENT", f"⚠️ Nie można wczytać {self.knowledge_path}: {e}")
+            return {}
+
+    def _build(self, knowledge: dict) -> None:
+        nodes = {}
+        for key, info in knowledge.get("files", {}).items():
+            path = self._source_path(key)
+            nodes[path] = KnowledgeNode(
+                path=path,
+                key=key,
+                type=info.get("type"),
+                weight=info.get("weight", 1.0),
+                exports=list(info.get("exports", [])),
+                signatures=list(info.get("signatures", [])),
+            )
+
+        # Importy w knowledge.json to surowe specyfikatory ("./Button", "react") - rozwiązujemy je raz
+        dependencies = knowledge.get("dependencies", {})
+        importers: dict[str, list[str]] = {}
+        for node in nodes.values():
+            for specifier in dependencies.get(node.key, []):
+                target = self._resolve(node.path, specifier, nodes)
+                if target is None:
+                    node.external_imports.append(specifier)
+                elif target != node.path and target not in node.imports:
+                    node.imports.append(target)
+                    importers.setdefault(target, []).append(node.path)
+
+        self._invalidate_reach(nodes)
+        self.nodes = nodes
+        self.importers = importers
+
+    def _invalidate_reach(self, nodes: dict[str, KnowledgeNode]) -> None:
+        """
+        Usuwa z cache zasięgu tylko wpisy, które przechodzą przez zmienioną krawędź a -> b:
+        dla "imports" te, które osiągają a; dla "importers" te, które osiągają b.
+        """
+        changed = {"imports": set(), "importers": set()}
+        for path in self.nodes.keys() | nodes.keys():
+            old = self.nodes.get(path)
+            new = nodes.get(path)
+            old_imports = old.imports if old else None
+            new_imports = new.imports if new else None
+            if old_imports != new_imports:
+                changed["imports"].add(path)
+                changed["importers"].update(set(old_imports or []) ^ set(new_imports or []))
+
+        stale = [
+            key for key, distances in self.reach_cache.items()
+            if key[0] in changed[key[1]] or not changed[key[1]].isdisjoint(distances)
+        ]
+        for key in stale:
+            del self.reach_cache[key]
+        self.stats["reach_invalidated"] += len(stale)
+
+    def _source_path(self, key: str) -> str:
+        # app\src\App.tsx.analysis.json -> output/app/src/App.tsx
+        rel_path = key.replace("\\", "/")
+        if rel_path.endswith(META_SUFFIX):
+            rel_path = rel_path[:-len(META_SUFFIX)]
+        return normalize_path(os.path.join(self.output_dir, rel_path))
+
+    @staticmethod
+    def _resolve(importer: str, specifier: str, nodes: dict[str, KnowledgeNode]) -> Optional[str]:
+        if not specifier.startswith("."):
+            return None
+
+        base = normalize_path(os.path.join(os.path.dirname(importer), specifier))
+        candidates = [base]
+        candidates += [base + ext for ext in RESOLVE_EXTENSIONS]
+        candidates += [f"{base}/index{ext}" for ext in RESOLVE_EXTENSIONS]
+        return next((candidate for candidate in candidates if candidate in nodes), None)
+
+
+# Singleton instance - wspólny dla wszystkich promptów w procesie
+_index_instance = None
+_index_lock = threading.Lock()
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """Zwraca singleton indeksu knowledge.json"""
+    global _index_instance
+    with _index_lock:
+        if _index_instance is None:
+            _index_instance = KnowledgeIndex()
+    return _index_instance
@@ -0,0 +1,131 @@
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from agent.config import get_config
+from agent.codegen.telemetry import estimate_tokens
+from llm.models import MODEL_CONTEXT_BUDGET
+from logger import get_log_hub
+
+DEFAULT_CONTEXT_BUDGET = 8000
+IDENTIFIER_PATTERN = re.compile(r"[^\W\d_][^\W_]*")
+CAMEL_CASE_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z0-9]+")
+SIGNATURE_PATTERN = re.compile(
+    r"^\s*(export\s+|async\s+def\s|def\s|class\s|function\s|interface\s|type\s|enum\s|const\s+\w+\s*=\s*\(?[\w\s,{}:]*\)?\s*=>)"
+)
+STOP_WORDS = {"the", "and", "for", "with", "oraz", "dla", "jest", "nie", "się", "który", "która", "które"}
+
+
+@dataclass
+class Fragment:
+    """
+    Kandydat do kontekstu. `variants` to tańsze reprezentacje (np. sygnatury, podsumowanie)
+    w kolejności od najbogatszej - packer bierze pierwszą, która mieści się w budżecie.
+    """
+    title: str
+    content: str
+    path: Optional[str] = None
+    distance: int = 1  # odległość w grafie importów od bieżącego pliku (0 = sam plik)
+    weight: float = 1.0  # waga z synthetisera (index.* ~0.2)
+    variants: list[str] = field(default_factory=list)
+    score: float = 0.0
+
+    def render(self, body: str) -> str:
+        return f"### {self.title}\n{body}"
+
+
+def context_budget(model: Optional[str] = None) -> int:
+    """Budżet tokenów kontekstu: `context_token_budget` z configu albo wartość per model."""
+    configured = get_config().get("context_token_budget")
+    if configured:
+        return int(configured)
+    return MODEL_CONTEXT_BUDGET.get(model, DEFAULT_CONTEXT_BUDGET)
+
+
+def tokenize(text: str) -> set[str]:
+    """Identyfikatory rozbite na słowa (camelCase, snake_case), małe litery, bez krótkich."""
+    return set(iter_words(text))
+
+
+def iter_words(text: str):
+    """Jak tokenize, ale z powtórzeniami (do liczenia częstości)."""
+    for identifier in IDENTIFIER_PATTERN.findall(text):
+        parts = CAMEL_CASE_PATTERN.findall(identifier)
+        for part in [identifier] + (parts if len(parts) > 1 else []):
+            part = part.lower()
+            if len(part) > 2 and part not in STOP_WORDS:
+                yield part
+
+
+def score_fragment(fragment: Fragment, task_words: set[str], now: Optional[float] = None) -> float:
+    """
+    Istotność fragmentu: bliskość w grafie × waga synthetisera × świeżość pliku
+    × (1 + pokrycie słów zadania). Bliskość maleje o `context_hop_decay` na każdy krok.
+    """
+    proximity = get_config().get("context_hop_decay", 0.5) ** fragment.distance
+
+    recency = 0.5
+    if fragment.path and os.path.exists(fragment.path):
+        age_hours = max(0.0, ((now or time.time()) - os.path.getmtime(fragment.path)) / 3600)
+        recency = 0.5 + 0.5 / (1 + age_hours)
+
+    overlap = 0.0
+    if task_words:
+        overlap = len(task_words & tokenize(f"{fragment.path or ''} {fragment.content}")) / len(task_words)
+
+    return proximity * fragment.weight * recency * (1 + overlap)
+
+
+def extract_signatures(code: str, max_line: int = 160) -> str:
+    """Same deklaracje (export/def/class/function/interface/type) - tania reprezentacja pliku."""
+    lines = []
+    for line in code.splitlines():
+        if SIGNATURE_PATTERN.match(line):
+            signature = line.rstrip().rstrip("{").rstrip()
+            lines.append(signature[:max_line])
+    return "\n".join(lines)
+
+
+def pack_fragments(fragments: list[Fragment], budget: int, task_text: str = "") -> tuple[list[str], dict]:
+    """
+    Zachłannie wypełnia budżet tokenów fragmentami od najwyżej ocenionych.
+    Fragment, który się nie mieści, jest degradowany do tańszego wariantu zamiast obcinania;
+    jeśli nie mieści się żaden wariant - pomijany. Kolejność wyniku = kolejność wejścia.
+    Zwraca: (wyrenderowane fragmenty, raport)
+    """
+    task_words = tokenize(task_text)
+    now = time.time()
+    for fragment in fragments:
+        fragment.score = score_fragment(fragment, task_words, now)
+
+    chosen: dict[int, str] = {}
+    report = {"budget": budget, "used": 0, "full": 0, "degraded": [], "dropped": []}
+    for position, fragment in sorted(enumerate(fragments), key=lambda item: -item[1].score):
+        for level, body in enumerate([fragment.content, *fragment.variants]):
+            rendered = fragment.render(body)
+            cost = estimate_tokens(rendered)
+            if body and report["used"] + cost <= budget:
+                chosen[position] = rendered
+                report["used"] += cost
+                if level == 0:
+                    report["full"] += 1
+                else:
+                    report["degraded"].append(fragment.title)
+                break
+        else:
+            report["dropped"].append(fragment.title)
+
+    return [chosen[position] for position in sorted(chosen)], report
+
+
+def log_pack_report(report: dict) -> None:
+    details = f"{report['used']}/{report['budget']} tokenów, pełne: {report['full']}"
+    if report["degraded"]:
+        details += f", zdegradowane: {len(report['degraded'])}"
+    if report["dropped"]:
+        details += f", pominięte: {', '.join(report['dropped'])}"
+    if report.get("signature_blocks"):
+        details += f", sygnatury zamiast analiz: {report['signature_blocks']} (~{report['saved_tokens']} tokenów mniej)"
+    get_log_hub().debug("AGENT", f"📐 Kontekst: {details}")
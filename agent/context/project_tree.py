@@ -0,0 +1,251 @@
+import os
+import time
+import atexit
+import threading
+from collections import Counter
+from typing import Optional
+
+from agent.config import get_config
+from constants.constants import IGNORED_DIRS
+from logger import get_log_hub
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # bez watchdog drzewo jest odświeżane skanem co RESCAN_INTERVAL
+    Observer = None
+    FileSystemEventHandler = object
+
+# Rozszerzenia istotne dla kontekstu LLM (listing "relevant")
+RELEVANT_EXTENSIONS = {".tsx", ".ts", ".jsx", ".js", ".json", ".html", ".css", ".md"}
+RESCAN_INTERVAL = 2.0
+
+
+class ProjectTree:
+    """
+    Jeden model drzewa plików projektu (output/app) dla wszystkich promptów.
+    - pełny skan tylko raz, potem aktualizacje ze zdarzeń watchdog (utworzenie/usunięcie/przeniesienie);
+      obserwowane są pojedyncze katalogi poza IGNORED_DIRS, więc node_modules nie zużywa watchy
+    - listingi są renderowane raz na wersję drzewa i zwracane z cache
+    - katalogi z więcej niż `max_files_per_dir` plikami zwijane są do jednej linii z podsumowaniem
+    Reguły ignorowania: IGNORED_DIRS (jak analyser); listing "relevant" dodatkowo pomija
+    ukryte pliki/katalogi i rozszerzenia spoza RELEVANT_EXTENSIONS.
+    """
+
+    def __init__(self, root: str = "output/app", max_files_per_dir: int = 40, watch: bool = True):
+        self.root = os.path.abspath(root)
+        self.prefix = os.path.relpath(self.root).replace("\\", "/")
+        self.max_files_per_dir = max_files_per_dir
+        self.watch = watch and Observer is not None
+        self.directories: dict[str, set[str]] = {}  # katalog względny ("" = root, separator "/") -> nazwy plików
+        self.version = 0
+        self.rendered: dict[bool, tuple[int, str]] = {}
+        self.scanned_at: Optional[float] = None
+        self.observer = None
+        self.handler = None
+        self.watches: dict[str, object] = {}
+        self.lock = threading.RLock()
+        self.log_hub = get_log_hub()
+
+    def listing(self, relevant_only: bool = False) -> str:
+        """Lista plików ("output/app/src/App.tsx" w liniach), z cache dopóki drzewo się nie zmieni."""
+        self._ensure_current()
+        with self.lock:
+            cached = self.rendered.get(relevant_only)
+            if cached and cached[0] == self.version:
+                return cached[1]
+            text = self._render(relevant_only)
+            self.rendered[relevant_only] = (self.version, text)
+            return text
+
+    def files(self) -> list[str]:
+        """Wszystkie pliki (ścieżki względne do root, separator "/")."""
+        self._ensure_current()
+        with self.lock:
+            return sorted(_join(directory, name) for directory, names in self.directories.items() for name in names)
+
+    def stop(self) -> None:
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join(timeout=2)
+            self.observer = None
+
+    def _ensure_current(self) -> None:
+        if self.observer is not None and self.observer.is_alive():
+            return
+        # Bez watchera (brak watchdog / root jeszcze nie istniał) - okresowy pełny skan
+        if self.scanned_at is None or time.monotonic() - self.scanned_at >= RESCAN_INTERVAL:
+            # Skan po starcie watchera - żadna zmiana nie wpadnie między skan a pierwsze zdarzenie
+            if self.watch and os.path.isdir(self.root):
+                self._start_observer()
+            self._scan()
+
+    def _scan(self) -> None:
+        directories = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            if filenames:
+                directories[self._relative(dirpath)] = set(filenames)
+
+        with self.lock:
+            self.scanned_at = time.monotonic()
+            if directories != self.directories:
+                self.directories = directories
+                self.version += 1
+
+    def _start_observer(self) -> None:
+        try:
+            self.observer = Observer()
+            self.observer.daemon = True
+            self.handler = _TreeEventHandler(self)
+            self.watches = {}
+            self.watch_directory(self.root)
+            self.observer.start()
+        except Exception as e:
+            self.log_hub.warn("AGENT", f"⚠️ Watcher drzewa projektu niedostępny ({e}) - skan co {RESCAN_INTERVAL}s")
+            self.observer = None
+            self.watch = False
+
+    def watch_directory(self, path: str) -> None:
+        """Obserwuje katalog i jego podkatalogi (bez IGNORED_DIRS) - każdy osobno, nierekurencyjnie."""
+        if self.observer is None or self._ignored(self._relative(path)):
+            return
+        for dirpath, dirnames, _ in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            key = os.path.normcase(os.path.abspath(dirpath))
+            with self.lock:
+                if key not in self.watches:
+                    self.watches[key] = self.observer.schedule(self.handler, dirpath, recursive=False)
+
+    def unwatch_directory(self, path: str) -> None:
+        prefix = os.path.normcase(os.path.abspath(path))
+        with self.lock:
+            stale = [key for key in self.watches if key == prefix or key.startswith(prefix + os.sep)]
+            for key in stale:
+                try:
+                    self.observer.unschedule(self.watches.pop(key))
+                except Exception:
+                    pass  # katalog już zniknął - emitter zakończył się sam
+
+    # --- aktualizacje ze zdarzeń ---
+
+    def add_file(self, path: str) -> None:
+        relative = self._relative(path)
+        if self._ignored(relative):
+            return
+        directory, name = _split(relative)
+        with self.lock:
+            names = self.directories.setdefault(directory, set())
+            if name not in names:
+                names.add(name)
+                self.version += 1
+
+    def remove_file(self, path: str) -> None:
+        directory, name = _split(self._relative(path))
+        with self.lock:
+            names = self.directories.get(directory)
+            if names and name in names:
+                names.discard(name)
+                if not names:
+                    del self.directories[directory]
+                self.version += 1
+
+    def add_directory(self, path: str) -> None:
+        if self._ignored(self._relative(path)):
+            return
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            for name in filenames:
+                self.add_file(os.path.join(dirpath, name))
+
+    def remove_directory(self, path: str) -> None:
+        relative = self._relative(path)
+        with self.lock:
+            stale = [d for d in self.directories if d == relative or d.startswith(relative + "/")]
+            for directory in stale:
+                del self.directories[directory]
+            if stale:
+                self.version += 1
+
+    # --- renderowanie ---
+
+    def _render(self, relevant_only: bool) -> str:
+        lines = []
+        for directory in sorted(self.directories):
+            if relevant_only and any(part.startswith(".") for part in directory.split("/") if part):
+                continue
+            names = sorted(
+                name for name in self.directories[directory]
+                if not relevant_only or (not name.startswith(".") and os.path.splitext(name)[1] in RELEVANT_EXTENSIONS)
+            )
+            base = f"{self.prefix}/{directory}" if directory else self.prefix
+            if len(names) > self.max_files_per_dir:
+                extensions = Counter(os.path.splitext(name)[1] or "(brak)" for name in names)
+                summary = ", ".join(f"{count} × {ext}" for ext, count in extensions.most_common(5))
+                lines.append(f"{base}/ ({len(names)} plików: {summary})")
+            else:
+                lines.extend(f"{base}/{name}" for name in names)
+        return "\n".join(lines)
+
+    def _relative(self, path: str) -> str:
+        relative = os.path.relpath(os.path.abspath(path), self.root).replace("\\", "/")
+        return "" if relative == "." else relative
+
+    @staticmethod
+    def _ignored(relative: str) -> bool:
+        return relative.startswith("..") or any(part in IGNORED_DIRS for part in relative.split("/"))
+
+
+class _TreeEventHandler(FileSystemEventHandler):
+    def __init__(self, tree: ProjectTree):
+        super().__init__()
+        self.tree = tree
+
+    def on_created(self, event):
+        self.added(event.src_path)
+
+    def on_deleted(self, event):
+        # Usunięcie katalogu bywa zgłaszane jako zdarzenie pliku - czyścimy w obu wariantach
+        self.tree.remove_file(event.src_path)
+        self.tree.remove_directory(event.src_path)
+        self.tree.unwatch_directory(event.src_path)
+
+    def on_moved(self, event):
+        self.on_deleted(event)
+        self.added(event.dest_path)
+
+    def added(self, path: str) -> None:
+        if os.path.isdir(path):
+            # Najpierw watch, potem skan - pliki tworzone w międzyczasie nie umkną
+            self.tree.watch_directory(path)
+            self.tree.add_directory(path)
+        elif os.path.exists(path):
+            self.tree.add_file(path)
+
+
+def _split(relative: str) -> tuple[str, str]:
+    directory, _, name = relative.rpartition("/")
+    return directory, name
+
+
+def _join(directory: str, name: str) -> str:
+    return f"{directory}/{name}" if directory else name
+
+
+# Instancje per katalog - współdzielone przez builder kontekstu i FileSystem
+_trees: dict[str, ProjectTree] = {}
+_trees_lock = threading.Lock()
+
+def get_project_tree_model(root: str = "output/app") -> ProjectTree:
+    """Zwraca współdzielony model drzewa dla katalogu"""
+    key = os.path.normcase(os.path.abspath(root))
+    with _trees_lock:
+        if key not in _trees:
+            _trees[key] = ProjectTree(root, max_files_per_dir=get_config().get("project_tree_max_files_per_dir", 40))
+        return _trees[key]
+
+
+@atexit.register
+def _stop_watchers() -> None:
+    for tree in list(_trees.values()):
+        tree.stop()
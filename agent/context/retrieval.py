@@ -0,0 +1,169 @@
+import os
+import json
+import math
+import time
+import heapq
+import threading
+from collections import Counter
+
+from agent.config import get_config
+from agent.context.packer import iter_words
+from logger import get_log_hub
+
+META_DIR = "output/.meta"
+ANALYSIS_SUFFIX = ".analysis.md"
+EXPORT_BOOST = 3  # nazwy eksportów liczą się jak kilka wystąpień w podsumowaniu
+
+
+class LexicalIndex:
+    """
+    Indeks BM25 (odwrócony) po podsumowaniach output/.meta/**/*.analysis.md + nazwach eksportów.
+    Aktualizowany przyrostowo: refresh() porównuje (mtime_ns, rozmiar) plików analizy
+    i przelicza tylko zmienione/nowe/usunięte dokumenty. Zapytanie dotyka wyłącznie
+    list postingów słów z zapytania.
+    """
+
+    def __init__(self, meta_dir: str = META_DIR, output_dir: str = "output",
+                 refresh_interval: float = 2.0, k1: float = 1.2, b: float = 0.75):
+        self.meta_dir = meta_dir
+        self.output_dir = output_dir
+        self.refresh_interval = refresh_interval
+        self.k1 = k1
+        self.b = b
+        self.documents: dict[str, tuple[tuple[int, int], Counter, int]] = {}  # ścieżka źródła -> (sygnatura, tf, długość)
+        self.postings: dict[str, dict[str, int]] = {}
+        self.total_length = 0
+        self.last_refresh = 0.0
+        self.lock = threading.Lock()
+        self.log_hub = get_log_hub()
+
+    def refresh(self, force: bool = False) -> int:
+        """Dociąga zmiany z dysku (nie częściej niż co refresh_interval). Zwraca liczbę zmienionych dokumentów."""
+        now = time.monotonic()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return 0
+
+        with self.lock:
+            self.last_refresh = now
+            seen = scan_analyses(self.meta_dir, self.output_dir)
+
+            changed = 0
+            for path in [path for path in self.documents if path not in seen]:
+                self._remove(path)
+                changed += 1
+            for path, (md_path, signature) in seen.items():
+                document = self.documents.get(path)
+                if document is None or document[0] != signature:
+                    self._add(path, md_path, signature)
+                    changed += 1
+
+        if changed:
+            self.log_hub.debug("AGENT", f"🔍 Indeks BM25: {changed} zmienionych analiz, {len(self.documents)} dokumentów")
+        return changed
+
+    def search(self, query: str, k: int = 8) -> list[tuple[str, float]]:
+        """Top-k plików źródłowych dla zapytania: [(ścieżka, wynik BM25)]."""
+        self.refresh()
+        terms = set(iter_words(query))
+
+        with self.lock:
+            count = len(self.documents)
+            if not count or not terms:
+                return []
+            average_length = self.total_length / count
+
+            scores: dict[str, float] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for path, frequency in postings.items():
+                    length = self.documents[path][2]
+                    norm = frequency + self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[path] = scores.get(path, 0.0) + idf * frequency * (self.k1 + 1) / norm
+
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _add(self, path: str, md_path: str, signature: tuple[int, int]) -> None:
+        self._remove(path)
+        try:
+            with open(md_path, encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return
+
+        frequencies = Counter(iter_words(text))
+        for export in read_exports(md_path):
+            for word in iter_words(export):
+                frequencies[word] += EXPORT_BOOST
+
+        length = sum(frequencies.values())
+        self.documents[path] = (signature, frequencies, length)
+        self.total_length += length
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[path] = frequency
+
+    def _remove(self, path: str) -> None:
+        document = self.documents.pop(path, None)
+        if document is None:
+            return
+        self.total_length -= document[2]
+        for term in document[1]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(path, None)
+                if not postings:
+                    del self.postings[term]
+
+
+def scan_analyses(meta_dir: str = META_DIR, output_dir: str = "output") -> dict[str, tuple[str, tuple[int, int]]]:
+    """Pliki analizy w .meta: {ścieżka źródła: (ścieżka .analysis.md, (mtime_ns, rozmiar))}."""
+    found = {}
+    for root, _, files in os.walk(meta_dir):
+        for name in files:
+            if name.endswith(ANALYSIS_SUFFIX):
+                md_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(md_path)
+                except OSError:
+                    continue
+                # output/.meta/app/src/App.tsx.analysis.md -> output/app/src/App.tsx
+                rel_path = os.path.relpath(md_path, meta_dir)[:-len(ANALYSIS_SUFFIX)]
+                found[os.path.join(output_dir, rel_path).replace("\\", "/")] = (md_path, (stat.st_mtime_ns, stat.st_size))
+    return found
+
+
+def read_exports(md_path: str) -> list[str]:
+    """Nazwy eksportów z .analysis.json obok pliku .analysis.md."""
+    json_path = md_path[:-len(ANALYSIS_SUFFIX)] + ".analysis.json"
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            return [str(export) for export in json.load(f).get("exports", [])]
+    except (OSError, ValueError, AttributeError):
+        return []
+
+
+def fuse_rankings(rankings: list[list[str]], k: int, constant: int = 60) -> list[str]:
+    """Reciprocal Rank Fusion: łączy rankingi (np. BM25 + wektorowy) bez kalibracji ich wyników."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, path in enumerate(ranking):
+            scores[path] = scores.get(path, 0.0) + 1.0 / (constant + rank + 1)
+    return sorted(scores, key=lambda path: -scores[path])[:k]
+
+
+# Singleton instance
+_index_instance = None
+_index_lock = threading.Lock()
+
+def get_lexical_index() -> LexicalIndex:
+    """Zwraca singleton indeksu BM25 analiz"""
+    global _index_instance
+    with _index_lock:
+        if _index_instance is None:
+            _index_instance = LexicalIndex(refresh_interval=get_config().get("retrieval_refresh_interval", 2.0))
+    return _index_instance
@@ -0,0 +1,272 @@
+import os
+import json
+import math
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+
+import requests
+
+from agent.config import get_config
+from agent.context.packer import iter_words
+from agent.context.retrieval import META_DIR, scan_analyses, read_exports
+from logger import get_log_hub
+
+try:
+    import numpy as np
+except ImportError:  # bez numpy wyszukiwanie semantyczne jest wyłączone (zostaje BM25)
+    np = None
+
+STORE_DIR = "output/.synth"
+EMBED_BATCH_SIZE = 32
+
+
+class HashEmbedder:
+    """
+    Deterministyczny zamiennik modelu embeddingów (testy, praca offline):
+    hashowanie słów i trigramów znakowych do wektora o stałym wymiarze.
+    Nie rozumie synonimów - to tylko stand-in o tym samym interfejsie.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hash-{dim}"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dim
+        for word in iter_words(text):
+            padded = f"#{word}#"
+            for feature in [word] + [padded[i:i + 3] for i in range(len(padded) - 2)]:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vector[digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+class OllamaEmbedder:
+    """
+    Embeddingi z lokalnego endpointu Ollama (/api/embed). Przed pierwszym żądaniem
+    endpoint jest sprawdzany raz z krótkim timeoutem - bez działającej Ollamy indeks
+    wyłącza się od razu zamiast czekać na timeout embeddingu przy każdym budowaniu kontekstu.
+    """
+
+    def __init__(self, model: str = "nomic-embed-text", base_url: str = "http://localhost:11434",
+                 probe_timeout: float = 2.0):
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.name = f"ollama:{model}"
+        self.probe_timeout = probe_timeout
+        self.probed = False
+
+    def probe(self) -> None:
+        """Jednorazowe sprawdzenie, czy Ollama odpowiada; rzuca RuntimeError, jeśli nie."""
+        if self.probed:
+            return
+        self.probed = True
+        try:
+            requests.get(f"{self.base_url}/api/version", timeout=self.probe_timeout).raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Ollama niedostępna pod {self.base_url}: {e}")
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.probe()
+        try:
+            response = requests.post(f"{self.base_url}/api/embed", json={"model": self.model, "input": texts}, timeout=120)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"Nie można połączyć z Ollama ({self.model}): {e}")
+        if response.status_code != 200:
+            raise RuntimeError(f"Ollama embed error {response.status_code}: {response.text[:200]}")
+
+        embeddings = response.json().get("embeddings")
+        if not embeddings or len(embeddings) != len(texts):
+            raise RuntimeError("Brak embeddingów w odpowiedzi Ollama (nieprawidłowy format).")
+        return embeddings
+
+
+def get_embedder():
+    """Embedder wg configu: `embedding_provider` = "ollama" | "hash"."""
+    config = get_config()
+    if config.get("embedding_provider", "ollama") == "hash":
+        return HashEmbedder()
+    return OllamaEmbedder(config.get("embedding_model", "nomic-embed-text"),
+                          probe_timeout=config.get("embedding_probe_timeout", 2.0))
+
+
+class VectorIndex:
+    """
+    Indeks wektorowy analiz (output/.meta/**/*.analysis.md + eksporty) do wyszukiwania semantycznego.
+    Macierz znormalizowanych embeddingów trzymana jest w output/.synth/embeddings.npy
+    (+ embeddings.json ze ścieżkami i sygnaturami plików). refresh() embeduje tylko
+    nowe/zmienione analizy; wyszukiwanie to jedno mnożenie macierz × wektor i argpartition.
+    """
+
+    def __init__(self, embedder=None, store_dir: str = STORE_DIR, meta_dir: str = META_DIR,
+                 output_dir: str = "output", refresh_interval: float = 2.0):
+        self.embedder = embedder or get_embedder()
+        self.store_dir = store_dir
+        self.meta_dir = meta_dir
+        self.output_dir = output_dir
+        self.refresh_interval = refresh_interval
+        self.matrix_path = os.path.join(store_dir, "embeddings.npy")
+        self.meta_path = os.path.join(store_dir, "embeddings.json")
+        self.paths: list[str] = []
+        self.signatures: dict[str, tuple[int, int]] = {}
+        self.matrix = None
+        self.loaded = False
+        self.disabled: Optional[str] = None if np is not None else "brak numpy"
+        self.last_refresh = 0.0
+        self.lock = threading.Lock()
+        self.log_hub = get_log_hub()
+
+    def refresh(self, force: bool = False) -> int:
+        """Embeduje nowe/zmienione analizy i usuwa nieaktualne. Zwraca liczbę zmian."""
+        now = time.monotonic()
+        if self.disabled or (not force and now - self.last_refresh < self.refresh_interval):
+            return 0
+
+        with self.lock:
+            self.last_refresh = now
+            if not self.loaded:
+                self._load()
+
+            found = scan_analyses(self.meta_dir, self.output_dir)
+            removed = [path for path in self.paths if path not in found]
+            changed = [path for path, (_, signature) in found.items() if self.signatures.get(path) != tuple(signature)]
+            if not removed and not changed:
+                return 0
+
+            try:
+                vectors = self._embed([self._document_text(found[path][0]) for path in changed]) if changed else None
+            except RuntimeError as e:
+                self.disabled = str(e)
+                self.log_hub.warn("AGENT", f"⚠️ Indeks wektorowy wyłączony: {e}")
+                return 0
+
+            self._apply(removed, changed, vectors, {path: found[path][1] for path in changed})
+            self._save()
+
+        self.log_hub.debug("AGENT", f"🧭 Indeks wektorowy: {len(changed)} zaktualizowanych, {len(removed)} usuniętych, {len(self.paths)} dokumentów")
+        return len(removed) + len(changed)
+
+    def search(self, query: str, k: int = 8, exclude: tuple = ()) -> list[tuple[str, float]]:
+        """Top-k plików po podobieństwie kosinusowym do zapytania: [(ścieżka, podobieństwo)]."""
+        self.refresh()
+        if self.disabled or self.matrix is None or not self.paths or not query.strip():
+            return []
+
+        try:
+            query_vector = self._embed([query])[0]
+        except RuntimeError as e:
+            self.log_hub.warn("AGENT", f"⚠️ Wyszukiwanie semantyczne nieudane: {e}")
+            return []
+
+        with self.lock:
+            if query_vector.shape[0] != self.matrix.shape[1]:
+                return []
+            scores = self.matrix @ query_vector
+            excluded = [i for i, path in enumerate(self.paths) if path in exclude]
+            scores[excluded] = -np.inf
+            count = min(k, len(self.paths) - len(excluded))
+            if count <= 0:
+                return []
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            return [(self.paths[i], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _embed(self, texts: list[str]):
+        vectors = []
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            vectors.extend(self.embedder.embed(texts[start:start + EMBED_BATCH_SIZE]))
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def _apply(self, removed: list[str], changed: list[str], vectors, signatures: dict) -> None:
+        if self.matrix is not None and vectors is not None and self.matrix.shape[1] != vectors.shape[1]:
+            # Inny wymiar (zmiana modelu) - stare wektory są bezużyteczne
+            self.paths, self.signatures, self.matrix = [], {}, None
+            removed = []
+
+        positions = {path: i for i, path in enumerate(self.paths)}
+        removed_set = set(removed)
+        keep = [i for i, path in enumerate(self.paths) if path not in removed_set]
+        if self.matrix is not None:
+            for path, vector in zip(changed, vectors):
+                if path in positions:
+                    self.matrix[positions[path]] = vector
+            self.matrix = self.matrix[keep]
+        self.paths = [self.paths[i] for i in keep]
+        for path in removed:
+            self.signatures.pop(path, None)
+
+        new_paths = [path for path in changed if path not in positions]
+        if new_paths:
+            order = {path: i for i, path in enumerate(changed)}
+            rows = vectors[[order[path] for path in new_paths]]
+            self.matrix = rows if self.matrix is None else np.vstack([self.matrix, rows])
+            self.paths.extend(new_paths)
+        self.signatures.update({path: tuple(signature) for path, signature in signatures.items()})
+
+    def _document_text(self, md_path: str) -> str:
+        try:
+            with open(md_path, encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            text = ""
+        exports = read_exports(md_path)
+        return f"{text}\nEksporty: {', '.join(exports)}" if exports else text
+
+    def _load(self) -> None:
+        self.loaded = True
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("embedder") != self.embedder.name:
+                return
+            matrix = np.load(self.matrix_path)
+        except (OSError, ValueError):
+            return
+        if matrix.ndim != 2 or not matrix.size or matrix.shape[0] != len(meta.get("paths", [])):
+            return
+        self.matrix = matrix.astype(np.float32)
+        self.paths = list(meta["paths"])
+        self.signatures = {path: tuple(signature) for path, signature in meta.get("signatures", {}).items()}
+
+    def _save(self) -> None:
+        os.makedirs(self.store_dir, exist_ok=True)
+        # Zapis atomowy: najpierw plik tymczasowy, potem os.replace
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, self.matrix if self.matrix is not None else np.zeros((0, 0), dtype=np.float32))
+        os.replace(tmp_path, self.matrix_path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "embedder": self.embedder.name,
+                "dim": int(self.matrix.shape[1]) if self.matrix is not None else 0,
+                "paths": self.paths,
+                "signatures": {path: list(signature) for path, signature in self.signatures.items()}
+            }, f)
+        os.replace(tmp_path, self.meta_path)
+
+
+# Singleton instance
+_index_instance = None
+_index_lock = threading.Lock()
+
+def get_vector_index() -> VectorIndex:
+    """Zwraca singleton indeksu wektorowego analiz"""
+    global _index_instance
+    with _index_lock:
+        if _index_instance is None:
+            _index_instance = VectorIndex(refresh_interval=get_config().get("retrieval_refresh_interval", 2.0))
+    return _index_instance
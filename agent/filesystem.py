@@ -2,6 +2,7 @@ import os
 import shutil
 from logger import get_log_hub
 from constants.constants import IGNORED_DIRS
+from agent.context.project_tree import get_project_tree_model
 
 class FileSystem:
     def __init__(self, base_path: str = "output"):
@@ -99,22 +100,9 @@ class FileSystem:
             if not os.path.exists(app_path):
                 return "(Projekt nie istnieje)"
                 
-            # Skanuj tylko output/app
-            temp_fs = FileSystem(app_path)
-            files = temp_fs.get_flat_file_list()
-            
-            # Konwertuj bezwzględne ścieżki na relatywne względem app_path
-            relative_files = []
-            for f in files:
-                if f.startswith(app_path):
-                    rel_path = os.path.relpath(f, app_path)
-                    relative_files.append(rel_path)
-            
-            # Dodaj prefix i filtruj
-            project_files = [f"output/app/{f.replace(os.sep, '/')}" for f in relative_files]
-            filtered = [f for f in project_files if not self.is_ignored_path(f)]
-            
-            return "\n".join(filtered) if filtered else "(Brak plików w projekcie)"
+            # Wspólny model drzewa (watcher + cache listingu) zamiast os.walk przy każdym promptcie
+            listing = get_project_tree_model(app_path).listing()
+            return listing if listing else "(Brak plików w projekcie)"
         except Exception as e:
             self.log_hub.error("FILESYSTEM", f"Błąd generowania listy plików projektu: {e}")
             raise
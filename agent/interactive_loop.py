@@ -1,12 +1,33 @@
 import os
+import re
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from agent.state import AgentState, Scenario
 from llm import LLMClient, Models
 from agent.input import AgentInput
-from agent.prompt.scenario_prompt_builder import build_scenario_prompt
-from agent.loop import agent_loop
+from agent.prompt.scenario_prompt_builder import (
+    ScenarioContext,
+    INFRASTRUCTURE_CONTEXT,
+    build_project_context,
+    warm_project_context,
+    get_dev_server_status,
+    get_previous_steps_text,
+    render_scenario_prompt,
+)
 from logger import get_log_hub
 
+# Wspólna pula dla przygotowania prompta - porzucone zadania (np. kontekst przy
+# zadaniu infrastrukturalnym) dokończą się w tle, nie blokując użytkownika
+_prep_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prompt-prep")
+# Rozgrzewanie indeksów w osobnym, jednowątkowym executorze: rozgrzewania nie nakładają się
+# na siebie, a zakończenie ostatniego oznacza, że żadne nie odświeża już indeksów
+_warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-warm")
+_last_warm_future = None
+
+# Polecenia, które na pewno są czystą infrastrukturą - dla nich nie startujemy kontekstu
+INFRASTRUCTURE_PATTERN = re.compile(r"^\s*(npm|npx|yarn|pnpm|git|mkdir|pip|poetry)\b", re.IGNORECASE)
+
 def should_enter_interactive_mode(agent_input: AgentInput | None, state_path: str) -> bool:
     log_hub = get_log_hub()
     
@@ -25,6 +46,7 @@ def should_enter_interactive_mode(agent_input: AgentInput | None, state_path: st
 
 def interactive_loop():
     from registry.process_manager import ProcessManager
+    from agent.loop import agent_loop
     log_hub = get_log_hub()
     manager = ProcessManager()
 
@@ -51,11 +73,9 @@ def interactive_loop():
                 log_hub.warn("AGENT", "⚠️ Pusty input – spróbuj jeszcze raz")
                 continue
 
-            fixed_input, intention = fix_and_classify_prompt(user_input)
+            prompt, fixed_input, intention = prepare_planner_prompt(user_input, constraints)
             log_hub.info("AGENT", f"🧪 Poprawiony prompt: {fixed_input} [{intention}]")
 
-            prompt = build_scenario_prompt(fixed_input, constraints, mode="interactive", intention=intention)
-
             try:
                 response = llm.chat(prompt).strip()
                 with open(log_path, "a", encoding="utf-8") as f:
@@ -88,6 +108,78 @@ def interactive_loop():
         log_hub.info("AGENT", "✅ Zakończono interaktywną sesję.")
 
 
+def _timed(fn, *args):
+    """Wywołuje funkcję i zwraca (wynik, czas w sekundach)"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def prepare_planner_prompt(user_input: str, constraints: list[str]) -> tuple[str, str, str]:
+    """
+    Przygotowuje prompt planera równolegle:
+    - fix_and_classify_prompt (LLM)
+    - rozgrzanie indeksów kontekstu (drzewo plików, knowledge graph, BM25/wektorowy)
+    - stan dev servera (sondowanie portów)
+    Sam kontekst budowany jest z poprawionego prompta (zapytanie do indeksów), na już
+    odświeżonych indeksach. Prompt jest składany dopiero gdy wszystko jest gotowe.
+    Zwraca: (prompt, poprawiony_input, intencja)
+    """
+    global _last_warm_future
+    log_hub = get_log_hub()
+    start = time.perf_counter()
+
+    # Szybka ścieżka - oczywista infrastruktura nie potrzebuje kontekstu projektu
+    skip_context = bool(INFRASTRUCTURE_PATTERN.match(user_input))
+
+    fix_future = _prep_executor.submit(_timed, fix_and_classify_prompt, user_input)
+    dev_future = _prep_executor.submit(_timed, get_dev_server_status)
+    previous_warm_future = _last_warm_future
+    warm_future = None if skip_context else _warm_executor.submit(_timed, warm_project_context)
+    _last_warm_future = warm_future or _last_warm_future
+
+    previous_steps_txt = get_previous_steps_text()
+
+    (fixed_input, intention), fix_time = fix_future.result()
+    dev_server_status, dev_time = dev_future.result()
+    sequential_time = fix_time + dev_time
+
+    if intention == "infrastructure":
+        # Nie czekamy na indeksy - kontekst i tak nie trafi do prompta. Rozgrzewanie, które już
+        # ruszyło, dokończy się w tle; następna budowa kontekstu poczeka na nie (_last_warm_future)
+        if warm_future and warm_future.cancel():
+            _last_warm_future = previous_warm_future
+        existing_context = INFRASTRUCTURE_CONTEXT
+    else:
+        # Bez rozgrzania (heurystyka się pomyliła) indeksy odświeżą się w build_project_context
+        if warm_future:
+            _, warm_time = warm_future.result()
+            sequential_time += warm_time
+        # Kontekst czyta indeksy w tym wątku - żadne rozgrzewanie (też porzucone wcześniej) nie może ich
+        # w tym czasie odświeżać
+        if _last_warm_future and not _last_warm_future.cancelled():
+            _last_warm_future.result()
+        existing_context, context_time = _timed(build_project_context, fixed_input)
+        sequential_time += context_time
+
+    context = ScenarioContext(
+        previous_steps_txt=previous_steps_txt,
+        existing_context=existing_context,
+        dev_server_status=dev_server_status,
+    )
+    prompt = render_scenario_prompt(fixed_input, constraints, "interactive", context)
+
+    elapsed = time.perf_counter() - start
+    log_hub.info(
+        "AGENT",
+        f"⏱️ Przygotowanie prompta: {elapsed:.2f}s "
+        f"(sekwencyjnie ~{sequential_time:.2f}s, zaoszczędzono {max(sequential_time - elapsed, 0.0):.2f}s)"
+        + (" [fast path: infrastruktura]" if existing_context == INFRASTRUCTURE_CONTEXT else "")
+    )
+
+    return prompt, fixed_input, intention
+
+
 def fix_and_classify_prompt(raw_input: str) -> tuple[str, str]:
     """Poprawia prompt i klasyfikuje intencję w jednym wywołaniu LLM"""
     log_hub = get_log_hub()
@@ -1,40 +1,258 @@
-from agent.state import AgentState, Scenario
+import os
+import copy
+from agent.state import AgentState, Scenario, StepResult
 from agent.commands.factory import get_command
+from agent.commands.generate_code_batch import GenerateCodeBatchCommand
+from agent.codegen.batch_strategy import group_batchable_steps
+from agent.config import get_config
+from agent.storage.snapshots import SnapshotStore
+from agent.validation.cache import get_validation_cache
+from agent.context.fragment_cache import get_fragment_cache
+from agent.codegen.telemetry import summarize, summarize_context
+from agent.validation.typecheck import TS_EXTENSIONS, find_tsconfig_dir, run_typecheck, map_diagnostics_to_steps
 from logger import get_log_hub
 
+# Kroki zmieniające pliki w output/app - przed nimi robimy snapshot
+SNAPSHOT_STEPS = {"generate_code", "patch_file", "write_file", "delete"}
+# Kroki generujące kod - po grupie takich kroków sprawdzamy typy całego projektu
+CODEGEN_STEPS = {"generate_code", "patch_file"}
+
 def agent_loop(state: AgentState, scenario: Scenario) -> AgentState:
     log_hub = get_log_hub()
     log_hub.info("AGENT", "Start pętli agenta...")
+    config = get_config()
+    batching = config.get("batch_generation", False)
+    snapshots = SnapshotStore(retention=config.get("snapshot_retention", 5)) if config.get("snapshots", True) else None
+    typecheck = config.get("typecheck", True)
+    produced = {}  # ścieżka pliku -> indeks kroku, który go wygenerował
+    typecheck_pending = False
 
     while state.current_step_index < len(scenario.steps):
         step = scenario.steps[state.current_step_index]
         step_type = step.get("type") or step.get("command") or "generate_code"
 
-        log_hub.info("AGENT", f"Krok {state.current_step_index + 1}: {step_type}")
+        # Kolejne kompatybilne generate_code idą jednym wywołaniem LLM
+        batch = group_batchable_steps(scenario.steps, state.current_step_index) if batching else []
+        if len(batch) > 1:
+            log_hub.info("AGENT", f"Kroki {state.current_step_index + 1}-{state.current_step_index + len(batch)}: {step_type} (batch)")
+        else:
+            batch = [step]
+            log_hub.info("AGENT", f"Krok {state.current_step_index + 1}: {step_type}")
+
+        snapshot = None
+        if snapshots and step_type in SNAPSHOT_STEPS:
+            snapshot = snapshots.take(label=f"step{state.current_step_index + 1}")
+            if snapshot:
+                log_hub.debug("AGENT", f"📸 Snapshot {snapshot.id}: {snapshot.files} plików w {snapshot.duration * 1000:.1f}ms")
 
         try:
-            command = get_command(step_type, step)
+            if len(batch) > 1:
+                command = GenerateCodeBatchCommand(batch)
+            else:
+                command = get_command(step_type, step)
             log_hub.debug("AGENT", f"Komenda: {command.__class__.__name__}")
-            log_hub.debug("AGENT", f"Params: {step}")
+            log_hub.debug("AGENT", f"Params: {command.params}")
 
             state = command.run(state)
 
-            last_result = state.history[-1]
-            report = last_result.output.get("validation_report")
+            failed_reports = [
+                result.output.get("validation_report")
+                for result in state.history[-len(batch):]
+                if result.output.get("validation_report")
+                and not result.output["validation_report"].get("ok", True)
+            ]
 
-            if report and not report.get("ok", True):
+            if failed_reports:
                 log_hub.error("AGENT", f"Walidacja nie powiodła się dla kroku {step_type}")
-                log_hub.error("AGENT", f"Szczegóły: {report.get('details', 'Brak szczegółów')}")
+                for report in failed_reports:
+                    log_hub.error("AGENT", f"Szczegóły: {report.get('details', 'Brak szczegółów')}")
+                rollback(snapshots, snapshot)
                 state.done = True
                 break
 
+            # Duże outputy do blobów, stare kroki do archiwum
+            state.compact()
+
+            if step_type in CODEGEN_STEPS:
+                for offset, generated_step in enumerate(batch):
+                    path = generated_step.get("params", {}).get("artifact", {}).get("path")
+                    if path:
+                        produced[normalize_path(path)] = state.current_step_index + offset
+                        typecheck_pending = typecheck_pending or path.endswith(TS_EXTENSIONS)
+
         except Exception as e:
             log_hub.error("AGENT", f"Błąd podczas wykonywania kroku {step_type}: {e}")
+            rollback(snapshots, snapshot)
             state.done = True
             break
 
-        state.current_step_index += 1
+        state.current_step_index += len(batch)
+
+        # 🔎 Koniec grupy kroków generujących kod - jedno sprawdzenie typów dla całego projektu
+        if typecheck and typecheck_pending and not is_codegen_step(scenario, state.current_step_index):
+            state = typecheck_and_repair(state, scenario, produced, snapshots)
+            typecheck_pending = False
 
     state.done = True
+    state.compact()
     log_hub.info("AGENT", f"Agent zakończył pracę. Wykonano {state.current_step_index}/{len(scenario.steps)} kroków")
-    return state
\ No newline at end of file
+
+    cache_stats = get_validation_cache().stats()
+    if cache_stats["hits"] or cache_stats["misses"]:
+        log_hub.info(
+            "AGENT",
+            f"♻️ Cache walidacji: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} trafień "
+            f"({cache_stats['hit_rate']:.0%}), wpisy: {cache_stats['entries']}/{cache_stats['max_entries']}"
+        )
+    fragment_stats = get_fragment_cache().stats()
+    if fragment_stats["hits"] or fragment_stats["misses"]:
+        log_hub.info(
+            "AGENT",
+            f"📚 Cache kontekstu: {fragment_stats['hits']}/{fragment_stats['hits'] + fragment_stats['misses']} trafień "
+            f"({fragment_stats['hit_rate']:.0%}), {fragment_stats['bytes'] // 1024}/{fragment_stats['max_bytes'] // 1024} KB, "
+            f"wyparte: {fragment_stats['evictions']}"
+        )
+    for mode, stats in summarize_context().items():
+        log_hub.info(
+            "AGENT",
+            f"🧩 Kontekst sąsiadów '{mode}': walidacja {stats['success_rate']:.0%} z {stats['generations']} generacji, "
+            f"średnio {stats['avg_context_tokens']:.0f} tokenów kontekstu, redukcja {stats['size_reduction']:.0%}"
+        )
+    # 📊 Porównanie strategii generowania (np. "repair" vs "retry") - podejścia do sukcesu
+    for strategy, stats in summarize().items():
+        attempts = stats["avg_attempts_to_success"]
+        message = (
+            f"📊 Strategia '{strategy}': skuteczność {stats['success_rate']:.0%} z {stats['generations']} generacji, "
+            f"średnio {attempts if attempts is not None else '-'} podejść do sukcesu, {stats['avg_duration']:.1f}s"
+        )
+        # Patch'owanie ("patch:search_replace" vs "patch:diff"): rozmiar odpowiedzi i skuteczność nakładania
+        if "avg_output_tokens" in stats:
+            message += (
+                f", {stats['avg_output_tokens']:.0f} tokenów odpowiedzi, "
+                f"nałożenie zmian {stats['apply_success_rate']:.0%}"
+            )
+        log_hub.info("AGENT", message)
+    return state
+
+
+def rollback(snapshots: SnapshotStore, snapshot) -> None:
+    """Cofa zmiany nieudanego kroku do snapshotu sprzed kroku."""
+    if not snapshot or not get_config().get("snapshot_rollback_on_failure", True):
+        return
+    try:
+        stats = snapshots.restore(snapshot)
+        get_log_hub().warn(
+            "AGENT",
+            f"⏪ Przywrócono snapshot {stats['snapshot']}: {stats['restored']} plików przywróconych, "
+            f"{stats['removed']} usuniętych w {stats['duration'] * 1000:.1f}ms"
+        )
+    except Exception as e:
+        get_log_hub().error("AGENT", f"Błąd przywracania snapshotu {snapshot.id}: {e}")
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def is_codegen_step(scenario: Scenario, index: int) -> bool:
+    if index >= len(scenario.steps):
+        return False
+    step = scenario.steps[index]
+    return (step.get("type") or step.get("command") or "generate_code") in CODEGEN_STEPS
+
+
+def typecheck_and_repair(state: AgentState, scenario: Scenario, produced: dict[str, int],
+                         snapshots: SnapshotStore = None) -> AgentState:
+    """
+    tsc dla projektów, do których trafiły wygenerowane pliki .ts/.tsx.
+    Błędy są mapowane na kroki, które wyprodukowały dane pliki (albo pliki importowane
+    przez plik z błędem), i tylko te kroki są generowane ponownie (z błędami tsc w prompcie).
+    Każda regeneracja ma własny snapshot - nieudana walidacja go przywraca. Potem jeszcze
+    jedno sprawdzenie.
+    """
+    log_hub = get_log_hub()
+    config = get_config()
+    max_repairs = config.get("typecheck_max_repairs", 1)
+    projects = sorted({
+        project for path in produced
+        if path.endswith(TS_EXTENSIONS) and (project := find_tsconfig_dir(path))
+    })
+    if not projects:
+        return state
+
+    for repair_round in range(max_repairs + 1):
+        diagnostics = []
+        for project in projects:
+            result = run_typecheck(project, timeout=config.get("typecheck_timeout", 300))
+            if result.skipped:
+                log_hub.warn("AGENT", f"⏭️ Pominięto sprawdzanie typów w {project}: {result.skipped}")
+                continue
+            log_hub.info("AGENT", f"🔎 tsc {os.path.relpath(project)}: {len(result.diagnostics)} błędów w {result.duration}s")
+            diagnostics.extend(result.diagnostics)
+
+        by_step = map_diagnostics_to_steps(diagnostics, produced)
+        attributed = {id(d) for step_diagnostics in by_step.values() for d in step_diagnostics}
+        unattributed = [d for d in diagnostics if id(d) not in attributed]
+        if unattributed:
+            log_hub.warn("AGENT", f"⚠️ Błędy typów bez kroku, który mógłby je naprawić: {len(unattributed)}")
+            for diagnostic in unattributed[:5]:
+                log_hub.warn("AGENT", f"   {diagnostic}")
+
+        state.history.append(StepResult(
+            step_name="typecheck",
+            input={"projects": [os.path.relpath(p) for p in projects], "round": repair_round},
+            output={
+                "ok": not diagnostics,
+                "diagnostics": [str(d) for d in diagnostics[:50]],
+                "unattributed": [str(d) for d in unattributed[:50]],
+                "steps": sorted(index + 1 for index in by_step)
+            }
+        ))
+
+        if not by_step or repair_round == max_repairs:
+            if diagnostics:
+                log_hub.warn("AGENT", f"⚠️ Pozostały błędy typów: {len(diagnostics)}")
+            return state
+
+        for step_index, step_diagnostics in sorted(by_step.items()):
+            state = regenerate_step(state, scenario, step_index, step_diagnostics, snapshots)
+
+    return state
+
+
+def regenerate_step(state: AgentState, scenario: Scenario, step_index: int, diagnostics: list,
+                    snapshots: SnapshotStore = None) -> AgentState:
+    """Generuje krok ponownie z błędami tsc w prompcie; nieudana walidacja cofa zmiany do snapshotu."""
+    log_hub = get_log_hub()
+    step = copy.deepcopy(scenario.steps[step_index])
+    step_type = step.get("type") or step.get("command") or "generate_code"
+    path = step["params"]["artifact"]["path"]
+
+    own = [str(d) for d in diagnostics if os.path.normcase(d.path) == normalize_path(path)]
+    dependents = [str(d) for d in diagnostics if os.path.normcase(d.path) != normalize_path(path)]
+    if own:
+        step["params"]["prompt"] += "\n\nBłędy typów (tsc) w tym pliku - popraw je:\n" + "\n".join(own)
+    if dependents:
+        step["params"]["prompt"] += (
+            "\n\nBłędy typów (tsc) w plikach, które importują ten plik - "
+            "dostosuj API tak, żeby ich użycie było poprawne:\n" + "\n".join(dependents)
+        )
+    log_hub.info("AGENT", f"🔁 Regeneruję krok {step_index + 1} ({path}): {len(diagnostics)} błędów typów")
+
+    snapshot = snapshots.take(label=f"repair{step_index + 1}") if snapshots else None
+    history_length = len(state.history)
+    try:
+        state = get_command(step_type, step).run(state)
+    except Exception as e:
+        log_hub.error("AGENT", f"Błąd regeneracji kroku {step_index + 1}: {e}")
+        rollback(snapshots, snapshot)
+        return state
+
+    for result in state.history[history_length:]:
+        report = result.output.get("validation_report")
+        if report and not report.get("ok", True):
+            log_hub.error("AGENT", f"Walidacja regeneracji kroku {step_index + 1} nie powiodła się")
+            log_hub.error("AGENT", f"Szczegóły: {report.get('details', 'Brak szczegółów')}")
+            rollback(snapshots, snapshot)
+            break
+    return state
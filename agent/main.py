@@ -6,6 +6,7 @@ os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 import json
 import atexit
+import signal
 
 # ⬇️ Upewniamy się, że katalog output istnieje
 os.makedirs("output", exist_ok=True)
@@ -56,7 +57,12 @@ def describe_step(step: dict) -> tuple[str, str]:
 
     return name, path
 
+def terminate_handler(signum, frame):
+    """SIGTERM (stop z orchestratora) idzie ścieżką Ctrl+C - anulowana komenda run_script zabija swoje drzewo procesów"""
+    raise KeyboardInterrupt
+
 def main():
+    signal.signal(signal.SIGTERM, terminate_handler)
     log_hub.debug("AGENT", f"agent_input.json istnieje: {os.path.exists('agent_input.json')}")
     
     if os.path.exists("agent_input.json"):
@@ -2,6 +2,7 @@ import textwrap
 import os
 from datetime import datetime
 from agent.context.builder import build_hybrid_context
+from llm import Models
 
 def build_prompt(prompt_text: str, artifact_name: str, artifact_path: str) -> str:
     """
@@ -13,6 +14,7 @@ def build_prompt(prompt_text: str, artifact_name: str, artifact_path: str) -> st
     context = build_hybrid_context(
         current_path=artifact_path,
         prompt_text=prompt_text,
+        model=Models.QWEN_CODER_32B,
     )
 
     prompt = f"""
@@ -1,38 +1,65 @@
 import json
 import os
+from dataclasses import dataclass
 from datetime import datetime
-from agent.filesystem import FileSystem, get_flat_file_list_string
 from registry.process_manager import ProcessManager
 
+INFRASTRUCTURE_CONTEXT = "Kontekst pominięty - zadanie infrastrukturalne."
+
+
+@dataclass
+class ScenarioContext:
+    """Zebrany kontekst potrzebny do złożenia prompta scenariusza"""
+    previous_steps_txt: str
+    existing_context: str
+    dev_server_status: str
+
 
 def build_scenario_prompt(goal: str, constraints: list[str], mode: str = "initial", intention: str = "mixed") -> str:
     """
     Buduje prompt do generowania scenariusza w trybie inicjalnym lub interaktywnym,
     z uwzględnieniem struktury plików i stanu dev servera.
     """
-    process_manager = ProcessManager()
-    constraints_txt = "\n".join(f"- {c}" for c in constraints) if constraints else "- Brak dodatkowych ograniczeń"
+    context = gather_scenario_context(goal, intention)
+    return render_scenario_prompt(goal, constraints, mode, context)
 
-    fs = FileSystem(base_path="output")
-    file_structure = fs.get_flat_file_list_string()
-
-    # Wczytaj historię poprzednich kroków
-    previous_steps = load_previous_steps()
-    previous_steps_txt = format_previous_steps(previous_steps) if previous_steps else "Brak poprzednich kroków."
 
+def gather_scenario_context(goal: str, intention: str = "mixed") -> ScenarioContext:
+    """Sekwencyjnie zbiera kontekst (historia kroków, komponenty, dev server)."""
     # Context building based on intention
     if intention == "infrastructure":
-        existing_context = "Kontekst pominięty - zadanie infrastrukturalne."
+        existing_context = INFRASTRUCTURE_CONTEXT
     else:
         existing_context = build_project_context(goal)
 
-    # Sprawdź stan dev servera
-    dev_server_status = ""
+    return ScenarioContext(
+        previous_steps_txt=get_previous_steps_text(),
+        existing_context=existing_context,
+        dev_server_status=get_dev_server_status(),
+    )
+
+
+def get_previous_steps_text() -> str:
+    """Wczytuje historię poprzednich kroków w formie tekstu do prompta."""
+    previous_steps = load_previous_steps()
+    return format_previous_steps(previous_steps) if previous_steps else "Brak poprzednich kroków."
+
+
+def get_dev_server_status() -> str:
+    """Sprawdza stan dev servera (procesy + popularne porty)."""
+    process_manager = ProcessManager()
     if process_manager.is_dev_server_running:
-        dev_server_status = "\n UWAGA: Dev server już działa - NIE dodawaj kroków uruchamiania dev servera!"
-    else:
-        dev_server_status = "\n Dev server nie działa - możesz go uruchomić na końcu scenariusza."
-            
+        return "\n UWAGA: Dev server już działa - NIE dodawaj kroków uruchamiania dev servera!"
+    return "\n Dev server nie działa - możesz go uruchomić na końcu scenariusza."
+
+
+def render_scenario_prompt(goal: str, constraints: list[str], mode: str, context: ScenarioContext) -> str:
+    """Składa prompt scenariusza z wcześniej zebranego kontekstu."""
+    constraints_txt = "\n".join(f"- {c}" for c in constraints) if constraints else "- Brak dodatkowych ograniczeń"
+    existing_context = context.existing_context
+    previous_steps_txt = context.previous_steps_txt
+    dev_server_status = context.dev_server_status
+
     # Dodatkowe instrukcje w zależności od trybu
     mode_instructions = ""
     if mode == "initial":
@@ -62,6 +89,8 @@ ISTNIEJĄCE KOMPONENTY I ICH FUNKCJONALNOŚĆ:
 OSTATNIO WYKONANE KROKI
 {previous_steps_txt}
 
+STAN DEV SERVERA:{dev_server_status}
+
 PRZYKŁAD KOMPLETNEGO PODEJŚCIA dla aplikacji z wieloma komponentami:
 1. Setup projektu (mkdir, vite, npm install)
 2. Instalacja dodatkowych zależności (np. react-router-dom)
@@ -81,7 +110,9 @@ DOSTĘPNE TYPY KROKÓW:
 - "run_script": {{ 
    "command": "npm install", // jeśli to dev serwer zawsze podawaj --port na którym ma się uruchomić
    "cwd": "output/app",      // zawsze działaj w obrębie cwd output lub głębiej
-   "dev_server_mode": true | false
+   "dev_server_mode": true | false,
+   "timeout": 600,           // opcjonalnie: limit czasu komendy w sekundach
+   "cache": {{ "inputs": ["package.json"], "outputs": ["node_modules"] }} // opcjonalnie: pomiń komendę, jeśli pliki wejściowe się nie zmieniły
  }}
 - "mkdir": {{ "path": "src/components" }}
 - "delete": {{ "path": "output/obsolete.txt" }}
@@ -132,9 +163,11 @@ def build_project_context(goal: str) -> str:
     """Buduje kontekst istniejących komponentów"""
     try:
         from agent.context.builder import build_hybrid_context
+        from llm import Models
         
         context = build_hybrid_context(
             prompt_text=goal,
+            model=Models.CLAUDE_4_SONNET,
         )
         
         return context if context and context.strip() else "Brak istniejących komponentów do analizy."
@@ -142,6 +175,15 @@ def build_project_context(goal: str) -> str:
         return f"Błąd podczas budowania kontekstu: {str(e)}"
 
 
+def warm_project_context() -> None:
+    """Przygotowuje indeksy kontekstu niezależne od treści celu (można wołać równolegle z poprawą prompta)."""
+    try:
+        from agent.context.builder import warm_context_indexes
+        warm_context_indexes()
+    except Exception:
+        pass  # build_project_context i tak zbuduje indeksy i zgłosi błąd w kontekście
+
+
 def load_previous_steps() -> list:
     """
     Wczytuje poprzednie kroki z pliku scenario.json.
@@ -0,0 +1,146 @@
+import re
+import time
+import subprocess
+import urllib.request
+import urllib.error
+from dataclasses import dataclass, field
+from typing import Optional
+
+import psutil
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# Vite: "➜  Local:   http://localhost:5173/", Next/CRA: "Local: http://localhost:3000"
+LOCAL_URL_PATTERN = re.compile(r"Local:\s+(https?://[^\s]+)", re.IGNORECASE)
+URL_PORT_PATTERN = re.compile(r"https?://[^/:\s]+:(\d+)")
+
+
+@dataclass
+class ReadinessReport:
+    """Wynik sprawdzania gotowości dev servera"""
+    ready: bool
+    port: Optional[int] = None
+    url: Optional[str] = None
+    time_to_ready: Optional[float] = None
+    signals: list = field(default_factory=list)
+    exit_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+def wait_for_dev_server(process: subprocess.Popen, stdout_log: str, stderr_log: str,
+                        port_hint: Optional[int] = None, timeout: float = 30.0,
+                        poll_interval: float = 0.25) -> ReadinessReport:
+    """
+    Czeka aż dev server faktycznie zacznie przyjmować połączenia.
+    Sygnały:
+    - log procesu (linia "Local: http://...") - daje faktyczny port, także gdy Vite zmieni port
+    - psutil - gniazda LISTEN w drzewie procesu
+    - sonda HTTP - ostateczne potwierdzenie (dowolna odpowiedź HTTP), tylko dla portów
+      wskazanych przez log lub gniazda procesu (port_hint sam w sobie nie wystarcza)
+    Zakończenie procesu przed gotowością = natychmiastowa porażka.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    signals = []
+    log_url = None
+
+    while time.perf_counter() < deadline:
+        exit_code = process.poll()
+        if exit_code is not None:
+            return ReadinessReport(
+                ready=False,
+                exit_code=exit_code,
+                signals=signals,
+                error=f"Proces zakończył się przed gotowością (kod {exit_code}): {_tail(stderr_log) or _tail(stdout_log)}"
+            )
+
+        if log_url is None:
+            log_url = _find_local_url(stdout_log)
+            if log_url:
+                signals.append("log")
+
+        candidates = []
+        if log_url:
+            port_match = URL_PORT_PATTERN.search(log_url)
+            if port_match:
+                candidates.append(int(port_match.group(1)))
+
+        listening = _listening_ports(process.pid)
+        if listening and "socket" not in signals:
+            signals.append("socket")
+        candidates.extend(p for p in listening if p not in candidates)
+
+        # Podpowiedź z komendy tylko porządkuje kandydatów - port zajęty przez obcy proces
+        # (np. dev server z poprzedniego uruchomienia) nie może dać fałszywej gotowości
+        if port_hint in listening:
+            candidates.remove(port_hint)
+            candidates.insert(0, port_hint)
+
+        for port in candidates:
+            if _http_probe(port):
+                signals.append("http")
+                url = log_url if log_url and f":{port}" in log_url else f"http://localhost:{port}"
+                return ReadinessReport(
+                    ready=True,
+                    port=port,
+                    url=url,
+                    time_to_ready=round(time.perf_counter() - start, 3),
+                    signals=signals
+                )
+
+        time.sleep(poll_interval)
+
+    return ReadinessReport(
+        ready=False,
+        signals=signals,
+        error=f"Dev server nie odpowiedział w ciągu {timeout}s"
+    )
+
+
+def _find_local_url(log_path: str) -> Optional[str]:
+    try:
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            content = ANSI_PATTERN.sub("", f.read())
+    except OSError:
+        return None
+
+    match = LOCAL_URL_PATTERN.search(content)
+    return match.group(1).rstrip("/") if match else None
+
+
+def _listening_ports(pid: int) -> list[int]:
+    """Porty w stanie LISTEN otwarte przez proces lub jego potomków."""
+    ports = []
+    try:
+        parent = psutil.Process(pid)
+        procs = [parent] + parent.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return ports
+
+    for proc in procs:
+        try:
+            get_connections = getattr(proc, "net_connections", None) or proc.connections
+            for conn in get_connections(kind="inet"):
+                if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port not in ports:
+                    ports.append(conn.laddr.port)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return ports
+
+
+def _http_probe(port: int, timeout: float = 1.0) -> bool:
+    """Każda odpowiedź HTTP (także 404) oznacza, że serwer działa."""
+    try:
+        with urllib.request.urlopen(f"http://localhost:{port}/", timeout=timeout):
+            return True
+    except urllib.error.HTTPError:
+        return True
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
+
+
+def _tail(log_path: str, lines: int = 20) -> str:
+    try:
+        with open(log_path, encoding="utf-8", errors="replace") as f:
+            return ANSI_PATTERN.sub("", "".join(f.readlines()[-lines:])).strip()
+    except OSError:
+        return ""
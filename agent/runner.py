@@ -1,17 +1,41 @@
-import subprocess
+import asyncio
+import hashlib
 import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+import psutil
+
+from agent.config import get_config
 from logger import get_log_hub
 
 class ScriptRunner:
-    def __init__(self):
+    """
+    Asynchroniczne uruchamianie komend systemowych:
+    - stdout/stderr trafiają do log hub'a linia po linii, na bieżąco
+    - w pamięci zostaje tylko ogon outputu (ring buffer), pełny output idzie do pliku
+    - timeout per komenda; anulowanie taska (Ctrl+C / SIGTERM agenta) zabija całe drzewo procesów
+    """
+
+    def __init__(self, log_dir: str = "output/logs"):
         self.log_hub = get_log_hub()
+        self.log_dir = log_dir
+        config = get_config()
+        self.default_timeout = config.get("script_timeout", 600)
+        self.buffer_lines = config.get("script_buffer_lines", 200)
 
-    def run(self, command: str, cwd: str = ".", timeout: int = 30) -> dict:
+    def run(self, command: str, cwd: str = ".", timeout: Optional[int] = None) -> dict:
         """
         Uniwersalne uruchamianie komend systemowych w zadanym katalogu roboczym.
-        cwd może być ścieżką względną lub absolutną.
+        cwd może być ścieżką względną lub absolutną. Wersja synchroniczna run_async.
         """
+        return asyncio.run(self.run_async(command, cwd=cwd, timeout=timeout))
+
+    async def run_async(self, command: str, cwd: str = ".", timeout: Optional[int] = None) -> dict:
         exec_path = os.path.abspath(cwd or ".")
+        timeout = timeout or self.default_timeout
 
         if not os.path.isdir(exec_path):
             self.log_hub.error("AGENT", f"Katalog roboczy nie istnieje: {exec_path}")
@@ -22,37 +46,21 @@ class ScriptRunner:
                 "exit_code": -1
             }
 
-        self.log_hub.info("AGENT", f"Uruchamiam komendę: `{command}` (cwd={exec_path})")
+        self.log_hub.info("AGENT", f"Uruchamiam komendę: `{command}` (cwd={exec_path}, timeout={timeout}s)")
+
+        stdout_log, stderr_log = self._log_paths(command)
+        stdout_tail = _OutputTail(stdout_log, self.buffer_lines)
+        stderr_tail = _OutputTail(stderr_log, self.buffer_lines)
+        start = time.perf_counter()
 
         try:
-            result = subprocess.run(
+            process = await asyncio.create_subprocess_shell(
                 command,
-                shell=True,
-                capture_output=True,
-                text=True,
                 cwd=exec_path,
-                timeout=timeout
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1024 * 1024
             )
-            
-            if result.returncode != 0:
-                self.log_hub.error("AGENT", f"Komenda '{command}' zakończona z kodem {result.returncode}: {result.stderr}")
-            
-            return {
-                "ok": result.returncode == 0,
-                "stdout": result.stdout.strip(),
-                "stderr": result.stderr.strip(),
-                "exit_code": result.returncode
-            }
-
-        except subprocess.TimeoutExpired:
-            self.log_hub.error("AGENT", f"Timeout wykonania komendy '{command}' (>{timeout}s)")
-            return {
-                "ok": False,
-                "stdout": "",
-                "stderr": "⏰ Timeout (komenda trwała zbyt długo)",
-                "exit_code": -1
-            }
-
         except Exception as e:
             self.log_hub.error("AGENT", f"Błąd uruchamiania komendy '{command}': {e}")
             return {
@@ -60,4 +68,128 @@ class ScriptRunner:
                 "stdout": "",
                 "stderr": f"❌ Błąd uruchamiania: {str(e)}",
                 "exit_code": -1
-            }
\ No newline at end of file
+            }
+
+        readers = asyncio.gather(
+            self._pump(process.stdout, stdout_tail, self.log_hub.info),
+            self._pump(process.stderr, stderr_tail, self.log_hub.warn),
+        )
+        status = "finished"
+
+        try:
+            status = await self._wait(process, readers, timeout)
+        except asyncio.CancelledError:
+            await self._terminate(process)
+            readers.cancel()
+            stdout_tail.close()
+            stderr_tail.close()
+            raise
+
+        stdout_tail.close()
+        stderr_tail.close()
+        duration = time.perf_counter() - start
+
+        if status == "timeout":
+            self.log_hub.error("AGENT", f"Timeout wykonania komendy '{command}' (>{timeout}s)")
+            stderr_tail.append("⏰ Timeout (komenda trwała zbyt długo)")
+        elif process.returncode != 0:
+            self.log_hub.error("AGENT", f"Komenda '{command}' zakończona z kodem {process.returncode}")
+
+        return {
+            "ok": status == "finished" and process.returncode == 0,
+            "stdout": stdout_tail.text(),
+            "stderr": stderr_tail.text(),
+            "exit_code": process.returncode if status == "finished" else -1,
+            "status": status,
+            "duration": round(duration, 3),
+            "truncated": stdout_tail.truncated or stderr_tail.truncated,
+            "logs": {
+                "stdout": stdout_log,
+                "stderr": stderr_log
+            }
+        }
+
+    async def _wait(self, process, readers, timeout: int) -> str:
+        """Czeka na koniec procesu albo timeout. Zwraca status."""
+        waiter = asyncio.ensure_future(asyncio.gather(process.wait(), readers))
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+        if done:
+            return "finished"
+
+        await self._terminate(process)
+        try:
+            await asyncio.wait_for(waiter, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            waiter.cancel()
+        return "timeout"
+
+    async def _pump(self, stream, tail: "_OutputTail", log) -> None:
+        """Przepisuje strumień linia po linii do log hub'a, ring buffera i pliku."""
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            tail.append(text)
+            if text.strip():
+                log("RUNSCRIPT", text)
+
+    async def _terminate(self, process) -> None:
+        """Zabija proces razem z dziećmi (shell uruchamia npm/node jako potomków)."""
+        if process.returncode is not None:
+            return
+        # psutil.wait_procs blokuje - w wątku, żeby nie zatrzymywać pętli zdarzeń
+        await asyncio.to_thread(self._kill_tree, process.pid)
+
+    def _kill_tree(self, pid: int) -> None:
+        try:
+            parent = psutil.Process(pid)
+            children = parent.children(recursive=True)
+            for proc in children + [parent]:
+                try:
+                    proc.terminate()
+                except psutil.NoSuchProcess:
+                    pass
+            _, alive = psutil.wait_procs(children + [parent], timeout=3)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+        except psutil.NoSuchProcess:
+            pass
+        except Exception as e:
+            self.log_hub.error("AGENT", f"Błąd zatrzymywania procesu {pid}: {e}")
+
+    def _log_paths(self, command: str) -> tuple[str, str]:
+        os.makedirs(self.log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        digest = hashlib.sha1(command.encode("utf-8")).hexdigest()[:8]
+        base = os.path.join(self.log_dir, f"run_{timestamp}_{digest}")
+        return f"{base}_stdout.log", f"{base}_stderr.log"
+
+
+class _OutputTail:
+    """Ostatnie N linii w pamięci + pełny output w pliku."""
+
+    def __init__(self, path: str, max_lines: int):
+        self.lines = deque(maxlen=max_lines)
+        self.total = 0
+        self.file = open(path, "w", encoding="utf-8")
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+        self.total += 1
+        if not self.file.closed:
+            self.file.write(line + "\n")
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.lines)
+
+    def text(self) -> str:
+        return "\n".join(self.lines).strip()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.close()
@@ -1,7 +1,14 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 import os
 import json
+import uuid
+from agent.config import get_config
+from agent.storage.blobs import BlobStore, spill_large_values
+from agent.storage.history import HistoryArchive
+
+BLOB_DIR = "output/.blobs"
+HISTORY_DIR = "output/.history"
 
 class StepResult(BaseModel):
     step_name: str
@@ -14,6 +21,68 @@ class AgentState(BaseModel):
     done: bool = False
     current_step_index: int = 0
     artifacts: Dict[str, str] = Field(default_factory=dict)
+    # Liczba najstarszych kroków przeniesionych z history do output/.history
+    archived_steps: int = 0
+    # Katalog archiwum tego stanu w output/.history - nowy stan nie miesza się ze starym archiwum
+    history_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _legacy_history(cls, data: Any) -> Any:
+        # Stan sprzed przestrzeni nazw archiwum trzymał strony bezpośrednio w output/.history
+        if isinstance(data, dict) and "history_id" not in data and data.get("archived_steps"):
+            data = {**data, "history_id": ""}
+        return data
+
+    @property
+    def total_steps(self) -> int:
+        """Liczba wszystkich kroków w historii (w pamięci + zarchiwizowane)"""
+        return self.archived_steps + len(self.history)
+
+    def compact(self, blob_dir: str = BLOB_DIR, history_dir: str = HISTORY_DIR) -> None:
+        """
+        Ogranicza rozmiar stanu w pamięci:
+        - duże wartości (stdout, kod, prompty) trafiają do blobów, zostają referencje
+        - najstarsze kroki ponad limit są stronicowane do archiwum z indeksem
+        """
+        config = get_config()
+        store = BlobStore(blob_dir)
+        threshold = config.get("spill_threshold_bytes", 4096)
+        preview_chars = config.get("blob_preview_chars", 200)
+
+        for step in self.history:
+            step.input = spill_large_values(step.input, store, threshold, preview_chars)
+            step.output = spill_large_values(step.output, store, threshold, preview_chars)
+
+        keep = config.get("history_in_memory", 50)
+        overflow = len(self.history) - keep
+        if overflow <= 0:
+            return
+
+        # Stronicujemy paczkami, żeby nie zapisywać strony przy każdym kroku
+        count = min(len(self.history), max(overflow, config.get("history_page_size", 25)))
+        page = [step.model_dump() for step in self.history[:count]]
+        self._archive(history_dir).append_page(self.archived_steps, page)
+
+        self.history = self.history[count:]
+        self.archived_steps += count
+
+    def get_step(self, index: int, history_dir: str = HISTORY_DIR) -> Optional[StepResult]:
+        """Zwraca krok po globalnym indeksie - z pamięci lub z archiwum."""
+        if index >= self.archived_steps:
+            local_index = index - self.archived_steps
+            return self.history[local_index] if local_index < len(self.history) else None
+
+        data = self._archive(history_dir).load_step(index)
+        return StepResult(**data) if data else None
+
+    def lookup_history(self, step_name: Optional[str] = None, path: Optional[str] = None,
+                       history_dir: str = HISTORY_DIR) -> List[dict]:
+        """Wyszukuje zarchiwizowane kroki w indeksie (bez wczytywania stron)."""
+        return self._archive(history_dir).lookup(step_name=step_name, path=path)
+
+    def _archive(self, history_dir: str) -> HistoryArchive:
+        return HistoryArchive(os.path.join(history_dir, self.history_id) if self.history_id else history_dir)
 
     def to_json(self, path: str):
         os.makedirs(os.path.dirname(path), exist_ok=True)
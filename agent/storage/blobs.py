@@ -0,0 +1,86 @@
+import os
+import hashlib
+from typing import Any
+
+BLOB_KEY = "$blob"
+
+class BlobStore:
+    """
+    Magazyn blobów adresowanych treścią (sha256) w katalogu output/.blobs.
+    Ten sam tekst zapisywany jest tylko raz - referencja to jego hash.
+    """
+
+    def __init__(self, root: str = "output/.blobs"):
+        self.root = root
+
+    def _path_for(self, digest: str) -> str:
+        # Dwuznakowy prefiks, żeby nie trzymać tysięcy plików w jednym katalogu
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, text: str) -> str:
+        """Zapisuje tekst (jeśli jeszcze go nie ma) i zwraca jego hash."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path_for(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Wczytuje tekst bloba po hashu."""
+        with open(self._path_for(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path_for(digest))
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Sprawdza czy wartość jest referencją do bloba."""
+    return isinstance(value, dict) and BLOB_KEY in value
+
+
+def spill_large_values(value: Any, store: BlobStore, threshold: int, preview_chars: int = 200) -> Any:
+    """
+    Rekurencyjnie zamienia duże stringi na referencje do blobów:
+    {"$blob": <sha256>, "size": <bajty>, "preview": <początek tekstu>}
+    """
+    if isinstance(value, str):
+        size = len(value.encode("utf-8"))
+        if size <= threshold:
+            return value
+        return {
+            BLOB_KEY: store.put(value),
+            "size": size,
+            "preview": value[:preview_chars]
+        }
+
+    if isinstance(value, dict):
+        if is_blob_ref(value):
+            return value
+        return {k: spill_large_values(v, store, threshold, preview_chars) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [spill_large_values(v, store, threshold, preview_chars) for v in value]
+
+    return value
+
+
+def resolve_blobs(value: Any, store: BlobStore) -> Any:
+    """Odwrotność spill_large_values - podmienia referencje na pełną treść."""
+    if is_blob_ref(value):
+        return store.get(value[BLOB_KEY])
+
+    if isinstance(value, dict):
+        return {k: resolve_blobs(v, store) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [resolve_blobs(v, store) for v in value]
+
+    return value
@@ -0,0 +1,89 @@
+import os
+import json
+from typing import Dict, List, Optional
+
+class HistoryArchive:
+    """
+    Stronicowane archiwum starszych kroków historii agenta.
+    - page_XXXXXX_YYYYYY.json: lista kroków (StepResult jako dict)
+    - index.jsonl: jedna linia na krok (index, step_name, path, page, offset)
+    """
+
+    def __init__(self, root: str = "output/.history"):
+        self.root = root
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._page_cache: Dict[str, List[dict]] = {}
+
+    def append_page(self, first_index: int, steps: List[dict]) -> str:
+        """Zapisuje stronę kroków i dopisuje je do indeksu. Zwraca nazwę strony."""
+        os.makedirs(self.root, exist_ok=True)
+        last_index = first_index + len(steps) - 1
+        page_name = f"page_{first_index:06d}_{last_index:06d}.json"
+
+        with open(os.path.join(self.root, page_name), "w", encoding="utf-8") as f:
+            json.dump(steps, f, indent=2, ensure_ascii=False)
+
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for offset, step in enumerate(steps):
+                entry = {
+                    "index": first_index + offset,
+                    "step_name": step.get("step_name"),
+                    "path": step_lookup_path(step),
+                    "page": page_name,
+                    "offset": offset
+                }
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        return page_name
+
+    def load_index(self) -> List[dict]:
+        """Wczytuje cały indeks zarchiwizowanych kroków."""
+        if not os.path.exists(self.index_path):
+            return []
+
+        entries = []
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(json.loads(line))
+        return entries
+
+    def lookup(self, step_name: Optional[str] = None, path: Optional[str] = None) -> List[dict]:
+        """Filtruje wpisy indeksu po typie kroku i/lub ścieżce artefaktu."""
+        results = []
+        for entry in self.load_index():
+            if step_name and entry.get("step_name") != step_name:
+                continue
+            if path and entry.get("path") != path:
+                continue
+            results.append(entry)
+        return results
+
+    def load_step(self, index: int) -> Optional[dict]:
+        """Wczytuje pojedynczy krok z archiwum po jego globalnym indeksie."""
+        for entry in self.load_index():
+            if entry["index"] == index:
+                return self._load_page(entry["page"])[entry["offset"]]
+        return None
+
+    def _load_page(self, page_name: str) -> List[dict]:
+        if page_name not in self._page_cache:
+            with open(os.path.join(self.root, page_name), encoding="utf-8") as f:
+                self._page_cache[page_name] = json.load(f)
+        return self._page_cache[page_name]
+
+
+def step_lookup_path(step: dict) -> Optional[str]:
+    """Wyciąga ścieżkę/komendę, po której można wyszukać krok w indeksie."""
+    output = step.get("output") or {}
+    for key in ("code_path", "path", "copied_to", "created_path"):
+        if isinstance(output.get(key), str):
+            return output[key]
+
+    params = (step.get("input") or {}).get("params") or {}
+    artifact = params.get("artifact") or {}
+    for value in (artifact.get("path"), params.get("path"), params.get("command")):
+        if isinstance(value, str):
+            return value
+
+    return None
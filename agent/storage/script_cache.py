@@ -0,0 +1,111 @@
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+from typing import Optional
+from agent.config import get_config
+from agent.storage.blobs import BlobStore, spill_large_values, resolve_blobs
+
+# Domyślne klucze cache dla komend, które są idempotentne przy niezmienionych wejściach
+DEFAULT_CACHE_RULES = [
+    (re.compile(r"^npm\s+(install|i|ci)\b"), {"inputs": ["package.json", "package-lock.json"], "outputs": ["node_modules"]}),
+    (re.compile(r"^yarn(\s+(install|add)\b|\s*$)"), {"inputs": ["package.json", "yarn.lock"], "outputs": ["node_modules"]}),
+    (re.compile(r"^pnpm\s+(install|i|add)\b"), {"inputs": ["package.json", "pnpm-lock.yaml"], "outputs": ["node_modules"]}),
+]
+
+class ScriptCache:
+    """
+    Cache wyników run_script oparty o hashe plików wejściowych.
+    Wpis zapamiętuje hashe wejść PO udanym wykonaniu - jeśli przy kolejnym
+    wywołaniu są takie same (a wyjścia istnieją), komenda nie zmieni nic nowego.
+    """
+
+    def __init__(self, path: str = "output/.cache/run_script.json", blob_dir: str = "output/.blobs"):
+        self.path = path
+        self.store = BlobStore(blob_dir)
+
+    def resolve_rule(self, command: str, cache_param) -> Optional[dict]:
+        """
+        Zwraca deklarację cache dla kroku:
+        - params.cache = false -> brak cache
+        - params.cache = {"inputs": [...], "outputs": [...]} -> deklaracja z kroku
+        - w przeciwnym razie domyślna reguła dla znanych komend (npm install itp.)
+        """
+        if cache_param is False:
+            return None
+        if isinstance(cache_param, dict) and cache_param.get("inputs"):
+            return {"inputs": list(cache_param["inputs"]), "outputs": list(cache_param.get("outputs", []))}
+
+        for pattern, rule in DEFAULT_CACHE_RULES:
+            if pattern.search(command.strip()):
+                return rule
+        return None
+
+    def lookup(self, command: str, cwd: str, rule: dict) -> Optional[dict]:
+        """Zwraca zapamiętany wynik, jeśli wejścia się nie zmieniły i wyjścia istnieją."""
+        entry = self._load().get(self._key(command, cwd))
+        if not entry:
+            return None
+
+        if entry["inputs"] != self._fingerprint(rule["inputs"], cwd):
+            return None
+
+        for output in rule.get("outputs", []):
+            if not glob.glob(os.path.join(cwd, output)):
+                return None
+
+        return resolve_blobs(entry["result"], self.store)
+
+    def save(self, command: str, cwd: str, rule: dict, result: dict) -> None:
+        """Zapamiętuje udany wynik razem z hashami wejść po wykonaniu komendy."""
+        entries = self._load()
+        entries[self._key(command, cwd)] = {
+            "command": command,
+            "cwd": cwd,
+            "inputs": self._fingerprint(rule["inputs"], cwd),
+            "result": spill_large_values(result, self.store, get_config().get("spill_threshold_bytes", 4096)),
+            "stored_at": time.time()
+        }
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _key(self, command: str, cwd: str) -> str:
+        normalized_cwd = os.path.normpath(cwd).replace("\\", "/")
+        return hashlib.sha256(f"{normalized_cwd}\0{command.strip()}".encode("utf-8")).hexdigest()
+
+    def _fingerprint(self, inputs: list[str], cwd: str) -> dict:
+        """Hash każdego pliku wejściowego (wzorce glob dozwolone); brak pliku = None."""
+        hashes = {}
+        for pattern in inputs:
+            matches = sorted(glob.glob(os.path.join(cwd, pattern)))
+            if not matches:
+                hashes[pattern] = None
+                continue
+            for path in matches:
+                if os.path.isfile(path):
+                    rel_path = os.path.relpath(path, cwd).replace("\\", "/")
+                    hashes[rel_path] = _hash_file(path)
+        return hashes
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import stat
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+EXCLUDED_DIRS = {"node_modules", ".git"}
+MANIFEST = ".snapshot.json"
+
+# umask procesu - nowe pliki zapisywane przez mkstemp (0600) dostają prawa jak ze zwykłego open()
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@dataclass
+class Snapshot:
+    id: str
+    path: str
+    files: int
+    duration: float
+
+
+class SnapshotStore:
+    """
+    Snapshoty katalogu roboczego (output/app) jako drzewo hardlinków.
+    - snapshot nie kopiuje treści plików - tylko linkuje je (milisekundy)
+    - pliki zmieniane przez agenta zapisujemy przez write_text/copy_file (nowy inode),
+      więc snapshot zachowuje starą treść (copy-on-write)
+    - restore podmienia tylko pliki, których inode się zmienił, usuwa nowe pliki
+      i puste katalogi utworzone po snapshocie (katalogi z manifestu zostają)
+    node_modules i .git są pomijane.
+    """
+
+    def __init__(self, root: str = "output/app", snapshot_dir: str = "output/.snapshots", retention: int = 5):
+        self.root = root
+        self.snapshot_dir = snapshot_dir
+        self.retention = retention
+
+    def take(self, label: str = "") -> Optional[Snapshot]:
+        if not os.path.isdir(self.root):
+            return None
+
+        start = time.perf_counter()
+        snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f") + (f"_{label}" if label else "")
+        target = os.path.join(self.snapshot_dir, snapshot_id)
+        files = 0
+
+        for rel_path in self._walk(self.root):
+            dst = os.path.join(target, rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            _link_or_copy(os.path.join(self.root, rel_path), dst)
+            files += 1
+
+        os.makedirs(target, exist_ok=True)
+        with open(os.path.join(target, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({"id": snapshot_id, "root": self.root, "files": files, "dirs": sorted(self._walk_dirs(self.root))}, f)
+
+        self._prune()
+        return Snapshot(snapshot_id, target, files, round(time.perf_counter() - start, 4))
+
+    def restore(self, snapshot: Snapshot) -> dict:
+        """Przywraca stan z snapshotu. Zwraca statystyki: przywrócone, usunięte, czas."""
+        start = time.perf_counter()
+        snapshot_files = set(self._walk(snapshot.path))
+        current_files = set(self._walk(self.root))
+        restored = 0
+        removed = 0
+
+        for rel_path in current_files - snapshot_files:
+            os.remove(os.path.join(self.root, rel_path))
+            removed += 1
+
+        for rel_path in snapshot_files:
+            src = os.path.join(snapshot.path, rel_path)
+            dst = os.path.join(self.root, rel_path)
+            if os.path.exists(dst) and os.path.samefile(src, dst):
+                continue
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            tmp_path = dst + ".restore.tmp"
+            _link_or_copy(src, tmp_path)
+            os.replace(tmp_path, dst)
+            restored += 1
+
+        snapshot_dirs = self._snapshot_dirs(snapshot)
+        for rel_dir in snapshot_dirs:
+            os.makedirs(os.path.join(self.root, rel_dir), exist_ok=True)
+        self._remove_empty_dirs(self.root, keep=snapshot_dirs)
+        return {
+            "snapshot": snapshot.id,
+            "restored": restored,
+            "removed": removed,
+            "duration": round(time.perf_counter() - start, 4)
+        }
+
+    def list(self) -> list[str]:
+        if not os.path.isdir(self.snapshot_dir):
+            return []
+        return sorted(name for name in os.listdir(self.snapshot_dir)
+                      if os.path.isdir(os.path.join(self.snapshot_dir, name)))
+
+    def _prune(self) -> None:
+        snapshots = self.list()
+        for name in snapshots[:max(0, len(snapshots) - self.retention)]:
+            shutil.rmtree(os.path.join(self.snapshot_dir, name), ignore_errors=True)
+
+    def _walk(self, base: str):
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for filename in filenames:
+                if dirpath == base and filename == MANIFEST:
+                    continue
+                yield os.path.relpath(os.path.join(dirpath, filename), base)
+
+    def _walk_dirs(self, base: str):
+        for dirpath, dirnames, _ in os.walk(base):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for dirname in dirnames:
+                yield os.path.relpath(os.path.join(dirpath, dirname), base).replace(os.sep, "/")
+
+    def _snapshot_dirs(self, snapshot: Snapshot) -> set[str]:
+        """Katalogi istniejące w chwili snapshotu (manifest; starsze snapshoty - drzewo snapshotu)."""
+        try:
+            with open(os.path.join(snapshot.path, MANIFEST), encoding="utf-8") as f:
+                dirs = json.load(f).get("dirs")
+        except (OSError, ValueError):
+            dirs = None
+        return set(dirs) if dirs is not None else set(self._walk_dirs(snapshot.path))
+
+    def _remove_empty_dirs(self, base: str, keep: set[str]) -> None:
+        for dirpath, dirnames, filenames in os.walk(base, topdown=False):
+            if dirpath == base or any(part in EXCLUDED_DIRS for part in dirpath.split(os.sep)):
+                continue
+            if os.path.relpath(dirpath, base).replace(os.sep, "/") not in keep and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+
+def write_text(path: str, content: str) -> None:
+    """
+    Zapis przez plik tymczasowy + os.replace - plik dostaje nowy inode,
+    więc hardlink w snapshocie zachowuje poprzednią treść.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def copy_file(src: str, dst: str) -> None:
+    """shutil.copyfile z semantyką copy-on-write (patrz write_text)."""
+    directory = os.path.dirname(dst) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(dst)}.tmp")
+    shutil.copyfile(src, tmp_path)
+    os.chmod(tmp_path, _target_mode(dst))
+    os.replace(tmp_path, dst)
+
+
+def _target_mode(path: str) -> int:
+    """Prawa nadpisywanego pliku albo domyślne (0666 & ~umask) dla nowego."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Inny system plików / brak wsparcia hardlinków
+        shutil.copy2(src, dst)
@@ -0,0 +1,158 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from agent.config import get_config
+
+# Linter dla rozszerzenia + pliki konfiguracyjne, które wpływają na jego wynik
+LINTERS = {
+    ".tsx": "eslint", ".ts": "eslint", ".js": "eslint", ".jsx": "eslint",
+    ".py": "flake8",
+    ".html": "html",
+}
+LINTER_CONFIG_FILES = {
+    "eslint": ["eslint.config.mjs", "eslint.config.js", "eslint.config.cjs", "package.json"],
+    "flake8": [".flake8", "setup.cfg", "tox.ini"],
+    "html": [],
+}
+
+
+class ValidationCache:
+    """
+    Cache wyników analizy statycznej (LRU, ograniczony rozmiar).
+    Klucz: hash treści pliku + linter + hash jego plików konfiguracyjnych + rozszerzenie
+    (dla ESLint ścieżka względna), więc zmiana konfiguracji lintera unieważnia wpisy
+    bez ręcznego czyszczenia.
+    Deterministyczne ponowienia (temperatura 0) trafiają w cache zamiast w linter.
+    """
+
+    def __init__(self, max_entries: int = 1000, cwd: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cwd = cwd or os.getcwd()
+        self.entries: OrderedDict[str, tuple[bool, str, str]] = OrderedDict()
+        self.config_hashes: dict[str, tuple[tuple, str]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, path: str, analyzer: Callable[[str], tuple[bool, str]]) -> tuple[bool, str]:
+        """Zwraca wynik z cache albo uruchamia analyzer(path) i zapamiętuje wynik."""
+        if LINTERS.get(os.path.splitext(path)[1].lower()) is None:
+            return analyzer(path)
+
+        with open(path, "rb") as f:
+            content = f.read()
+        return self._cached(path, content, lambda: analyzer(path))
+
+    def analyze_source(self, code: str, path: str, analyzer: Callable[[str, str], tuple[bool, str]]) -> tuple[bool, str]:
+        """Wariant dla bufora w pamięci: analyzer(code, path)."""
+        if LINTERS.get(os.path.splitext(path)[1].lower()) is None:
+            return analyzer(code, path)
+        return self._cached(path, code.encode("utf-8"), lambda: analyzer(code, path))
+
+    def get(self, code: str, path: str) -> Optional[tuple[bool, str]]:
+        """Wynik z cache dla bufora albo None (liczy trafienia/chybienia)."""
+        linter = LINTERS.get(os.path.splitext(path)[1].lower())
+        if linter is None:
+            return None
+        entry = self._lookup(self._key(linter, path, code.encode("utf-8")), path)
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+        return entry
+
+    def put(self, code: str, path: str, result: tuple[bool, str]) -> None:
+        linter = LINTERS.get(os.path.splitext(path)[1].lower())
+        if linter is not None:
+            self._store(self._key(linter, path, code.encode("utf-8")), path, result)
+
+    def _cached(self, path: str, content: bytes, run: Callable[[], tuple[bool, str]]) -> tuple[bool, str]:
+        key = self._key(LINTERS[os.path.splitext(path)[1].lower()], path, content)
+        entry = self._lookup(key, path)
+        if entry is not None:
+            return entry
+
+        result = run()
+        with self.lock:
+            self.misses += 1
+        self._store(key, path, result)
+        return result
+
+    def _key(self, linter: str, path: str, content: bytes) -> str:
+        return f"{linter}:{self._config_hash(linter)}:{self._scope(linter, path)}:{hashlib.sha256(content).hexdigest()}"
+
+    def _scope(self, linter: str, path: str) -> str:
+        """
+        Część klucza zależna od pliku: rozszerzenie (parser .ts/.tsx/.js), a dla ESLint
+        ścieżka względna - reguły w flat config są przypisane do globów ścieżek.
+        """
+        if linter == "eslint":
+            return os.path.relpath(os.path.abspath(path), self.cwd).replace("\\", "/")
+        return os.path.splitext(path)[1].lower()
+
+    def _lookup(self, key: str, path: str) -> Optional[tuple[bool, str]]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        ok, report, original_path = entry
+        # Raport odnosi się do ścieżki z pierwszego sprawdzenia
+        return ok, report.replace(original_path, path) if original_path != path else report
+
+    def _store(self, key: str, path: str, result: tuple[bool, str]) -> None:
+        with self.lock:
+            self.entries[key] = (result[0], result[1], path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries
+        }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _config_hash(self, linter: str) -> str:
+        """Hash plików konfiguracyjnych lintera; przeliczany tylko gdy zmienią się mtime/rozmiar."""
+        paths = [os.path.join(self.cwd, name) for name in LINTER_CONFIG_FILES.get(linter, [])]
+        signature = tuple(
+            (path, stat.st_mtime_ns, stat.st_size)
+            for path in paths if os.path.exists(path) and (stat := os.stat(path))
+        )
+
+        cached = self.config_hashes.get(linter)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        for path, _, _ in signature:
+            digest.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        config_hash = digest.hexdigest()[:16]
+        self.config_hashes[linter] = (signature, config_hash)
+        return config_hash
+
+
+# Singleton instance
+_cache_instance = None
+
+def get_validation_cache() -> ValidationCache:
+    """Zwraca singleton cache walidacji"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ValidationCache(max_entries=get_config().get("validation_cache_size", 1000))
+    return _cache_instance
@@ -0,0 +1,56 @@
+// Długo żyjący worker ESLint - trzyma załadowaną instancję ESLint (config + pluginy)
+// Protokół: jedna linia JSON na żądanie/odpowiedź przez stdin/stdout
+//   -> {"id": 1, "path": "output/app/src/App.tsx", "code": "..."}
+//   <- {"id": 1, "ok": true, "output": "...", "errorCount": 0, "warningCount": 0}
+//   -> {"id": 2, "files": [{"path": "...", "code": "..."}, ...]}   (wiele plików w jednym żądaniu)
+//   <- {"id": 2, "results": [{"path": "...", "ok": true, "output": "...", ...}, ...]}
+// Po starcie worker lintuje pusty plik (rozgrzewka) i wysyła {"ready": true}.
+
+const readline = require("readline");
+const path = require("path");
+
+async function main() {
+  const cwd = process.cwd();
+  // ESLint z node_modules projektu (cwd), nie z katalogu skryptu
+  const { ESLint } = require(require.resolve("eslint", { paths: [cwd] }));
+  const eslint = new ESLint({ cwd });
+  const formatter = await eslint.loadFormatter("stylish");
+
+  const lint = async (filePath, code) => {
+    const absolute = path.resolve(cwd, filePath);
+    const results = await eslint.lintText(code, { filePath: absolute, warnIgnored: true });
+    const errorCount = results.reduce((sum, r) => sum + r.errorCount, 0);
+    const warningCount = results.reduce((sum, r) => sum + r.warningCount, 0);
+    const output = await formatter.format(results);
+    return { ok: errorCount === 0 && warningCount === 0, output, errorCount, warningCount };
+  };
+
+  await lint("warmup.tsx", "export {};\n");
+  process.stdout.write(JSON.stringify({ ready: true }) + "\n");
+
+  const rl = readline.createInterface({ input: process.stdin });
+  for await (const line of rl) {
+    if (!line.trim()) continue;
+    let request;
+    try {
+      request = JSON.parse(line);
+      if (request.files) {
+        const results = [];
+        for (const file of request.files) {
+          results.push({ path: file.path, ...(await lint(file.path, file.code)) });
+        }
+        process.stdout.write(JSON.stringify({ id: request.id, results }) + "\n");
+      } else {
+        const result = await lint(request.path, request.code);
+        process.stdout.write(JSON.stringify({ id: request.id, ...result }) + "\n");
+      }
+    } catch (err) {
+      process.stdout.write(JSON.stringify({ id: request ? request.id : null, error: String(err && err.stack || err) }) + "\n");
+    }
+  }
+}
+
+main().catch((err) => {
+  process.stdout.write(JSON.stringify({ ready: false, error: String(err && err.stack || err) }) + "\n");
+  process.exit(1);
+});
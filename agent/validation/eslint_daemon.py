@@ -0,0 +1,175 @@
+import os
+import json
+import atexit
+import time
+import queue
+import shutil
+import threading
+import subprocess
+from typing import Optional
+
+from logger import get_log_hub
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "eslint_daemon.js")
+CONFIG_FILES = ["eslint.config.mjs", "eslint.config.js", "eslint.config.cjs", "package.json"]
+
+
+class EslintDaemon:
+    """
+    Klient długo żyjącego workera ESLint (eslint_daemon.js).
+    - Node + pluginy ładują się raz, kolejne walidacje to tylko lintText w pamięci
+    - treść pliku idzie przez stdin, nie trzeba nic zapisywać na dysk
+    - zmiana eslint.config.* / package.json = restart workera przy następnym lint()
+    Czas startu workera to koszt, który płaci każdy świeży proces `eslint`,
+    więc raportujemy go jako zysk na każdej walidacji.
+    """
+
+    def __init__(self, cwd: Optional[str] = None, timeout: float = 30.0):
+        self.cwd = cwd or os.getcwd()
+        self.timeout = timeout
+        self.log_hub = get_log_hub()
+        self.process = None
+        self.responses = queue.Queue()
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.config_mtimes = {}
+        self.failed_mtimes = None
+        self.startup_time = None
+        self.stats = {"validations": 0, "total_time": 0.0, "restarts": 0}
+
+    def lint(self, path: str, code: Optional[str] = None) -> Optional[tuple[bool, str]]:
+        """Lintuje plik (lub podaną treść). Zwraca None, jeśli worker jest niedostępny."""
+        if code is None:
+            with open(path, encoding="utf-8") as f:
+                code = f.read()
+
+        response = self._request({"path": path, "code": code}, files=1)
+        if response is None:
+            return None
+        return response["ok"], response.get("output", "")
+
+    def lint_many(self, sources: dict[str, str]) -> Optional[dict[str, tuple[bool, str]]]:
+        """Wiele plików jednym żądaniem: {ścieżka: kod} -> {ścieżka: (ok, raport)}."""
+        files = [{"path": path, "code": code} for path, code in sources.items()]
+        response = self._request({"files": files}, files=len(files))
+        if response is None:
+            return None
+        return {result["path"]: (result["ok"], result.get("output", "")) for result in response["results"]}
+
+    def _request(self, payload: dict, files: int) -> Optional[dict]:
+        with self.lock:
+            if not self._ensure_running():
+                return None
+
+            self.next_id += 1
+            request_id = self.next_id
+            start = time.perf_counter()
+            try:
+                self.process.stdin.write(json.dumps({"id": request_id, **payload}) + "\n")
+                self.process.stdin.flush()
+                response = self._read_response(request_id)
+            except (OSError, queue.Empty) as e:
+                self.log_hub.warn("AGENT", f"⚠️ ESLint daemon nie odpowiada ({e}) - restart przy następnej walidacji")
+                self.stop()
+                return None
+
+            if response.get("error"):
+                self.log_hub.warn("AGENT", f"⚠️ ESLint daemon: {response['error'].splitlines()[0]}")
+                return None
+
+            duration = time.perf_counter() - start
+            self.stats["validations"] += files
+            self.stats["total_time"] += duration
+            self.log_hub.debug(
+                "AGENT",
+                f"⚡ ESLint daemon: {files} plik(ów) w {duration * 1000:.0f}ms "
+                f"(świeży proces ~{self.startup_time * 1000:.0f}ms więcej na plik, zaoszczędzono łącznie ~{self.stats['validations'] * self.startup_time:.1f}s)"
+            )
+            return response
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=3)
+            except Exception:
+                self.process.kill()
+        self.process = None
+
+    def _ensure_running(self) -> bool:
+        current_mtimes = self._config_mtimes()
+        if self.process and self.process.poll() is None:
+            if current_mtimes == self.config_mtimes:
+                return True
+            self.log_hub.info("AGENT", "🔄 Zmiana konfiguracji ESLint - restartuję daemon")
+            self.stats["restarts"] += 1
+            self.stop()
+
+        # Nieudany start nie jest ponawiany, dopóki konfiguracja się nie zmieni
+        if not shutil.which("node") or current_mtimes == self.failed_mtimes:
+            return False
+
+        start = time.perf_counter()
+        self.responses = queue.Queue()
+        self.process = subprocess.Popen(
+            ["node", WORKER_SCRIPT],
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        threading.Thread(target=self._reader, args=(self.process, self.responses), daemon=True).start()
+
+        try:
+            ready = self.responses.get(timeout=self.timeout)
+        except queue.Empty:
+            ready = {"ready": False, "error": "timeout"}
+
+        if not ready.get("ready"):
+            error = str(ready.get("error", "")).strip().splitlines()
+            self.log_hub.warn("AGENT", f"⚠️ ESLint daemon nie wystartował: {error[0] if error else 'brak odpowiedzi'} - używam CLI")
+            self.failed_mtimes = current_mtimes
+            self.stop()
+            return False
+
+        self.config_mtimes = current_mtimes
+        self.startup_time = time.perf_counter() - start
+        self.log_hub.info("AGENT", f"🟢 ESLint daemon gotowy w {self.startup_time * 1000:.0f}ms (PID: {self.process.pid})")
+        return True
+
+    def _read_response(self, request_id: int) -> dict:
+        while True:
+            response = self.responses.get(timeout=self.timeout)
+            if response.get("id") in (request_id, None):
+                return response
+
+    def _reader(self, process: subprocess.Popen, responses: queue.Queue) -> None:
+        for line in process.stdout:
+            try:
+                responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        responses.put({"id": None, "ready": False, "error": "worker zakończył pracę"})
+
+    def _config_mtimes(self) -> dict:
+        mtimes = {}
+        for name in CONFIG_FILES:
+            path = os.path.join(self.cwd, name)
+            if os.path.exists(path):
+                mtimes[name] = os.path.getmtime(path)
+        return mtimes
+
+
+# Singleton instance
+_daemon_instance = None
+
+def get_eslint_daemon() -> EslintDaemon:
+    """Zwraca singleton daemona ESLint"""
+    global _daemon_instance
+    if _daemon_instance is None:
+        _daemon_instance = EslintDaemon()
+        atexit.register(_daemon_instance.stop)
+    return _daemon_instance
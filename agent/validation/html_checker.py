@@ -0,0 +1,120 @@
+import re
+from html.parser import HTMLParser
+
+# Elementy bez tagu zamykającego
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+SRC_ELEMENTS = {"img", "script", "iframe", "audio", "video", "source", "embed", "track"}
+# Atrybuty w surowym tagu startowym: nazwa [= wartość w "", '' albo bez cudzysłowów]
+RAW_ATTRIBUTE_PATTERN = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+SPECIAL_CHARS_PATTERN = re.compile(r"[<>]")
+
+
+def check_html_source(code: str, path: str) -> tuple[bool, str]:
+    """
+    Walidacja HTML w pamięci (bez htmlhint). Reguły odpowiadają domyślnym regułom htmlhint:
+    doctype-first, tag-pair, tagname-lowercase, attr-lowercase, attr-value-double-quotes,
+    attr-no-duplication, id-unique, src-not-empty, spec-char-escape, title-require.
+    """
+    checker = _HtmlChecker()
+    checker.feed(code)
+    checker.close()
+    checker.finish()
+
+    messages = sorted(checker.messages)
+    return not messages, "\n".join(f"{path}:{line}:{col}: {text}" for line, col, text in messages)
+
+
+class _HtmlChecker(HTMLParser):
+    def __init__(self):
+        # Encje (&lt;) trafiają do handle_entityref, a nie do tekstu - spec-char-escape widzi tylko surowe < i >
+        super().__init__(convert_charrefs=False)
+        self.messages = []
+        self.stack = []
+        self.ids = {}
+        self.seen_doctype = False
+        self.seen_tag = False
+        self.has_head = False
+        self.has_title = False
+
+    def error_at(self, text: str, rule: str, position=None) -> None:
+        line, col = position or self.getpos()
+        self.messages.append((line, col + 1, f"{text} ({rule})"))
+
+    def handle_decl(self, decl: str) -> None:
+        if decl.lower().startswith("doctype"):
+            self.seen_doctype = True
+
+    def handle_data(self, data: str) -> None:
+        # Treść <script>/<style> to nie tekst dokumentu (htmlhint: cdata)
+        if self.cdata_elem is not None:
+            return
+        line, col = self.getpos()
+        for match in SPECIAL_CHARS_PATTERN.finditer(data):
+            before = data[:match.start()]
+            match_line = line + before.count("\n")
+            match_col = match.start() - before.rfind("\n") - 1 if "\n" in before else col + match.start()
+            self.error_at(f"Special characters must be escaped : [ {match.group()} ].", "spec-char-escape",
+                          (match_line, match_col))
+
+    def handle_starttag(self, tag, attrs):
+        self.check_tag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, self.getpos()))
+
+    def handle_startendtag(self, tag, attrs):
+        self.check_tag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+        open_tags = [name for name, _ in self.stack]
+        if tag not in open_tags:
+            self.error_at(f"Tag must be paired, no start tag: [ </{tag}> ]", "tag-pair")
+            return
+        while self.stack:
+            name, position = self.stack.pop()
+            if name == tag:
+                break
+            self.error_at(f"Tag must be paired, missing: [ </{name}> ]", "tag-pair", position)
+
+    def check_tag(self, tag, attrs):
+        if not self.seen_tag:
+            self.seen_tag = True
+            if not self.seen_doctype:
+                self.error_at("Doctype must be declared first.", "doctype-first")
+        self.has_head |= tag == "head"
+        self.has_title |= tag == "title"
+
+        raw = self.get_starttag_text() or ""
+        if raw[1:1 + len(tag)] != tag:
+            self.error_at(f"The html element name of [ {raw[1:1 + len(tag)]} ] must be in lowercase.", "tagname-lowercase")
+
+        # HTMLParser zamienia nazwy atrybutów na małe litery i zdejmuje cudzysłowy - sprawdzamy surowy tag
+        for raw_name, raw_value in RAW_ATTRIBUTE_PATTERN.findall(raw[1 + len(tag):].rstrip(">").rstrip("/")):
+            if raw_name != raw_name.lower():
+                self.error_at(f"The attribute name of [ {raw_name} ] must be in lowercase.", "attr-lowercase")
+            if raw_value and not raw_value.startswith('"'):
+                self.error_at(f"The value of attribute [ {raw_name} ] must be in double quotes.", "attr-value-double-quotes")
+
+        names = [name for name, _ in attrs]
+        for name in sorted({n for n in names if names.count(n) > 1}):
+            self.error_at(f"Duplicate of attribute name [ {name} ] was found.", "attr-no-duplication")
+
+        values = dict(attrs)
+        element_id = values.get("id")
+        if element_id:
+            if element_id in self.ids:
+                self.error_at(f"The id value [ {element_id} ] must be unique.", "id-unique")
+            self.ids[element_id] = self.getpos()
+        if tag in SRC_ELEMENTS and "src" in values and not (values["src"] or "").strip():
+            self.error_at(f"The attribute [ src ] of the tag [ {tag} ] must have a value.", "src-not-empty")
+
+    def finish(self) -> None:
+        for name, position in reversed(self.stack):
+            self.error_at(f"Tag must be paired, missing: [ </{name}> ]", "tag-pair", position)
+        self.stack = []
+        if self.has_head and not self.has_title:
+            self.error_at("<title></title> must be present in <head> tag.", "title-require", (1, 0))
@@ -0,0 +1,175 @@
+import os
+import ast
+import atexit
+import threading
+import configparser
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from agent.config import get_config
+
+try:
+    import pycodestyle
+    from pyflakes import checker as pyflakes_checker
+except ImportError:  # flake8 (i jego zależności) nie są zainstalowane
+    pycodestyle = None
+    pyflakes_checker = None
+
+try:
+    from flake8.plugins.pyflakes import FLAKE8_PYFLAKES_CODES
+except ImportError:
+    FLAKE8_PYFLAKES_CODES = {}
+
+# Domyślne ustawienia flake8 (gdy projekt nie ma własnej konfiguracji)
+DEFAULT_IGNORE = ["E121", "E123", "E126", "E226", "E24", "E704", "W503", "W504"]
+MAX_LINE_LENGTH = 79
+# Pliki konfiguracyjne flake8 - te same, które ValidationCache haszuje jako config lintera
+CONFIG_FILES = ["setup.cfg", "tox.ini", ".flake8"]
+
+_executor = None
+_executor_lock = threading.Lock()
+_options_cache: dict[str, tuple[tuple, "Flake8Options"]] = {}
+
+
+@dataclass(frozen=True)
+class Flake8Options:
+    ignore: tuple = tuple(DEFAULT_IGNORE)
+    select: tuple = ()
+    max_line_length: int = MAX_LINE_LENGTH
+
+    def reports(self, code: str) -> bool:
+        """Czy kod komunikatu jest raportowany (prefiksy jak w flake8: "E1" pasuje do E101)."""
+        if self.select and not code.startswith(self.select):
+            return False
+        return not code.startswith(self.ignore) if self.ignore else True
+
+
+def is_available() -> bool:
+    return pycodestyle is not None and pyflakes_checker is not None
+
+
+def load_flake8_options(cwd: Optional[str] = None) -> Flake8Options:
+    """
+    Opcje z sekcji [flake8] pierwszego pliku konfiguracyjnego w katalogu projektu:
+    ignore, extend-ignore, select, max-line-length. Przeliczane tylko gdy zmieni się mtime/rozmiar.
+    """
+    cwd = cwd or os.getcwd()
+    paths = [os.path.join(cwd, name) for name in CONFIG_FILES]
+    signature = tuple(
+        (path, stat.st_mtime_ns, stat.st_size)
+        for path in paths if os.path.exists(path) and (stat := os.stat(path))
+    )
+    cached = _options_cache.get(cwd)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    options = Flake8Options()
+    for path, _, _ in signature:
+        parser = configparser.RawConfigParser()
+        try:
+            parser.read(path, encoding="utf-8")
+        except configparser.Error:
+            continue
+        if not parser.has_section("flake8"):
+            continue
+        section = parser["flake8"]
+        ignore = _codes(section["ignore"]) if "ignore" in section else options.ignore
+        extend_ignore = _codes(section.get("extend-ignore", section.get("extend_ignore", "")))
+        select = _codes(section.get("select", ""))
+        max_line_length = section.get("max-line-length", section.get("max_line_length"))
+        options = Flake8Options(
+            ignore=ignore + extend_ignore,
+            select=select,
+            max_line_length=int(max_line_length) if max_line_length else MAX_LINE_LENGTH
+        )
+        break
+
+    _options_cache[cwd] = (signature, options)
+    return options
+
+
+def check_python_source(code: str, path: str) -> tuple[bool, str]:
+    """Walidacja jednego pliku w procesie: składnia (ast) + pyflakes + pycodestyle."""
+    return check_python_sources({path: code})[path]
+
+
+def check_python_files(paths: list[str]) -> dict[str, tuple[bool, str]]:
+    sources = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            sources[path] = f.read()
+    return check_python_sources(sources)
+
+
+def check_python_sources(sources: dict[str, str]) -> dict[str, tuple[bool, str]]:
+    """
+    Waliduje wiele plików naraz: {ścieżka: kod} -> {ścieżka: (ok, raport)}.
+    Identyczna treść w jednym wywołaniu jest sprawdzana raz; pliki są rozdzielane
+    na współdzieloną pulę procesów, jeśli jest ich co najmniej `python_pool_min_files`.
+    Wyniki między wywołaniami cache'uje ValidationCache (static.py).
+    """
+    options = load_flake8_options()
+    unique = list(dict.fromkeys(sources.values()))
+
+    if len(unique) >= get_config().get("python_pool_min_files", 4):
+        checked = dict(zip(unique, _get_executor().map(_check_source, unique, [options] * len(unique))))
+    else:
+        checked = {code: _check_source(code, options) for code in unique}
+
+    results = {}
+    for path, code in sources.items():
+        ok, messages = checked[code]
+        results[path] = (ok, "\n".join(f"{path}:{message}" for message in messages))
+    return results
+
+
+def _check_source(code: str, options: Flake8Options = Flake8Options()) -> tuple[bool, list[str]]:
+    """Zwraca (ok, ["linia:kolumna: KOD opis", ...]) - bez ścieżki, żeby wynik zależał tylko od treści."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return False, [f"{e.lineno or 1}:{e.offset or 1}: E999 SyntaxError: {e.msg}"]
+
+    messages = []
+    for message in pyflakes_checker.Checker(tree).messages:
+        code_id = FLAKE8_PYFLAKES_CODES.get(type(message).__name__, "F")
+        messages.append((message.lineno, message.col + 1, f"{code_id} {message.message % message.message_args}"))
+
+    style = pycodestyle.StyleGuide(quiet=True, ignore=list(options.ignore), max_line_length=options.max_line_length)
+    report = _CollectingReport(style.options)
+    pycodestyle.Checker(lines=code.splitlines(True), options=style.options, report=report).check_all()
+    messages.extend(report.collected)
+
+    messages = sorted(message for message in messages if options.reports(message[2].split(" ", 1)[0]))
+    return not messages, [f"{line}:{col}: {text}" for line, col, text in messages]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Jedna pula procesów na cały proces agenta (start workerów kosztuje więcej niż sprawdzenie pliku)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = get_config().get("python_pool_workers") or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+def _codes(value: str) -> tuple:
+    return tuple(code.strip() for code in value.replace("\n", ",").split(",") if code.strip())
+
+
+if pycodestyle is not None:
+    class _CollectingReport(pycodestyle.BaseReport):
+        """Raport pycodestyle zbierający komunikaty zamiast drukować."""
+
+        def __init__(self, options):
+            super().__init__(options)
+            self.collected = []
+
+        def error(self, line_number, offset, text, check):
+            code = super().error(line_number, offset, text, check)
+            if code:
+                self.collected.append((line_number, offset + 1, text))
+            return code
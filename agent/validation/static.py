@@ -1,10 +1,29 @@
 import os
+import json
 import subprocess
+from agent.config import get_config
+from agent.validation.eslint_daemon import get_eslint_daemon
+from agent.validation import python_checker
+from agent.validation.html_checker import check_html_source
+from agent.validation.cache import get_validation_cache
+
+SUPPORTED_EXTENSIONS = [".tsx", ".ts", ".js", ".jsx", ".py", ".html"]
+ESLINT_EXTENSIONS = [".tsx", ".ts", ".js", ".jsx"]
+# Plik, którego ESLint nie zwrócił w wyniku (np. ignorowany przez config) - nie jest poprawny,
+# tylko niesprawdzony; taki wynik nie trafia do cache
+ESLINT_UNCHECKED = "(ESLint nie zwrócił wyniku dla pliku - plik niesprawdzony)"
+
+def analyze_tsx_source(code: str, path: str) -> tuple[bool, str]:
+    # ⚡ Najpierw długo żyjący daemon; bez Node/ESLint - fallback na pojedynczy proces (stdin)
+    if get_config().get("eslint_daemon", True):
+        result = get_eslint_daemon().lint(path, code)
+        if result is not None:
+            return result
 
-def analyze_tsx_file(path: str) -> tuple[bool, str]:
     try:
         result = subprocess.run(
-            ["eslint", path, "--max-warnings=0"],
+            ["eslint", "--stdin", "--stdin-filename", path, "--max-warnings=0"],
+            input=code,
             capture_output=True,
             text=True,
             check=False
@@ -13,10 +32,15 @@ def analyze_tsx_file(path: str) -> tuple[bool, str]:
     except Exception as e:
         return (False, f"Błąd uruchamiania ESLint: {e}")
 
-def analyze_python_file(path: str) -> tuple[bool, str]:
+def analyze_python_source(code: str, path: str) -> tuple[bool, str]:
+    # 🐍 W procesie (ast + pyflakes + pycodestyle), bez uruchamiania flake8
+    if python_checker.is_available():
+        return python_checker.check_python_source(code, path)
+
     try:
         result = subprocess.run(
-            ["flake8", path],
+            ["flake8", "--stdin-display-name", path, "-"],
+            input=code,
             capture_output=True,
             text=True,
             check=False
@@ -25,26 +49,156 @@ def analyze_python_file(path: str) -> tuple[bool, str]:
     except Exception as e:
         return (False, f"Błąd uruchamiania flake8: {e}")
 
+def analyze_html_source(code: str, path: str) -> tuple[bool, str]:
+    return check_html_source(code, path)
+
+def analyze_tsx_file(path: str) -> tuple[bool, str]:
+    return analyze_tsx_source(_read(path), path)
+
+def analyze_python_file(path: str) -> tuple[bool, str]:
+    return analyze_python_source(_read(path), path)
+
 def analyze_html_file(path: str) -> tuple[bool, str]:
+    return analyze_html_source(_read(path), path)
+
+def analyze_python_files(paths: list[str]) -> dict[str, tuple[bool, str]]:
+    """Walidacja wielu plików .py naraz (pula procesów + ValidationCache)."""
+    return analyze_files(paths)
+
+def analyze_source(code: str, path: str) -> tuple[bool, str]:
+    """
+    Walidacja bufora w pamięci - `path` służy tylko do wyboru lintera i w raporcie.
+    Kandydat nie musi trafiać na dysk (ani do obserwowanego output/app) przed akceptacją.
+    """
+    # ♻️ Ta sama treść + ten sam config lintera = ten sam wynik
+    if get_config().get("validation_cache", True):
+        return get_validation_cache().analyze_source(code, path, _analyze_uncached)
+    return _analyze_uncached(code, path)
+
+def analyze_file(path: str) -> tuple[bool, str]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        return True, f"(Pominięto analizę – brak obsługi rozszerzenia: {ext})"
+    return analyze_source(_read(path), path)
+
+def analyze_sources(sources: dict[str, str]) -> dict[str, tuple[bool, str]]:
+    """
+    Walidacja wielu buforów naraz: {ścieżka: kod} -> {ścieżka: (ok, raport)}.
+    Jedno wywołanie lintera na grupę (ESLint: jedno żądanie do daemona, Python: pula procesów)
+    zamiast procesu/żądania na plik. Trafienia w cache nie trafiają do lintera.
+    """
+    return _analyze_batch(sources, on_disk=False)
+
+def analyze_files(paths: list[str]) -> dict[str, tuple[bool, str]]:
+    """Jak analyze_sources, ale dla plików na dysku - fallback ESLint CLI dostaje wszystkie ścieżki naraz."""
+    results = {}
+    sources = {}
+    for path in paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in SUPPORTED_EXTENSIONS:
+            sources[path] = _read(path)
+        else:
+            results[path] = (True, f"(Pominięto analizę – brak obsługi rozszerzenia: {ext})")
+    results.update(_analyze_batch(sources, on_disk=True))
+    return results
+
+def _analyze_batch(sources: dict[str, str], on_disk: bool) -> dict[str, tuple[bool, str]]:
+    use_cache = get_config().get("validation_cache", True)
+    cache = get_validation_cache() if use_cache else None
+
+    results = {}
+    pending = {}
+    for path, code in sources.items():
+        cached = cache.get(code, path) if cache else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending[path] = code
+
+    groups: dict[str, dict[str, str]] = {}
+    for path, code in pending.items():
+        ext = os.path.splitext(path)[1].lower()
+        group = "eslint" if ext in ESLINT_EXTENSIONS else "python" if ext == ".py" else "other"
+        groups.setdefault(group, {})[path] = code
+
+    fresh = {}
+    if groups.get("eslint"):
+        fresh.update(_lint_eslint_batch(groups["eslint"], on_disk))
+    if groups.get("python"):
+        if python_checker.is_available():
+            fresh.update(python_checker.check_python_sources(groups["python"]))
+        else:
+            fresh.update({path: analyze_python_source(code, path) for path, code in groups["python"].items()})
+    for path, code in groups.get("other", {}).items():
+        fresh[path] = _analyze_uncached(code, path)
+
+    if cache:
+        for path, result in fresh.items():
+            if not result[1].endswith(ESLINT_UNCHECKED):
+                cache.put(pending[path], path, result)
+    results.update(fresh)
+    return {path: results[path] for path in sources}
+
+def _lint_eslint_batch(sources: dict[str, str], on_disk: bool) -> dict[str, tuple[bool, str]]:
+    if get_config().get("eslint_daemon", True):
+        results = get_eslint_daemon().lint_many(sources)
+        if results is not None:
+            return {path: results.get(path, (False, f"{path}: {ESLINT_UNCHECKED}")) for path in sources}
+
+    # Bez daemona: pliki z dysku jednym procesem ESLint, bufory w pamięci przez stdin (po jednym)
+    if on_disk:
+        return run_eslint_cli(list(sources))
+    return {path: analyze_tsx_source(code, path) for path, code in sources.items()}
+
+def run_eslint_cli(paths: list[str]) -> dict[str, tuple[bool, str]]:
+    """Jedno wywołanie `eslint -f json <ścieżki...>`; wynik rozbity per plik."""
     try:
         result = subprocess.run(
-            ["htmlhint", path],
+            ["eslint", "-f", "json", "--max-warnings=0", *paths],
             capture_output=True,
             text=True,
             check=False
         )
-        return (result.returncode == 0, result.stdout + result.stderr)
     except Exception as e:
-        return (False, f"Błąd uruchamiania htmlhint: {e}")
+        return {path: (False, f"Błąd uruchamiania ESLint: {e}") for path in paths}
+    return parse_eslint_json(result.stdout, paths, fallback=result.stdout + result.stderr)
 
-def analyze_file(path: str) -> tuple[bool, str]:
+def parse_eslint_json(output: str, paths: list[str], fallback: str = "") -> dict[str, tuple[bool, str]]:
+    """Parsuje wynik formatera JSON ESLint -> {ścieżka: (ok, raport)} dla podanych ścieżek."""
+    try:
+        file_results = json.loads(output)
+    except json.JSONDecodeError:
+        # Błąd konfiguracji/uruchomienia - dotyczy wszystkich plików w wywołaniu
+        return {path: (False, fallback or output) for path in paths}
+
+    by_abspath = {os.path.normcase(os.path.abspath(path)): path for path in paths}
+    results = {path: (False, f"{path}: {ESLINT_UNCHECKED}") for path in paths}
+    for file_result in file_results:
+        path = by_abspath.get(os.path.normcase(os.path.abspath(file_result.get("filePath", ""))))
+        if path is None:
+            continue
+
+        lines = []
+        for message in file_result.get("messages", []):
+            level = "error" if message.get("severity") == 2 else "warning"
+            rule = f" ({message['ruleId']})" if message.get("ruleId") else ""
+            lines.append(f"{path}:{message.get('line', 0)}:{message.get('column', 0)}: {level} {message.get('message', '').strip()}{rule}")
+        ok = not file_result.get("errorCount", 0) and not file_result.get("warningCount", 0)
+        results[path] = (ok, "\n".join(lines))
+    return results
+
+def _analyze_uncached(code: str, path: str) -> tuple[bool, str]:
     ext = os.path.splitext(path)[1].lower()
 
     if ext in [".tsx", ".ts", ".js", ".jsx"]:
-        return analyze_tsx_file(path)
+        return analyze_tsx_source(code, path)
     elif ext == ".py":
-        return analyze_python_file(path)
+        return analyze_python_source(code, path)
     elif ext == ".html":
-        return analyze_html_file(path)
+        return analyze_html_source(code, path)
 
     return True, f"(Pominięto analizę – brak obsługi rozszerzenia: {ext})"
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
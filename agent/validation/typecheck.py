@@ -0,0 +1,153 @@
+import os
+import re
+import time
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+TS_EXTENSIONS = (".ts", ".tsx")
+DIAGNOSTIC_PATTERN = re.compile(
+    r"^(?P<path>[^\s(][^(]*)\((?P<line>\d+),(?P<col>\d+)\): error (?P<code>TS\d+): (?P<message>.*)$"
+)
+REFERENCES_PATTERN = re.compile(r'"references"\s*:')
+# Lokalne importy: import ... from './x', export ... from './x', import './x'
+LOCAL_IMPORT_PATTERN = re.compile(r"""(?:\bfrom|^\s*import)\s*['"](\.{1,2}/[^'"]*)['"]""", re.MULTILINE)
+RESOLVE_EXTENSIONS = [".tsx", ".ts", ".d.ts", ".jsx", ".js"]
+
+
+@dataclass
+class Diagnostic:
+    path: str  # ścieżka absolutna
+    line: int
+    col: int
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}({self.line},{self.col}): {self.code}: {self.message}"
+
+
+@dataclass
+class TypecheckResult:
+    project_dir: str
+    ok: bool
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+    duration: float = 0.0
+    skipped: Optional[str] = None
+
+
+def find_tsconfig_dir(path: str, stop_dir: str = "output/app") -> Optional[str]:
+    """Najbliższy katalog z tsconfig.json w górę od pliku (nie wyżej niż stop_dir)."""
+    stop = os.path.abspath(stop_dir)
+    current = os.path.dirname(os.path.abspath(path))
+    while current.startswith(stop):
+        if os.path.exists(os.path.join(current, "tsconfig.json")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return None
+
+
+def run_typecheck(project_dir: str, timeout: int = 300, cache_dir: str = "output/.cache") -> TypecheckResult:
+    """
+    Sprawdzenie typów całego projektu jednym wywołaniem tsc (--noEmit, przyrostowo).
+    Projekty z "references" (szablony Vite) idą przez `tsc -b`, który sam zarządza tsbuildinfo.
+    """
+    tsc = os.path.join(project_dir, "node_modules", ".bin", "tsc")
+    if os.name == "nt":
+        tsc += ".cmd"
+    if not os.path.exists(tsc):
+        return TypecheckResult(project_dir, ok=True, skipped="brak node_modules/.bin/tsc (npm install?)")
+
+    with open(os.path.join(project_dir, "tsconfig.json"), encoding="utf-8") as f:
+        uses_references = bool(REFERENCES_PATTERN.search(f.read()))
+
+    if uses_references:
+        command = [tsc, "-b", "tsconfig.json", "--pretty", "false"]
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        project_key = re.sub(r"[^\w]+", "_", os.path.relpath(project_dir)).strip("_")
+        build_info = os.path.abspath(os.path.join(cache_dir, f"tsc_{project_key}.tsbuildinfo"))
+        command = [tsc, "--noEmit", "--incremental", "--tsBuildInfoFile", build_info,
+                   "-p", "tsconfig.json", "--pretty", "false"]
+
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(command, cwd=project_dir, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return TypecheckResult(project_dir, ok=False, skipped=f"timeout tsc (>{timeout}s)",
+                               duration=time.perf_counter() - start)
+    except Exception as e:
+        return TypecheckResult(project_dir, ok=True, skipped=f"błąd uruchamiania tsc: {e}")
+
+    diagnostics = parse_diagnostics(result.stdout + result.stderr, project_dir)
+    return TypecheckResult(
+        project_dir,
+        ok=result.returncode == 0 and not diagnostics,
+        diagnostics=diagnostics,
+        duration=round(time.perf_counter() - start, 3)
+    )
+
+
+def parse_diagnostics(output: str, project_dir: str) -> list[Diagnostic]:
+    diagnostics = []
+    for line in output.splitlines():
+        match = DIAGNOSTIC_PATTERN.match(line)
+        if match:
+            diagnostics.append(Diagnostic(
+                path=os.path.normpath(os.path.join(os.path.abspath(project_dir), match.group("path").strip())),
+                line=int(match.group("line")),
+                col=int(match.group("col")),
+                code=match.group("code"),
+                message=match.group("message").strip()
+            ))
+        elif diagnostics and line.startswith(" "):
+            # Wieloliniowe komunikaty tsc - kontynuacja z wcięciem
+            diagnostics[-1].message += "\n" + line.strip()
+    return diagnostics
+
+
+def map_diagnostics_to_steps(diagnostics: list[Diagnostic], produced: dict[str, int],
+                             imports_of: Optional[Callable[[str], list[str]]] = None) -> dict[int, list[Diagnostic]]:
+    """
+    Przypisuje błędy do kroków scenariusza, które wyprodukowały dany plik.
+    produced: {ścieżka absolutna: indeks kroku}. Błąd w pliku spoza scenariusza (np. App.tsx
+    używający starych propsów Card) trafia do kroków, które wygenerowały jego importy.
+    Błędy bez takiego powiązania są pomijane.
+    """
+    imports_of = imports_of or local_imports
+    by_step: dict[int, list[Diagnostic]] = {}
+    for diagnostic in diagnostics:
+        step_index = produced.get(os.path.normcase(diagnostic.path))
+        if step_index is not None:
+            by_step.setdefault(step_index, []).append(diagnostic)
+            continue
+
+        dependency_steps = {
+            produced[dependency] for path in imports_of(diagnostic.path)
+            if (dependency := os.path.normcase(os.path.abspath(path))) in produced
+        }
+        for dependency_step in sorted(dependency_steps):
+            by_step.setdefault(dependency_step, []).append(diagnostic)
+    return by_step
+
+
+def local_imports(path: str) -> list[str]:
+    """Pliki importowane przez `path` ścieżkami względnymi (rozwiązane jak w bundlerze)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except OSError:
+        return []
+
+    resolved = []
+    for specifier in LOCAL_IMPORT_PATTERN.findall(source):
+        base = os.path.normpath(os.path.join(os.path.dirname(path), specifier))
+        candidates = [base] + [base + ext for ext in RESOLVE_EXTENSIONS]
+        candidates += [os.path.join(base, f"index{ext}") for ext in RESOLVE_EXTENSIONS]
+        target = next((candidate for candidate in candidates if os.path.isfile(candidate)), None)
+        if target:
+            resolved.append(target)
+    return resolved
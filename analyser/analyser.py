@@ -118,6 +118,7 @@ async def analyze_file(path: str):
         "type": parsed_data.get("type"),
         "imports": parsed_data.get("imports", []),
         "exports": parsed_data.get("exports", []),
+        "signatures": parsed_data.get("signatures", []),
         "summary_path": None,
         "weight": 1.0,
     }
@@ -2,6 +2,18 @@ import re
 import ast
 from typing import Dict, List
 
+# Limit długości pojedynczej sygnatury (np. interfejs props z wieloma polami)
+MAX_SIGNATURE_LENGTH = 400
+
+EXPORTED_FUNCTION = re.compile(
+    r'export\s+(?:default\s+)?(?:async\s+)?function\s*(\w*)\s*(<[^>]*>)?\s*\(')
+EXPORTED_ARROW = re.compile(
+    r'export\s+const\s+(\w+)\s*(?::\s*([^=]+?))?\s*=\s*(?:async\s+)?(?:<[^>]*>\s*)?\(')
+EXPORTED_CLASS = re.compile(
+    r'export\s+(?:default\s+)?(?:abstract\s+)?class\s+(\w+)[^{]*')
+TYPE_DECLARATION = re.compile(
+    r'^(export\s+)?(interface|type|enum)\s+(\w+)', re.MULTILINE)
+
 def parse_code_file(content: str, language: str) -> Dict:
     """Parser kodu źródłowego – AST dla Pythona, regex dla frontendów"""
     
@@ -59,13 +71,81 @@ def parse_js_ts_regex(content: str, language: str) -> Dict:
     return {
         'imports': list(set(imports)),  # Remove duplicates
         'exports': list(set(exports)),
+        'signatures': extract_js_ts_signatures(content),
         'type': file_type
     }
 
+def extract_js_ts_signatures(content: str) -> List[str]:
+    """
+    Sygnatury eksportowanego API: funkcje/komponenty z parametrami i typem zwracanym,
+    klasy, eksportowane typy/interfejsy oraz lokalne typy użyte w parametrach (np. props).
+    """
+    declarations = {}
+    for match in TYPE_DECLARATION.finditer(content):
+        exported, kind, name = match.groups()
+        declarations[name] = (bool(exported), _compact(_take_declaration(content, match.start(2), kind)))
+
+    signatures = []
+    referenced = set()
+
+    for match in EXPORTED_FUNCTION.finditer(content):
+        params, end = _take_balanced(content, match.end() - 1, "(", ")")
+        returns = _take_return_type(content, end)
+        name = match.group(1) or "default"
+        signatures.append(_compact(f"function {name}{match.group(2) or ''}{params}{returns}"))
+        referenced.update(re.findall(r'\b[A-Z]\w*', params + returns))
+
+    for match in EXPORTED_ARROW.finditer(content):
+        params, end = _take_balanced(content, match.end() - 1, "(", ")")
+        annotation = f": {match.group(2).strip()}" if match.group(2) else ""
+        returns = _take_return_type(content, end)
+        signatures.append(_compact(f"const {match.group(1)}{annotation} = {params}{returns} =>"))
+        referenced.update(re.findall(r'\b[A-Z]\w*', annotation + params + returns))
+
+    for match in EXPORTED_CLASS.finditer(content):
+        signatures.append(_compact(f"class {match.group(0).split('class', 1)[1].strip()}"))
+
+    for name, (exported, declaration) in declarations.items():
+        if exported or name in referenced:
+            signatures.append(declaration)
+
+    return [signature[:MAX_SIGNATURE_LENGTH] for signature in signatures]
+
+def _take_balanced(content: str, start: int, opening: str, closing: str) -> tuple:
+    """Fragment od nawiasu otwierającego na pozycji `start` do pasującego zamykającego."""
+    depth = 0
+    for i in range(start, len(content)):
+        if content[i] == opening:
+            depth += 1
+        elif content[i] == closing:
+            depth -= 1
+            if depth == 0:
+                return content[start:i + 1], i + 1
+    return content[start:], len(content)
+
+def _take_return_type(content: str, position: int) -> str:
+    match = re.match(r'\s*:\s*([^={]+?)\s*(?:=>|\{)', content[position:])
+    return f": {match.group(1).strip()}" if match else ""
+
+def _take_declaration(content: str, start: int, kind: str) -> str:
+    brace = content.find("{", start)
+    line_end = content.find("\n", start)
+    line_end = len(content) if line_end == -1 else line_end
+    if kind != "type" or (brace != -1 and brace < line_end and "=" not in content[start:brace]):
+        if brace != -1:
+            return content[start:_take_balanced(content, brace, "{", "}")[1]]
+    # type X = ...; (do średnika albo końca linii)
+    end = content.find(";", start)
+    return content[start:end if end != -1 and end < line_end + 200 else line_end]
+
+def _compact(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
 def parse_python_ast(content: str) -> Dict:
-    """Analiza AST dla plików Python – wyciąga importy"""
+    """Analiza AST dla plików Python – wyciąga importy, eksporty i ich sygnatury"""
     imports = []
     exports = []
+    signatures = []
     try:
         tree = ast.parse(content)
         for node in ast.walk(tree):
@@ -79,13 +159,27 @@ def parse_python_ast(content: str) -> Dict:
         for node in tree.body:
             if isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
                 exports.append(node.name)
+                signatures.append(_python_signature(node))
             elif isinstance(node, ast.ClassDef):
                 exports.append(node.name)
+                bases = ", ".join(ast.unparse(base) for base in node.bases)
+                signatures.append(f"class {node.name}({bases})" if bases else f"class {node.name}")
+                signatures.extend(
+                    f"    {_python_signature(item)}" for item in node.body
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                    and (not item.name.startswith("_") or item.name == "__init__")
+                )
     except SyntaxError:
         pass
 
     return {
         'imports': list(set(imports)),
         'exports': list(set(exports)),
+        'signatures': signatures,
         'type': 'module'
     }
+
+def _python_signature(node) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"[:MAX_SIGNATURE_LENGTH]
@@ -40,4 +40,14 @@ MODEL_MAX_TOKENS = {
     Models.QWEN_CODER: 32768,
     Models.QWEN_CODER_32B: 32768,
     Models.CODESTRAL: 32768,
-}
\ No newline at end of file
+}
+# Budżet tokenów na KONTEKST projektu w promptach (część okna, reszta na zadanie i odpowiedź)
+MODEL_CONTEXT_BUDGET = {
+    Models.GPT_4_1_MINI: 24000,
+    Models.GPT_4O: 24000,
+    Models.GPT_4O_MINI: 16000,
+    Models.CLAUDE_4_SONNET: 24000,
+    Models.QWEN_CODER: 6000,
+    Models.QWEN_CODER_32B: 8000,
+    Models.CODESTRAL: 8000,
+}
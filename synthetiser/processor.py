@@ -152,6 +152,7 @@ class MetaFileProcessor:
             "type": raw_data.get("type"),
             "imports": raw_data.get("imports", []),
             "exports": raw_data.get("exports", []),
+            "signatures": raw_data.get("signatures", []),
             "summary_path": None,  # TODO: implement
             "weight": weight,
         }
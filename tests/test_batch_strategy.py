@@ -0,0 +1,88 @@
+import pytest
+from agent.codegen.batch_strategy import group_batchable_steps, match_batch_files, parse_multi_file_response
+
+
+def make_step(path: str, step_type: str = "generate_code") -> dict:
+    name = path.rsplit("/", 1)[-1]
+    return {
+        "type": step_type,
+        "params": {"prompt": f"Utwórz {name}", "artifact": {"name": name, "path": path, "extension": "." + name.rsplit(".", 1)[-1]}}
+    }
+
+
+def test_parse_multi_file_response():
+    response = (
+        "Oto pliki:\r\n"
+        "=== FILE: `output/app/src/A.tsx` ===\r\n"
+        "```tsx\r\nexport const A = 1;\r\n```\r\n"
+        "=== END FILE ===\r\n"
+        "=== FILE: output/app/src/B.tsx ===\n"
+        "export const B = 2;\n"
+        "=== END FILE ===\n"
+    )
+    assert parse_multi_file_response(response) == {
+        "output/app/src/A.tsx": "export const A = 1;",
+        "output/app/src/B.tsx": "export const B = 2;",
+    }
+
+
+def test_match_batch_files_normalizes_paths():
+    paths = ["output/app/src/X.tsx", "output/app/src/components/Y.tsx", "output/app/src/Z.tsx"]
+    files = {"./output/app/src/X.tsx": "x", "src\\components\\Y.tsx": "y", "other/Z.tsx": "z"}
+
+    # Z.tsx pasuje tylko nazwą pliku, ale nie całym sufiksem - nie zgadujemy
+    assert match_batch_files(files, paths) == {"output/app/src/X.tsx": "x", "output/app/src/components/Y.tsx": "y"}
+
+
+def test_match_batch_files_rejects_ambiguous_suffix():
+    paths = ["output/app/src/a/index.tsx", "output/app/src/b/index.tsx"]
+    assert match_batch_files({"index.tsx": "?"}, paths) == {}
+
+
+def test_group_batchable_steps(tmp_path):
+    existing = tmp_path / "Existing.tsx"
+    existing.write_text("export {};\n")
+    steps = [
+        make_step("output/app/src/Install.tsx", step_type="run_script"),
+        make_step(str(tmp_path / "A.tsx")),
+        make_step(str(tmp_path / "B.tsx")),
+        make_step(str(tmp_path / "C.css")),
+        make_step(str(tmp_path / "D.tsx")),
+    ]
+
+    assert group_batchable_steps(steps, 0) == []
+    # Ta sama rozszerzenie, nowe pliki - do pierwszej zmiany rozszerzenia
+    assert [s["params"]["artifact"]["name"] for s in group_batchable_steps(steps, 1)] == ["A.tsx", "B.tsx"]
+
+    # Modyfikacja istniejącego pliku i powtórzona ścieżka przerywają grupę
+    steps = [make_step(str(tmp_path / "A.tsx")), make_step(str(existing)), make_step(str(tmp_path / "B.tsx"))]
+    assert len(group_batchable_steps(steps, 0)) == 1
+    steps = [make_step(str(tmp_path / "A.tsx")), make_step(str(tmp_path / "A.tsx"))]
+    assert len(group_batchable_steps(steps, 0)) == 1
+
+
+def test_group_respects_max_artifacts(tmp_path, monkeypatch):
+    from agent.config import get_config
+    monkeypatch.setitem(get_config().config, "batch_max_artifacts", 3)
+    steps = [make_step(str(tmp_path / f"F{i}.tsx")) for i in range(5)]
+    assert len(group_batchable_steps(steps, 0)) == 3
+
+
+def test_generate_batch_accepts_relative_paths(monkeypatch):
+    import agent.codegen.batch_strategy as batch
+
+    class FakeLLM:
+        model = "fake"
+
+        def chat(self, prompt):
+            return "=== FILE: ./output/app/src/X.css ===\n.x { color: red; }\n=== END FILE ===\n"
+
+    monkeypatch.setattr(batch, "get_llm", lambda: FakeLLM())
+    monkeypatch.setattr(batch, "build_batch_prompt", lambda steps: "prompt")
+    monkeypatch.setattr(batch, "log_prompt_to_file", lambda name, prompt: None)
+    monkeypatch.setattr(batch, "validate_and_recreate", lambda **kwargs: pytest.fail("niepotrzebne ponowienie"))
+
+    results = batch.generate_batch([make_step("output/app/src/X.css")])
+
+    code, report = results["output/app/src/X.css"]
+    assert code == ".x { color: red; }" and report["batched"]
@@ -0,0 +1,83 @@
+import pytest
+from agent.codegen.diff_engine import PatchError, apply_patch, parse_unified_diff
+
+ORIGINAL = "".join(f"line {i}\n" for i in range(1, 21))
+
+
+def test_applies_hunk_with_wrong_line_numbers():
+    diff = """--- a/output/app/src/file.txt
++++ b/output/app/src/file.txt
+@@ -3,3 +3,3 @@
+ line 10
+-line 11
++line eleven
+ line 12
+"""
+    patch = parse_unified_diff(diff)[0]
+    result = apply_patch(ORIGINAL, patch.hunks)
+
+    assert patch.new_path == "output/app/src/file.txt"
+    assert "line eleven\nline 12\n" in result
+    assert "line 11\n" not in result
+
+
+def test_multiple_hunks_and_whitespace_tolerance():
+    diff = """@@ -2,2 +2,3 @@
+ line 2
++inserted
+   line 3
+@@ -18,2 +19,1 @@
+ line 18
+-line 19
+"""
+    result = apply_patch(ORIGINAL, parse_unified_diff(diff)[0].hunks)
+
+    assert "line 2\ninserted\nline 3\n" in result
+    assert "line 19\n" not in result
+    assert result.endswith("line 18\nline 20\n")
+
+
+def test_unmatched_hunk_raises():
+    diff = """@@ -1,2 +1,2 @@
+ nothing like this
+-exists here
++at all
+"""
+    with pytest.raises(PatchError):
+        apply_patch(ORIGINAL, parse_unified_diff(diff)[0].hunks)
+
+
+def test_insertion_with_unmatched_context_raises():
+    # Fuzz nie może obciąć całego kontekstu i wstawić linii pod numerem z nagłówka
+    diff = """@@ -5,2 +5,3 @@
+ nothing like this
++inserted
+ exists here
+"""
+    with pytest.raises(PatchError):
+        apply_patch(ORIGINAL, parse_unified_diff(diff)[0].hunks)
+
+
+def test_insertion_without_context_uses_header_line():
+    diff = """@@ -5,0 +6,1 @@
++inserted
+"""
+    result = apply_patch(ORIGINAL, parse_unified_diff(diff)[0].hunks)
+
+    assert "line 5\ninserted\nline 6\n" in result
+
+
+def test_insertion_at_top_of_file():
+    diff = "--- a/x\n+++ b/x\n@@ -0,0 +1 @@\n+NEW\n"
+
+    assert apply_patch("a\nb\n", parse_unified_diff(diff)[0].hunks) == "NEW\na\nb\n"
+
+
+def test_consecutive_insert_only_hunks():
+    diff = """@@ -1,0 +2 @@
++X
+@@ -3,0 +5 @@
++Y
+"""
+    # Jak GNU patch: Y po trzeciej linii oryginału
+    assert apply_patch("a\nb\nc\nd\n", parse_unified_diff(diff)[0].hunks) == "a\nX\nb\nc\nY\nd\n"
@@ -0,0 +1,66 @@
+import pytest
+from agent.codegen.edits import Edit, EditError, apply_edits, parse_edits
+
+CODE = """import React from 'react';
+
+export const Card = () => {
+  const title = 'Card';
+  return <div>{title}</div>;
+};
+"""
+
+
+def test_parse_and_apply_multiple_edits():
+    response = """<<<<<<< SEARCH
+import React from 'react';
+=======
+import React, { useState } from 'react';
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+  const title = 'Card';
+=======
+  const [title] = useState('Card');
+>>>>>>> REPLACE
+"""
+    edits = parse_edits(response)
+    result = apply_edits(CODE, edits)
+
+    assert len(edits) == 2
+    assert "import React, { useState } from 'react';" in result
+    assert "const [title] = useState('Card');" in result
+
+
+def test_whitespace_tolerant_fallback_keeps_file_indentation():
+    # Model wciął blok o 4 spacje zamiast 2 - i SEARCH, i REPLACE
+    search = "    const title = 'Card';\n    return <div>{title}</div>;\n"
+    replace = "    const title = 'Box';\n    return <section>{title}</section>;\n"
+
+    result = apply_edits(CODE, [Edit(search, replace)])
+
+    assert result == CODE.replace("'Card';\n  return <div>{title}</div>;", "'Box';\n  return <section>{title}</section>;")
+
+
+def test_partial_line_match_replaces_whole_line():
+    # Dokładne dopasowanie bez wcięcia trafia w środek linii - podmieniana jest cała linia
+    result = apply_edits(CODE, [Edit("const title = 'Card';", "const title = 'Box';")])
+
+    assert result == CODE.replace("  const title = 'Card';", "  const title = 'Box';")
+
+
+def test_match_inside_line_is_rejected():
+    with pytest.raises(EditError):
+        apply_edits(CODE, [Edit("'Card'", "'Box'")])
+
+
+def test_ambiguous_or_missing_search_raises():
+    with pytest.raises(EditError):
+        apply_edits("a = 1\na = 1\n", [Edit("a = 1\n", "a = 2\n")])
+    with pytest.raises(EditError):
+        apply_edits(CODE, [Edit("missing\n", "x\n")])
+
+
+def test_ambiguous_search_resolves_after_previous_edit():
+    code = "a = 1\nb = 2\na = 1\n"
+    edits = [Edit("b = 2\n", "b = 3\n"), Edit("a = 1\n", "a = 4\n")]
+
+    assert apply_edits(code, edits, resolve_ambiguous=True) == "a = 1\nb = 3\na = 4\n"
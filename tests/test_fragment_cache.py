@@ -0,0 +1,39 @@
+import os
+from agent.context.fragment_cache import FragmentCache
+
+
+def write(path, content, mtime_ns):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hits_until_mtime_or_size_changes(tmp_path):
+    path = os.path.join(tmp_path, "App.tsx.analysis.md")
+    write(path, "# App", 1_000_000_000)
+    cache = FragmentCache()
+
+    assert cache.read(path) == "# App"
+    assert cache.read(path) == "# App"
+    write(path, "# App v2", 2_000_000_000)
+    assert cache.read(path) == "# App v2"
+    assert cache.read(os.path.join(tmp_path, "missing.md")) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_bounded_by_bytes_with_lru_eviction(tmp_path):
+    paths = [os.path.join(tmp_path, f"{name}.md") for name in "abc"]
+    for path in paths:
+        write(path, "x" * 40, 1_000_000_000)
+    cache = FragmentCache(max_bytes=100)
+
+    cache.read(paths[0])
+    cache.read(paths[1])
+    cache.read(paths[0])  # a świeższe niż b
+    cache.read(paths[2])  # wypiera b
+
+    assert cache.stats()["bytes"] == 80 and cache.stats()["evictions"] == 1
+    cache.read(paths[0])
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,44 @@
+from agent.validation.html_checker import check_html_source
+
+
+def test_valid_document_passes():
+    ok, report = check_html_source(
+        "<!DOCTYPE html>\n<html><head><title>App</title></head><body><img src=\"a.png\"><br/></body></html>\n",
+        "index.html"
+    )
+    assert ok, report
+
+
+def test_reports_htmlhint_style_rules():
+    ok, report = check_html_source(
+        "<html><head></head><body><DIV id=\"a\"><span id=\"a\"></div></body></html>\n",
+        "index.html"
+    )
+
+    assert not ok
+    for rule in ("doctype-first", "tag-pair", "tagname-lowercase", "id-unique", "title-require"):
+        assert f"({rule})" in report
+    assert report.startswith("index.html:1:")
+
+
+def test_reports_attribute_and_special_char_rules():
+    ok, report = check_html_source(
+        "<!DOCTYPE html>\n<html><head><title>A</title></head>\n"
+        "<body><div Class=\"a\" data-x='b' hidden>a &lt; b > c</div><p>x &amp; y</p>"
+        "<script>if (a < b) {}</script></body></html>\n",
+        "index.html"
+    )
+
+    assert not ok
+    assert "index.html:3:7: The attribute name of [ Class ] must be in lowercase. (attr-lowercase)" in report
+    assert "The value of attribute [ data-x ] must be in double quotes. (attr-value-double-quotes)" in report
+    assert "index.html:3:49: Special characters must be escaped : [ > ]. (spec-char-escape)" in report
+    # Encje, atrybuty bez wartości i treść <script> nie są błędami
+    assert report.count("(spec-char-escape)") == 1
+    assert report.count("(attr-value-double-quotes)") == 1
+
+
+def test_doctype_first_applies_to_any_first_tag():
+    ok, report = check_html_source("<div>x</div>\n", "partial.html")
+
+    assert not ok and "(doctype-first)" in report
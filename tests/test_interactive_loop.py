@@ -0,0 +1,81 @@
+import threading
+import agent.interactive_loop as interactive
+
+
+def patch_preparation(monkeypatch, intention="mixed"):
+    calls = {"context": [], "warm": 0}
+    warm_started = threading.Event()
+
+    def fix(raw_input):
+        # Poprawa prompta czeka na start rozgrzewania indeksów - oba działają równolegle
+        assert warm_started.wait(timeout=5)
+        return f"{raw_input} (poprawione)", intention
+
+    def warm():
+        calls["warm"] += 1
+        warm_started.set()
+
+    def build_context(goal):
+        calls["context"].append(goal)
+        return f"kontekst dla: {goal}"
+
+    monkeypatch.setattr(interactive, "fix_and_classify_prompt", fix)
+    monkeypatch.setattr(interactive, "warm_project_context", warm)
+    monkeypatch.setattr(interactive, "build_project_context", build_context)
+    monkeypatch.setattr(interactive, "get_dev_server_status", lambda: "\n Dev server nie działa")
+    monkeypatch.setattr(interactive, "get_previous_steps_text", lambda: "Brak poprzednich kroków.")
+    monkeypatch.setattr(interactive, "render_scenario_prompt",
+                        lambda goal, constraints, mode, context: f"{goal}|{context.existing_context}")
+    return calls
+
+
+def test_context_is_built_from_fixed_prompt(monkeypatch):
+    calls = patch_preparation(monkeypatch)
+
+    prompt, fixed_input, intention = interactive.prepare_planner_prompt("dodaj licznik", [])
+
+    assert fixed_input == "dodaj licznik (poprawione)" and intention == "mixed"
+    assert calls["context"] == ["dodaj licznik (poprawione)"]
+    assert calls["warm"] == 1
+    assert prompt == "dodaj licznik (poprawione)|kontekst dla: dodaj licznik (poprawione)"
+
+
+def test_infrastructure_prompt_skips_context(monkeypatch):
+    calls = patch_preparation(monkeypatch, intention="infrastructure")
+    # Oczywista infrastruktura nie startuje rozgrzewania - poprawa prompta nie może na nie czekać
+    monkeypatch.setattr(interactive, "fix_and_classify_prompt", lambda raw: (raw, "infrastructure"))
+
+    prompt, _, _ = interactive.prepare_planner_prompt("npm install", [])
+
+    assert calls == {"context": [], "warm": 0}
+    assert prompt == f"npm install|{interactive.INFRASTRUCTURE_CONTEXT}"
+
+
+def test_context_waits_for_warm_up_abandoned_by_infrastructure_prompt(monkeypatch):
+    calls = patch_preparation(monkeypatch)
+    release = threading.Event()
+    warm_done = threading.Event()
+
+    def slow_warm():
+        release.wait(timeout=5)
+        warm_done.set()
+
+    monkeypatch.setattr(interactive, "warm_project_context", slow_warm)
+    monkeypatch.setattr(interactive, "fix_and_classify_prompt", lambda raw: (raw, "infrastructure"))
+    # Heurystyka nie rozpoznała infrastruktury - rozgrzewanie rusza i zostaje porzucone w tle
+    interactive.prepare_planner_prompt("zainstaluj zależności", [])
+    assert not warm_done.is_set()
+
+    def build_context(goal):
+        # Budowa kontekstu nie może czytać indeksów odświeżanych w tle
+        assert warm_done.is_set()
+        calls["context"].append(goal)
+        return goal
+
+    monkeypatch.setattr(interactive, "build_project_context", build_context)
+    monkeypatch.setattr(interactive, "fix_and_classify_prompt", lambda raw: (raw, "mixed"))
+    threading.Timer(0.2, release.set).start()
+    # Szybka ścieżka ("npm ...") nie startuje nowego rozgrzewania, a model uznał zadanie za kod
+    interactive.prepare_planner_prompt("npm run dev i dodaj licznik", [])
+
+    assert calls["context"] == ["npm run dev i dodaj licznik"]
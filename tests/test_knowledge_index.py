@@ -0,0 +1,68 @@
+import json
+import os
+from agent.context.knowledge_index import KnowledgeIndex
+
+
+def write_knowledge(path, files, dependencies, built_at=1.0):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "metadata": {"version": "1.0", "built_at": built_at},
+            "files": {key: {"path": key, "type": "component", "exports": [], "weight": 1.0} for key in files},
+            "dependencies": dependencies,
+        }, f)
+
+
+def test_resolves_imports_and_importers_across_separators(tmp_path):
+    knowledge = os.path.join(tmp_path, "knowledge.json")
+    write_knowledge(
+        knowledge,
+        ["app\\src\\App.tsx.analysis.json", "app/src/components/Button.tsx.analysis.json", "app/src/main.tsx.analysis.json"],
+        {
+            "app\\src\\App.tsx.analysis.json": ["react", "./components/Button"],
+            "app/src/main.tsx.analysis.json": ["./App.tsx", "react-dom/client"],
+        }
+    )
+    index = KnowledgeIndex(knowledge_path=knowledge)
+
+    assert index.imports_of("output/app/src/App.tsx") == ["output/app/src/components/Button.tsx"]
+    assert index.importers_of("output\\app\\src\\App.tsx") == ["output/app/src/main.tsx"]
+    assert index.node("output/app/src/App.tsx").external_imports == ["react"]
+    assert index.importers_of("output/app/src/missing.tsx") == []
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    knowledge = os.path.join(tmp_path, "knowledge.json")
+    write_knowledge(knowledge, ["app/a.ts.analysis.json"], {})
+    index = KnowledgeIndex(knowledge_path=knowledge)
+
+    assert len(index) == 1
+    assert not index.refresh()
+
+    write_knowledge(knowledge, ["app/a.ts.analysis.json", "app/b.ts.analysis.json"], {}, built_at=2.0)
+    os.utime(knowledge, ns=(0, os.stat(knowledge).st_mtime_ns + 1_000_000))
+    assert len(index) == 2
+    assert (index.stats["loads"], index.stats["rebuilds"]) == (2, 2)
+
+
+def test_reachable_is_cached_and_invalidated_only_for_changed_edges(tmp_path):
+    knowledge = os.path.join(tmp_path, "knowledge.json")
+    files = [f"app/{name}.ts.analysis.json" for name in "abcxy"]
+    write_knowledge(knowledge, files, {files[0]: ["./b"], files[1]: ["./c"], files[3]: ["./y"]})
+    index = KnowledgeIndex(knowledge_path=knowledge)
+
+    assert index.reachable("output/app/a.ts", depth=2) == {"output/app/b.ts": 1, "output/app/c.ts": 2}
+    assert index.reachable("output/app/a.ts", depth=1) == {"output/app/b.ts": 1}
+    assert index.reachable("output/app/c.ts", depth=2, direction="importers") == {"output/app/b.ts": 1, "output/app/a.ts": 2}
+    index.reachable("output/app/x.ts", depth=2)
+    index.reachable("output/app/a.ts", depth=2)
+    assert index.stats["reach_hits"] == 1
+
+    # Nowa krawędź y -> c: zmienia zasięg x (imports) i c (importers), ale nie a
+    write_knowledge(knowledge, files, {files[0]: ["./b"], files[1]: ["./c"], files[3]: ["./y"], files[4]: ["./c"]}, built_at=2.0)
+    os.utime(knowledge, ns=(0, os.stat(knowledge).st_mtime_ns + 1_000_000))
+    index.refresh()
+
+    assert index.stats["reach_invalidated"] == 2
+    assert index.reachable("output/app/x.ts", depth=2) == {"output/app/y.ts": 1, "output/app/c.ts": 2}
+    assert index.reachable("output/app/a.ts", depth=2) == {"output/app/b.ts": 1, "output/app/c.ts": 2}
+    assert index.stats["reach_hits"] == 2
@@ -17,7 +17,7 @@ def test_happy_path(tmp_path):
     final_state = agent_loop(state, scenario)
 
     # Porównujemy kroków
-    assert len(final_state.history) == len(scenario.steps)
+    assert final_state.total_steps == len(scenario.steps)
 
     # Każdy krok powinien mieć expected keys
     for step in final_state.history:
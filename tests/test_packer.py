@@ -0,0 +1,29 @@
+from agent.context.packer import Fragment, extract_signatures, pack_fragments, tokenize
+
+
+def test_degrades_instead_of_truncating_and_keeps_input_order():
+    code = "export function Button(props: Props) {\n" + "  return null;\n" * 400 + "}\n"
+    fragments = [
+        Fragment("STRUKTURA PROJEKTU:", "output/app/src/App.tsx", distance=1),
+        Fragment("AKTUALNY PLIK: Button.tsx", code, distance=0, variants=[extract_signatures(code)]),
+        Fragment("UŻYWA TEGO PLIKU: index.ts", "x" * 4000, distance=1, weight=0.2, variants=["krótko"]),
+    ]
+
+    packed, report = pack_fragments(fragments, budget=60, task_text="Dodaj przycisk Button")
+
+    assert packed[0].startswith("### STRUKTURA PROJEKTU:")
+    assert packed[1] == "### AKTUALNY PLIK: Button.tsx\nexport function Button(props: Props)"
+    assert report["degraded"] == ["AKTUALNY PLIK: Button.tsx", "UŻYWA TEGO PLIKU: index.ts"]
+    assert report["used"] <= 60
+
+
+def test_lexical_overlap_wins_when_budget_is_tight():
+    fragments = [
+        Fragment("A", "UserProfile card " * 10, distance=1),
+        Fragment("B", "ShoppingCart total " * 10, distance=1),
+    ]
+    packed, report = pack_fragments(fragments, budget=50, task_text="Popraw shopping cart")
+
+    assert packed == ["### B\n" + "ShoppingCart total " * 10]
+    assert report["dropped"] == ["A"]
+    assert {"shopping", "cart", "shoppingcart"} <= tokenize("ShoppingCart")
@@ -0,0 +1,36 @@
+from agent.codegen import patch_strategy
+
+
+class FakeLLM:
+    """Kolejne odpowiedzi z listy; wyjątek z listy jest rzucany jak błąd wywołania LLM."""
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+
+    def chat(self, prompt, config=None):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_edit_uses_shared_client_and_counts_only_responses(tmp_path, monkeypatch):
+    path = tmp_path / "App.tsx"
+    path.write_text("const title = 'Card';\n")
+    recorded = []
+    llm = FakeLLM([
+        RuntimeError("timeout"),
+        "<<<<<<< SEARCH\nmissing\n=======\nx\n>>>>>>> REPLACE\n",
+        "<<<<<<< SEARCH\nconst title = 'Card';\n=======\nconst title = 'Box';\n>>>>>>> REPLACE\n",
+    ])
+    monkeypatch.setattr(patch_strategy, "get_llm", lambda: llm)
+    monkeypatch.setattr(patch_strategy, "validate_code", lambda code, filepath: (True, ""))
+    monkeypatch.setattr(patch_strategy, "record_generation", lambda *args, **kwargs: recorded.append((args, kwargs)))
+
+    code, report = patch_strategy.validate_and_edit("zmień tytuł", str(path), ".tsx")
+
+    assert report["ok"] and code == "const title = 'Box';\n"
+    assert path.read_text() == code
+    args, kwargs = recorded[0]
+    assert args[2] == 3
+    assert kwargs["responses"] == 2 and kwargs["apply_failures"] == 1
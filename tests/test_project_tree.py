@@ -0,0 +1,60 @@
+import os
+import time
+from agent.context.project_tree import ProjectTree
+
+
+def touch(root, rel_path):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("")
+    return path
+
+
+def test_listings_follow_ignore_rules_and_collapse_large_directories(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    for rel_path in ["src/App.tsx", "src/logo.svg", ".env", "node_modules/react/index.js", "dist/a.js"]:
+        touch(root, rel_path)
+    for i in range(5):
+        touch(root, f"public/icons/i{i}.svg")
+    tree = ProjectTree(root, max_files_per_dir=3, watch=False)
+    prefix = tree.prefix
+
+    assert tree.listing(relevant_only=True) == f"{prefix}/src/App.tsx"
+    assert tree.listing().splitlines() == [
+        f"{prefix}/.env",
+        f"{prefix}/public/icons/ (5 plików: 5 × .svg)",
+        f"{prefix}/src/App.tsx",
+        f"{prefix}/src/logo.svg",
+    ]
+
+
+def test_events_update_model_without_rescan(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    touch(root, "src/App.tsx")
+    tree = ProjectTree(root, watch=False)
+    tree.listing()
+    version = tree.version
+
+    tree.add_file(touch(root, "src/components/Button.tsx"))
+    tree.add_file(os.path.join(root, "node_modules", "x.js"))
+    assert tree.files() == ["src/App.tsx", "src/components/Button.tsx"]
+
+    tree.remove_directory(os.path.join(root, "src", "components"))
+    assert tree.files() == ["src/App.tsx"]
+    assert tree.version == version + 2
+
+
+def test_watcher_picks_up_new_files(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    touch(root, "src/App.tsx")
+    tree = ProjectTree(root)
+    try:
+        tree.listing()
+        touch(root, "src/pages/Home.tsx")
+        deadline = time.monotonic() + 3
+        while "src/pages/Home.tsx" not in tree.files() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert "src/pages/Home.tsx" in tree.files()
+    finally:
+        tree.stop()
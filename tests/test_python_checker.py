@@ -0,0 +1,61 @@
+from agent.validation import python_checker
+from agent.validation.python_checker import check_python_source, check_python_sources
+
+
+def test_reports_flake8_style_messages():
+    ok, report = check_python_source("import os\nx=1\n", "app.py")
+
+    assert not ok
+    assert "app.py:1:1: F401 'os' imported but unused" in report
+    assert "app.py:2:2: E225" in report
+
+
+def test_syntax_error_is_e999():
+    ok, report = check_python_source("def f(:\n", "broken.py")
+
+    assert not ok
+    assert "E999 SyntaxError" in report
+
+
+def test_same_content_is_checked_once(monkeypatch):
+    from agent.validation.cache import get_validation_cache
+    from agent.validation.static import analyze_sources
+
+    calls = []
+    original = python_checker._check_source
+    monkeypatch.setattr(python_checker, "_check_source", lambda code, options: calls.append(code) or original(code, options))
+    get_validation_cache().clear()
+
+    sources = {"a.py": "value = 42\n", "b.py": "value = 42\n"}
+    first = analyze_sources(sources)
+    second = analyze_sources(sources)
+
+    assert len(calls) == 1
+    assert first == second == {"a.py": (True, ""), "b.py": (True, "")}
+
+
+def test_reads_flake8_options_from_project_config(tmp_path, monkeypatch):
+    long_line = "value = '" + "x" * 90 + "'\n"
+    assert "E501" in check_python_source(long_line, "app.py")[1]
+
+    (tmp_path / "setup.cfg").write_text("[flake8]\nmax-line-length = 120\nextend-ignore =\n    F401\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert check_python_source(long_line, "app.py") == (True, "")
+    assert check_python_source("import os\n", "app.py") == (True, "")
+    # Domyślnie ignorowane kody zostają ignorowane przy extend-ignore
+    assert python_checker.load_flake8_options().ignore[-1] == "F401"
+    assert "W503" in python_checker.load_flake8_options().ignore
+
+
+def test_large_batches_share_one_worker_pool():
+    sources = {f"m{i}.py": f"value_{i} = {i}\n" for i in range(5)}
+    sources["bad.py"] = "import os\n"
+
+    first = check_python_sources(sources)
+    executor = python_checker._get_executor()
+    check_python_sources(sources)
+
+    assert python_checker._get_executor() is executor
+    assert all(first[f"m{i}.py"] == (True, "") for i in range(5))
+    assert "bad.py:1:1: F401" in first["bad.py"][1]
@@ -0,0 +1,60 @@
+import os
+import socket
+import subprocess
+import sys
+from agent.readiness import wait_for_dev_server
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def start(command: str, tmp_path):
+    stdout_log = os.path.join(tmp_path, "stdout.log")
+    stderr_log = os.path.join(tmp_path, "stderr.log")
+    with open(stdout_log, "w") as out, open(stderr_log, "w") as err:
+        process = subprocess.Popen(command, shell=True, stdout=out, stderr=err)
+    return process, stdout_log, stderr_log
+
+
+def test_early_exit_fails_fast(tmp_path):
+    process, stdout_log, stderr_log = start(f'{sys.executable} -c "import sys; sys.stderr.write(\'boom\'); sys.exit(3)"', tmp_path)
+    report = wait_for_dev_server(process, stdout_log, stderr_log, timeout=10)
+
+    assert not report.ready
+    assert report.exit_code == 3
+    assert "boom" in report.error
+
+
+def test_detects_actual_port(tmp_path):
+    port = free_port()
+    process, stdout_log, stderr_log = start(f"{sys.executable} -m http.server {port} --bind 127.0.0.1", tmp_path)
+    try:
+        # Podpowiedź portu celowo błędna - port ma wyjść z gniazda LISTEN
+        report = wait_for_dev_server(process, stdout_log, stderr_log, port_hint=1, timeout=10)
+    finally:
+        process.kill()
+        process.wait()
+
+    assert report.ready
+    assert report.port == port
+    assert "http" in report.signals
+    assert report.time_to_ready is not None
+
+
+def test_port_hint_held_by_foreign_server_is_not_ready(tmp_path):
+    port = free_port()
+    foreign, _, _ = start(f"{sys.executable} -m http.server {port} --bind 127.0.0.1", tmp_path)
+    process, stdout_log, stderr_log = start(f'{sys.executable} -c "import time; time.sleep(30)"', tmp_path)
+    try:
+        # Obcy serwer odpowiada na porcie z podpowiedzi, ale nasz proces go nie słucha
+        report = wait_for_dev_server(process, stdout_log, stderr_log, port_hint=port, timeout=3)
+    finally:
+        for proc in (foreign, process):
+            proc.kill()
+            proc.wait()
+
+    assert not report.ready
+    assert "http" not in report.signals
@@ -0,0 +1,67 @@
+import json
+import os
+from agent.context.retrieval import LexicalIndex
+
+
+def write_analysis(meta_dir, rel_path, summary, exports=()):
+    md_path = os.path.join(meta_dir, rel_path + ".analysis.md")
+    os.makedirs(os.path.dirname(md_path), exist_ok=True)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(f"# Plik: {rel_path}\n\n## Podsumowanie\n{summary}\n")
+    with open(md_path.replace(".analysis.md", ".analysis.json"), "w", encoding="utf-8") as f:
+        json.dump({"exports": list(exports)}, f)
+    return md_path
+
+
+def test_ranks_summaries_and_export_names(tmp_path):
+    meta_dir = os.path.join(tmp_path, ".meta")
+    write_analysis(meta_dir, "app/src/Cart.tsx", "Wyświetla koszyk zakupów i sumę zamówienia.", ["ShoppingCart"])
+    write_analysis(meta_dir, "app/src/Login.tsx", "Obsługuje logowanie użytkownika.", ["LoginForm"])
+    write_analysis(meta_dir, "app/src/theme.css", "Definiuje kolory motywu.")
+    index = LexicalIndex(meta_dir=meta_dir, output_dir="output", refresh_interval=0)
+
+    results = index.search("Dodaj rabat do koszyk shopping cart")
+    assert [path for path, _ in results] == ["output/app/src/Cart.tsx"]
+    assert index.search("formularz LoginForm")[0][0] == "output/app/src/Login.tsx"
+
+
+def test_refresh_is_incremental(tmp_path):
+    meta_dir = os.path.join(tmp_path, ".meta")
+    md_path = write_analysis(meta_dir, "app/a.ts", "Liczy podatek.")
+    write_analysis(meta_dir, "app/b.ts", "Formatuje daty.")
+    index = LexicalIndex(meta_dir=meta_dir, output_dir="output", refresh_interval=0)
+
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+
+    write_analysis(meta_dir, "app/a.ts", "Liczy rabaty i podatek VAT.")
+    os.utime(md_path, ns=(0, os.stat(md_path).st_mtime_ns + 1_000_000))
+    os.remove(os.path.join(meta_dir, "app", "b.ts.analysis.md"))
+    assert index.refresh() == 2
+    assert len(index) == 1
+    assert index.search("rabaty")[0][0] == "output/app/a.ts"
+    assert index.search("daty") == []
+
+
+def test_unreachable_embedding_endpoint_falls_back_to_bm25(tmp_path, monkeypatch):
+    from agent.config import get_config
+    from agent.context import builder
+    from agent.context.vector_index import OllamaEmbedder, VectorIndex
+
+    meta_dir = os.path.join(tmp_path, ".meta")
+    write_analysis(meta_dir, "app/src/Cart.tsx", "Wyświetla koszyk zakupów.", ["ShoppingCart"])
+    write_analysis(meta_dir, "app/src/Login.tsx", "Obsługuje logowanie użytkownika.", ["LoginForm"])
+    lexical = LexicalIndex(meta_dir=meta_dir, output_dir="output", refresh_interval=0)
+    # Port 9 (discard) - nic nie nasłuchuje, sonda kończy się od razu
+    vector = VectorIndex(
+        embedder=OllamaEmbedder(base_url="http://127.0.0.1:9", probe_timeout=0.5),
+        store_dir=os.path.join(tmp_path, ".synth"), meta_dir=meta_dir, output_dir="output", refresh_interval=0
+    )
+    monkeypatch.setitem(get_config().config, "vector_retrieval", True)
+    monkeypatch.setattr(builder, "get_lexical_index", lambda: lexical)
+    monkeypatch.setattr(builder, "get_vector_index", lambda: vector)
+
+    assert builder.find_matching_files("koszyk ShoppingCart", k=1) == ["output/app/src/Cart.tsx"]
+    assert vector.disabled
+    assert vector.search("koszyk") == []
+    assert not os.path.exists(os.path.join(tmp_path, ".synth"))
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+import time
+
+import psutil
+import pytest
+
+from agent.config import get_config
+from agent.runner import ScriptRunner
+from logger import get_log_hub
+
+
+def python_command(code: str) -> str:
+    return f'"{sys.executable}" -c "{code}"'
+
+
+def test_output_is_streamed_while_command_runs(tmp_path):
+    received = []
+
+    def listener(entry):
+        if entry.module == "RUNSCRIPT":
+            received.append((entry.message, time.monotonic()))
+
+    log_hub = get_log_hub()
+    log_hub.add_listener(listener)
+    try:
+        command = python_command("import time; print('pierwsza', flush=True); time.sleep(1); print('druga')")
+        result = ScriptRunner(log_dir=str(tmp_path)).run(command, cwd=str(tmp_path))
+    finally:
+        log_hub.remove_listener(listener)
+
+    assert result["ok"] and result["stdout"] == "pierwsza\ndruga"
+    times = dict(received)
+    # Pierwsza linia dotarła do log hub'a zanim proces skończył drugą
+    assert times["druga"] - times["pierwsza"] >= 0.5
+
+
+def test_output_is_capped_in_memory_but_complete_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setitem(get_config().config, "script_buffer_lines", 5)
+    command = python_command("[print(i) for i in range(20)]")
+
+    result = ScriptRunner(log_dir=str(tmp_path)).run(command, cwd=str(tmp_path))
+
+    assert result["stdout"].splitlines() == ["15", "16", "17", "18", "19"]
+    assert result["truncated"]
+    with open(result["logs"]["stdout"], encoding="utf-8") as f:
+        assert f.read().splitlines() == [str(i) for i in range(20)]
+
+
+def test_timeout_kills_command(tmp_path):
+    start = time.perf_counter()
+    result = ScriptRunner(log_dir=str(tmp_path)).run(python_command("import time; time.sleep(30)"), cwd=str(tmp_path), timeout=1)
+
+    assert result["status"] == "timeout" and not result["ok"]
+    assert "Timeout" in result["stderr"]
+    assert time.perf_counter() - start < 10
+
+
+def test_cancelled_task_kills_process_tree(tmp_path):
+    pid_file = tmp_path / "pid"
+    # Shell uruchamia pythona jako potomka - ginąć musi całe drzewo
+    command = python_command(f"import os, time; open(r'{pid_file}', 'w').write(str(os.getpid())); time.sleep(30)")
+
+    async def scenario():
+        task = asyncio.create_task(ScriptRunner(log_dir=str(tmp_path)).run_async(command, cwd=str(tmp_path)))
+        while not pid_file.exists() or not pid_file.read_text():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return int(pid_file.read_text())
+
+    pid = asyncio.run(scenario())
+    assert not psutil.pid_exists(pid) or psutil.Process(pid).status() == psutil.STATUS_ZOMBIE
+
+
+@pytest.mark.skipif(os.name == "nt", reason="SIGTERM ignorowany tylko na POSIX")
+def test_termination_does_not_block_event_loop(tmp_path):
+    # Proces ignoruje SIGTERM - zabicie trwa do limitu psutil.wait_procs
+    stubborn = python_command("import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('gotowy', flush=True); time.sleep(30)")
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            for _ in range(40):
+                await asyncio.sleep(0.1)
+                ticks.append(time.monotonic())
+
+        runner = ScriptRunner(log_dir=str(tmp_path))
+        result, _ = await asyncio.gather(runner.run_async(stubborn, cwd=str(tmp_path), timeout=1), ticker())
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result["status"] == "timeout"
+    # Pętla zdarzeń działała także w trakcie zabijania procesu (~3s)
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 1.0
@@ -0,0 +1,79 @@
+import sys
+from agent.commands.run_script import RunScriptCommand
+from agent.state import AgentState
+from agent.storage.script_cache import ScriptCache
+
+COUNTER = f'"{sys.executable}" -c "open(\'runs.txt\', \'a\').write(\'x\')"'
+RULE = {"inputs": ["package.json", "package-lock.json"], "outputs": ["runs.txt"]}
+
+
+def run_step(state: AgentState, cwd, command: str = COUNTER, cache=RULE) -> dict:
+    params = {"command": command, "cwd": str(cwd)}
+    if cache is not None:
+        params["cache"] = cache
+    RunScriptCommand({"type": "run_script", "params": params}).run(state)
+    return state.history[-1].output
+
+
+def test_unchanged_inputs_hit_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "package.json").write_text('{"name": "app"}')
+    (app / "package-lock.json").write_text("{}")
+    state = AgentState()
+
+    assert run_step(state, app)["cache"] == "miss"
+    hit = run_step(state, app)
+    assert hit["cache"] == "hit" and hit["ok"]
+    assert (app / "runs.txt").read_text() == "x"
+
+
+def test_changed_manifest_or_lockfile_invalidates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "package.json").write_text('{"name": "app"}')
+    (app / "package-lock.json").write_text("{}")
+    state = AgentState()
+    run_step(state, app)
+
+    (app / "package.json").write_text('{"name": "app", "dependencies": {"react": "^18"}}')
+    assert run_step(state, app)["cache"] == "miss"
+    assert run_step(state, app)["cache"] == "hit"
+
+    (app / "package-lock.json").write_text('{"lockfileVersion": 3}')
+    assert run_step(state, app)["cache"] == "miss"
+
+    # Usunięte wyjście też unieważnia wpis
+    (app / "runs.txt").unlink()
+    assert run_step(state, app)["cache"] == "miss"
+    assert (app / "runs.txt").read_text() == "x"
+
+
+def test_non_cacheable_commands_always_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "package.json").write_text("{}")
+    state = AgentState()
+
+    for _ in range(2):
+        output = run_step(state, app, cache=None)
+        assert output["ok"] and "cache" not in output
+    for _ in range(2):
+        assert "cache" not in run_step(state, app, cache=False)
+    assert (app / "runs.txt").read_text() == "xxxx"
+
+    # Nieudany wynik nie trafia do cache
+    failing = f'"{sys.executable}" -c "import sys; sys.exit(1)"'
+    assert run_step(state, app, command=failing)["cache"] == "miss"
+    assert run_step(state, app, command=failing)["cache"] == "miss"
+
+
+def test_default_rules_for_package_managers():
+    cache = ScriptCache()
+    assert cache.resolve_rule("npm install", None)["inputs"] == ["package.json", "package-lock.json"]
+    assert cache.resolve_rule("yarn", None)["inputs"] == ["package.json", "yarn.lock"]
+    assert cache.resolve_rule("npm install", False) is None
+    assert cache.resolve_rule("npm run build", None) is None
@@ -0,0 +1,48 @@
+import json
+from analyser.tree_parser import parse_code_file
+from agent.codegen import telemetry
+
+
+def test_extracts_component_props_and_exported_api():
+    code = """
+interface ButtonProps {
+  label: string;
+  onClick?: () => void;
+}
+interface Internal { secret: number }
+export type Variant = "primary" | "secondary";
+export function Button({ label, onClick }: ButtonProps): JSX.Element {
+  return <button onClick={onClick}>{label}</button>;
+}
+export const useCount = (start: number = 0) => { return start; };
+"""
+    signatures = parse_code_file(code, "tsx")["signatures"]
+
+    assert "function Button({ label, onClick }: ButtonProps): JSX.Element" in signatures
+    assert "const useCount = (start: number = 0) =>" in signatures
+    assert "interface ButtonProps { label: string; onClick?: () => void; }" in signatures
+    assert 'type Variant = "primary" | "secondary"' in signatures
+    assert not any("Internal" in signature for signature in signatures)
+
+
+def test_python_signatures_include_public_methods():
+    code = "class Store(Base):\n    def __init__(self, path: str):\n        pass\n\n    def _load(self):\n        pass\n\n\nasync def fetch(url: str) -> bytes:\n    pass\n"
+    assert parse_code_file(code, "python")["signatures"] == [
+        "class Store(Base)",
+        "    def __init__(self, path: str)",
+        "async def fetch(url: str) -> bytes",
+    ]
+
+
+def test_context_report_is_attached_to_next_generation_only(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+    telemetry.set_context_report({"neighbour_mode": "signatures", "used": 300, "saved_tokens": 700})
+    telemetry.record_generation("repair", "a.tsx", 1, True, 0.1, path=str(path))
+    telemetry.record_generation("repair", "b.tsx", 2, False, 0.1, path=str(path))
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entries[0]["context_tokens"] == 300 and "context_mode" not in entries[1]
+    assert telemetry.summarize_context(str(path)) == {"signatures": {
+        "generations": 1, "success_rate": 1.0, "avg_context_tokens": 300.0,
+        "avg_saved_tokens": 700.0, "size_reduction": 0.7
+    }}
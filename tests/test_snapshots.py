@@ -0,0 +1,69 @@
+import os
+import stat
+from agent.storage.snapshots import SnapshotStore, write_text
+
+
+def read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_restore_reverts_changes_and_skips_node_modules(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    write_text(os.path.join(root, "src", "App.tsx"), "old")
+    write_text(os.path.join(root, "node_modules", "dep", "index.js"), "dep")
+
+    store = SnapshotStore(root=root, snapshot_dir=os.path.join(tmp_path, ".snapshots"))
+    snapshot = store.take("test")
+    assert snapshot.files == 1
+
+    # Zapis copy-on-write nie może zmienić treści w snapshocie
+    write_text(os.path.join(root, "src", "App.tsx"), "new")
+    write_text(os.path.join(root, "src", "Extra.tsx"), "extra")
+
+    stats = store.restore(snapshot)
+
+    assert read(os.path.join(root, "src", "App.tsx")) == "old"
+    assert not os.path.exists(os.path.join(root, "src", "Extra.tsx"))
+    assert os.path.exists(os.path.join(root, "node_modules", "dep", "index.js"))
+    assert stats["restored"] == 1 and stats["removed"] == 1
+
+
+def test_retention_prunes_old_snapshots(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    write_text(os.path.join(root, "a.txt"), "a")
+
+    store = SnapshotStore(root=root, snapshot_dir=os.path.join(tmp_path, ".snapshots"), retention=2)
+    for i in range(4):
+        store.take(f"s{i}")
+
+    assert len(store.list()) == 2
+
+
+def test_restore_keeps_directories_from_before_snapshot(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    write_text(os.path.join(root, "src", "App.tsx"), "app")
+    os.makedirs(os.path.join(root, "src", "components"))  # wcześniejszy krok mkdir
+
+    store = SnapshotStore(root=root, snapshot_dir=os.path.join(tmp_path, ".snapshots"))
+    snapshot = store.take("test")
+
+    write_text(os.path.join(root, "src", "pages", "Home.tsx"), "home")
+    store.restore(snapshot)
+
+    assert os.path.isdir(os.path.join(root, "src", "components"))
+    assert not os.path.exists(os.path.join(root, "src", "pages"))
+
+
+def test_write_text_keeps_regular_file_mode(tmp_path):
+    path = os.path.join(tmp_path, "a.txt")
+    umask = os.umask(0)
+    os.umask(umask)
+
+    # Jak zwykły open(), a nie 0600 z mkstemp
+    write_text(path, "a")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o755)
+    write_text(path, "b")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
@@ -0,0 +1,57 @@
+import threading
+from llm import LLMConfig
+from agent.codegen import strategy
+
+
+class FakeLLM:
+    """Kandydat o danym seedzie zwraca przygotowany kod; opcjonalnie czeka na zdarzenie."""
+
+    def __init__(self, outputs: dict, gates: dict = None):
+        self.config = LLMConfig()
+        self.outputs = outputs
+        self.gates = gates or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def chat(self, prompt, config=None):
+        seed = config.extra_params["seed"]
+        with self.lock:
+            self.calls.append((seed, config.temperature))
+        if seed in self.gates:
+            self.gates[seed].wait(timeout=5)
+        return f"```tsx\n{self.outputs[seed]}\n```"
+
+
+def patch(monkeypatch, llm):
+    recorded = []
+    monkeypatch.setattr(strategy, "get_llm", lambda: llm)
+    monkeypatch.setattr(strategy, "validate_code", lambda code, path: (code == "good", "" if code == "good" else f"{path}:1:1: error"))
+    monkeypatch.setattr(strategy, "record_generation", lambda *args, **kwargs: recorded.append((args, kwargs)))
+    return recorded
+
+
+def test_first_valid_candidate_wins(monkeypatch):
+    release = threading.Event()
+    # Kandydat 0 jest wolny i błędny, kandydat 1 poprawny - wynik nie czeka na 0
+    llm = FakeLLM({0: "bad", 1: "good", 2: "bad"}, gates={0: release})
+    recorded = patch(monkeypatch, llm)
+
+    code, report = strategy.speculative_recreate("prompt", "App.tsx", candidates=3, max_calls=3)
+    release.set()
+
+    assert code == "good" and report["ok"]
+    assert report["speculative"]["candidate"] == 1
+    assert report["speculative"]["temperature"] == 0.3
+    assert recorded[-1][0][:4] == ("speculative", "App.tsx", 2, True)
+
+
+def test_all_candidates_rejected_within_call_budget(monkeypatch):
+    llm = FakeLLM({i: "bad" for i in range(4)})
+    recorded = patch(monkeypatch, llm)
+
+    code, report = strategy.speculative_recreate("prompt", "App.tsx", candidates=2, max_calls=4)
+
+    assert code == "bad" and not report["ok"]
+    assert report["details"] == "App.tsx:1:1: error"
+    assert len(llm.calls) == 4
+    assert recorded[-1][0][:4] == ("speculative", "App.tsx", 4, False)
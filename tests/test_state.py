@@ -0,0 +1,70 @@
+import os
+from agent.config import get_config
+from agent.state import AgentState, StepResult
+from agent.storage.blobs import BlobStore, is_blob_ref, resolve_blobs
+
+
+def make_step(i: int, stdout: str = "ok") -> StepResult:
+    return StepResult(
+        step_name="run_script",
+        input={"params": {"command": f"echo {i}"}},
+        output={"ok": True, "stdout": stdout}
+    )
+
+
+def test_large_output_is_spilled_to_blob(tmp_path):
+    blob_dir = os.path.join(tmp_path, ".blobs")
+    big = "x" * (get_config().get("spill_threshold_bytes") + 1)
+
+    state = AgentState()
+    state.history.append(make_step(0, stdout=big))
+    state.compact(blob_dir=blob_dir, history_dir=os.path.join(tmp_path, ".history"))
+
+    ref = state.history[0].output["stdout"]
+    assert is_blob_ref(ref)
+    assert resolve_blobs(ref, BlobStore(blob_dir)) == big
+
+    # Ten sam tekst = ten sam blob
+    assert BlobStore(blob_dir).put(big) == ref["$blob"]
+
+
+def test_old_history_is_paged_with_index(tmp_path):
+    history_dir = os.path.join(tmp_path, ".history")
+    keep = get_config().get("history_in_memory")
+
+    state = AgentState()
+    for i in range(keep + 5):
+        state.history.append(make_step(i))
+    state.compact(blob_dir=os.path.join(tmp_path, ".blobs"), history_dir=history_dir)
+
+    assert len(state.history) <= keep
+    assert state.total_steps == keep + 5
+
+    # Krok z archiwum i z pamięci są dostępne przez ten sam indeks
+    assert state.get_step(0, history_dir=history_dir).input["params"]["command"] == "echo 0"
+    last = state.total_steps - 1
+    assert state.get_step(last, history_dir=history_dir).input["params"]["command"] == f"echo {last}"
+
+    found = state.lookup_history(path="echo 3", history_dir=history_dir)
+    assert [entry["index"] for entry in found] == [3]
+
+
+def test_new_state_does_not_read_stale_archive(tmp_path):
+    history_dir = os.path.join(tmp_path, ".history")
+    blob_dir = os.path.join(tmp_path, ".blobs")
+    keep = get_config().get("history_in_memory")
+
+    old_state = AgentState()
+    for i in range(keep + 5):
+        old_state.history.append(make_step(i, stdout="old"))
+    old_state.compact(blob_dir=blob_dir, history_dir=history_dir)
+
+    # state.json zresetowany, output/.history zostało na dysku
+    state = AgentState()
+    for i in range(keep + 5):
+        state.history.append(make_step(i, stdout="new"))
+    state.compact(blob_dir=blob_dir, history_dir=history_dir)
+
+    assert state.get_step(0, history_dir=history_dir).output["stdout"] == "new"
+    assert [entry["index"] for entry in state.lookup_history(path="echo 3", history_dir=history_dir)] == [3]
+    assert AgentState(**state.model_dump()).get_step(0, history_dir=history_dir).output["stdout"] == "new"
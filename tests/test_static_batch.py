@@ -0,0 +1,58 @@
+import json
+import os
+from agent.validation import static
+from agent.validation.cache import get_validation_cache
+
+
+def test_parse_eslint_json_splits_results_per_path(tmp_path):
+    first = os.path.join(tmp_path, "A.tsx")
+    second = os.path.join(tmp_path, "B.tsx")
+    output = json.dumps([
+        {"filePath": os.path.abspath(first), "errorCount": 1, "warningCount": 0, "messages": [
+            {"line": 3, "column": 7, "severity": 2, "message": "'x' is defined but never used.", "ruleId": "no-unused-vars"}
+        ]},
+        {"filePath": os.path.abspath(second), "errorCount": 0, "warningCount": 0, "messages": []},
+    ])
+
+    results = static.parse_eslint_json(output, [first, second])
+
+    assert results[first] == (False, f"{first}:3:7: error 'x' is defined but never used. (no-unused-vars)")
+    assert results[second] == (True, "")
+    assert static.parse_eslint_json("Oops! config error", [first]) == {first: (False, "Oops! config error")}
+
+
+def test_file_missing_from_eslint_output_is_unchecked(tmp_path, monkeypatch):
+    checked = os.path.join(tmp_path, "A.tsx")
+    ignored = os.path.join(tmp_path, "B.tsx")
+    output = json.dumps([{"filePath": os.path.abspath(checked), "errorCount": 0, "warningCount": 0, "messages": []}])
+
+    results = static.parse_eslint_json(output, [checked, ignored])
+
+    assert results[checked] == (True, "")
+    assert results[ignored] == (False, f"{ignored}: {static.ESLINT_UNCHECKED}")
+
+    # Niesprawdzony plik nie trafia do cache - kolejne wywołanie znowu pyta ESLint
+    monkeypatch.setattr(static, "_lint_eslint_batch", lambda sources, on_disk: {
+        path: (False, f"{path}: {static.ESLINT_UNCHECKED}") for path in sources
+    })
+    get_validation_cache().clear()
+    static.analyze_sources({"src/B.tsx": "export const b = 1;\n"})
+    assert get_validation_cache().get("export const b = 1;\n", "src/B.tsx") is None
+
+
+def test_analyze_sources_batches_misses_and_reuses_cache():
+    get_validation_cache().clear()
+    sources = {
+        "pkg/a.py": "import os\n",
+        "pkg/b.py": "x = 1\n",
+        "index.html": "<!DOCTYPE html>\n<html><head><title>A</title></head></html>\n",
+    }
+
+    results = static.analyze_sources(sources)
+    assert list(results) == list(sources)
+    assert not results["pkg/a.py"][0] and "F401" in results["pkg/a.py"][1]
+    assert results["pkg/b.py"][0] and results["index.html"][0]
+
+    again = static.analyze_sources({"pkg/c.py": "import os\n"})
+    assert "pkg/c.py" in again["pkg/c.py"][1]
+    assert get_validation_cache().stats()["hits"] == 1
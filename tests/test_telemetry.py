@@ -0,0 +1,34 @@
+from agent.codegen.telemetry import record_generation, summarize
+
+
+def test_summarize_compares_attempts_to_success_per_strategy(tmp_path):
+    path = str(tmp_path / "telemetry.jsonl")
+    record_generation("retry", "A.tsx", 3, True, 3.0, path=path)
+    record_generation("retry", "B.tsx", 4, True, 4.0, path=path)
+    record_generation("retry", "C.tsx", 5, False, 5.0, path=path)
+    record_generation("repair", "A.tsx", 1, True, 1.0, path=path)
+    record_generation("repair", "B.tsx", 2, True, 2.0, path=path)
+
+    summary = summarize(path)
+
+    assert summary["retry"]["avg_attempts_to_success"] == 3.5
+    assert summary["retry"]["success_rate"] == 0.667
+    assert summary["repair"]["avg_attempts_to_success"] == 1.5
+    assert summary["repair"]["success_rate"] == 1.0
+    assert "avg_output_tokens" not in summary["repair"]
+
+
+def test_patch_summary_counts_only_attempts_with_a_response(tmp_path):
+    path = str(tmp_path / "telemetry.jsonl")
+    # 3 podejścia, ale jedno wywołanie LLM rzuciło wyjątek - 2 odpowiedzi, jedna nie pasowała
+    record_generation("patch:diff", "A.tsx", 3, True, 1.0, path=path,
+                      output_tokens=400, responses=2, apply_failures=1)
+    record_generation("patch:search_replace", "A.tsx", 1, True, 1.0, path=path,
+                      output_tokens=100, responses=1, apply_failures=0)
+
+    summary = summarize(path)
+
+    assert summary["patch:diff"]["avg_output_tokens"] == 200.0
+    assert summary["patch:diff"]["apply_success_rate"] == 0.5
+    assert summary["patch:search_replace"]["avg_output_tokens"] == 100.0
+    assert summary["patch:search_replace"]["apply_success_rate"] == 1.0
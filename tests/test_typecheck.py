@@ -0,0 +1,49 @@
+import os
+from agent.validation.typecheck import find_tsconfig_dir, map_diagnostics_to_steps, parse_diagnostics
+
+TSC_OUTPUT = """src/App.tsx(12,5): error TS2322: Type '{ title: string; }' is not assignable to type 'IntrinsicAttributes & CardProps'.
+  Property 'title' does not exist on type 'IntrinsicAttributes & CardProps'.
+src/vendor.ts(1,1): error TS1005: ';' expected.
+"""
+
+
+def test_parse_and_map_diagnostics_to_producing_steps(tmp_path):
+    project = os.path.join(tmp_path, "app", "web")
+    diagnostics = parse_diagnostics(TSC_OUTPUT, project)
+
+    assert len(diagnostics) == 2
+    assert diagnostics[0].code == "TS2322"
+    assert "Property 'title'" in diagnostics[0].message
+
+    app_path = os.path.normcase(os.path.join(project, "src", "App.tsx"))
+    by_step = map_diagnostics_to_steps(diagnostics, {app_path: 4})
+
+    assert list(by_step) == [4]
+    assert by_step[4][0].line == 12
+
+
+def test_find_tsconfig_dir(tmp_path):
+    root = os.path.join(tmp_path, "app")
+    project = os.path.join(root, "web")
+    os.makedirs(os.path.join(project, "src"))
+    open(os.path.join(project, "tsconfig.json"), "w").close()
+
+    assert find_tsconfig_dir(os.path.join(project, "src", "App.tsx"), stop_dir=root) == project
+    assert find_tsconfig_dir(os.path.join(root, "other.ts"), stop_dir=root) is None
+
+
+def test_diagnostics_in_unchanged_importer_go_to_dependency_step(tmp_path):
+    project = os.path.join(tmp_path, "web")
+    os.makedirs(os.path.join(project, "src", "components"))
+    app = os.path.join(project, "src", "App.tsx")
+    card = os.path.join(project, "src", "components", "Card.tsx")
+    with open(app, "w") as f:
+        f.write("import { Card } from './components/Card';\nimport './index.css';\n")
+    open(card, "w").close()
+
+    diagnostics = parse_diagnostics(TSC_OUTPUT, project)
+    by_step = map_diagnostics_to_steps(diagnostics, {os.path.normcase(card): 2})
+
+    # App.tsx nie był generowany - błąd trafia do kroku, który zmienił Card; vendor.ts nigdzie
+    assert list(by_step) == [2]
+    assert [d.path for d in by_step[2]] == [app]
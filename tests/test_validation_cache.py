@@ -0,0 +1,62 @@
+import os
+from agent.validation.cache import ValidationCache
+
+
+def write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_same_content_hits_cache_and_rewrites_path(tmp_path):
+    cache = ValidationCache(cwd=str(tmp_path))
+    calls = []
+
+    def analyzer(path):
+        calls.append(path)
+        return False, f"{path}:1:1: F401 unused"
+
+    first = os.path.join(tmp_path, "a.py")
+    second = os.path.join(tmp_path, "b.py")
+    write(first, "import os\n")
+    write(second, "import os\n")
+
+    cache.analyze(first, analyzer)
+    ok, report = cache.analyze(second, analyzer)
+
+    assert calls == [first]
+    assert not ok and report.startswith(second)
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_config_change_invalidates_and_size_is_bounded(tmp_path):
+    cache = ValidationCache(max_entries=2, cwd=str(tmp_path))
+    analyzer = lambda path: (True, "")
+    path = os.path.join(tmp_path, "a.py")
+    write(path, "x = 1\n")
+
+    cache.analyze(path, analyzer)
+    write(os.path.join(tmp_path, "setup.cfg"), "[flake8]\nmax-line-length = 120\n")
+    cache.analyze(path, analyzer)
+    assert cache.stats()["misses"] == 2
+
+    write(path, "y = 2\n")
+    cache.analyze(path, analyzer)
+    assert cache.stats()["entries"] == 2
+
+
+def test_key_depends_on_extension_and_eslint_path(tmp_path):
+    cache = ValidationCache(cwd=str(tmp_path))
+    calls = []
+
+    def analyzer(code, path):
+        calls.append(path)
+        return path.endswith(".tsx"), ""
+
+    code = "const value = <div />;\n"
+    assert cache.analyze_source(code, "src/a.tsx", analyzer)[0]
+    # Ta sama treść jako .ts / .js albo pod innym globem ESLint - osobny wynik
+    assert not cache.analyze_source(code, "src/a.ts", analyzer)[0]
+    cache.analyze_source(code, "tests/a.tsx", analyzer)
+    cache.analyze_source(code, "src/a.tsx", analyzer)
+
+    assert calls == ["src/a.tsx", "src/a.ts", "tests/a.tsx"]
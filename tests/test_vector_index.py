@@ -0,0 +1,53 @@
+import os
+import pytest
+from agent.context.retrieval import fuse_rankings
+from agent.context.vector_index import HashEmbedder, VectorIndex
+
+np = pytest.importorskip("numpy")
+
+
+def write_analysis(meta_dir, rel_path, summary):
+    md_path = os.path.join(meta_dir, rel_path + ".analysis.md")
+    os.makedirs(os.path.dirname(md_path), exist_ok=True)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(summary)
+    return md_path
+
+
+def make_index(tmp_path):
+    return VectorIndex(
+        embedder=HashEmbedder(dim=128),
+        store_dir=os.path.join(tmp_path, ".synth"),
+        meta_dir=os.path.join(tmp_path, ".meta"),
+        output_dir="output",
+        refresh_interval=0,
+    )
+
+
+def test_hash_embedder_is_deterministic_and_normalized():
+    first, second = HashEmbedder(dim=64).embed(["ShoppingCart koszyk", "ShoppingCart koszyk"])
+    assert first == second
+    assert abs(sum(v * v for v in first) - 1.0) < 1e-9
+
+
+def test_search_updates_incrementally_and_persists(tmp_path):
+    meta_dir = os.path.join(tmp_path, ".meta")
+    write_analysis(meta_dir, "app/src/Cart.tsx", "Wyświetla koszyk zakupów ShoppingCart.")
+    md_path = write_analysis(meta_dir, "app/src/Login.tsx", "Obsługuje logowanie LoginForm.")
+    index = make_index(tmp_path)
+
+    assert index.search("koszyku zakupowym", k=1)[0][0] == "output/app/src/Cart.tsx"
+    assert index.search("koszyk", k=5, exclude=("output/app/src/Cart.tsx",))[0][0] == "output/app/src/Login.tsx"
+
+    os.remove(md_path)
+    write_analysis(meta_dir, "app/src/Basket.tsx", "Lista produktów w koszyku.")
+    assert index.refresh(force=True) == 2
+
+    reloaded = make_index(tmp_path)
+    assert reloaded.refresh(force=True) == 0
+    assert sorted(reloaded.paths) == ["output/app/src/Basket.tsx", "output/app/src/Cart.tsx"]
+    assert reloaded.matrix.shape == (2, 128)
+
+
+def test_fuse_rankings_prefers_files_ranked_by_both():
+    assert fuse_rankings([["a", "b"], ["b", "c"]], k=2) == ["b", "a"]